@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.admin.decorators import register
+from .models.deuda import PagoDeuda
 from .models.ingresos import Recaudacion
+from .models.monedas import TasaCambio
 
 
 @register(Recaudacion)
@@ -17,3 +19,21 @@ class RecaudacionAdmin(admin.ModelAdmin):
             {"fields": ("numero_semana",), "classes": ("collapse")},
         ),
     )
+
+
+@register(PagoDeuda)
+class PagoDeudaAdmin(admin.ModelAdmin):
+    list_display = ("fecha", "numero_semana", "monto", "nota")
+    list_filter = ("numero_semana",)
+    date_hierarchy = "fecha"
+    ordering = ("-fecha",)
+    fields = ("fecha", "monto", "nota")
+
+
+@register(TasaCambio)
+class TasaCambioAdmin(admin.ModelAdmin):
+    list_display = ("fecha", "moneda", "tasa")
+    list_filter = ("moneda",)
+    date_hierarchy = "fecha"
+    ordering = ("moneda", "-fecha")
+    fields = ("moneda", "fecha", "tasa")
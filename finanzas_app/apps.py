@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FinanzasAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'finanzas_app'
+
+    def ready(self):
+        from finanzas_app import signals  # noqa: F401
@@ -0,0 +1,61 @@
+# finanzas_app/dinero.py
+"""
+Representación del dinero como enteros de centavos.
+
+Los montos se guardan y se suman en la base de datos como enteros de
+centavos (``CentavosField``); en Python se exponen como ``Decimal`` con dos
+decimales. Estas funciones convierten entre ambas formas y dan el formato
+de moneda usado en plantillas y exportaciones.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+CENTAVO = Decimal("0.01")
+
+
+def a_decimal(valor):
+    """
+    Convierte un monto (Decimal, int, float o texto) a ``Decimal`` en centavos.
+
+    Los float se convierten por su representación de texto (``1.1`` es
+    ``Decimal("1.10")``, no ``1.100000000000000088...``).
+
+    Raises:
+        ValueError: Si el valor no es un número
+    """
+    if isinstance(valor, float):
+        valor = repr(valor)
+    try:
+        return Decimal(valor).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, TypeError) as error:
+        raise ValueError(f"Monto no válido: {valor!r}") from error
+
+
+def a_centavos(valor):
+    """Convierte un monto en pesos a un entero de centavos"""
+    return int(a_decimal(valor).scaleb(2))
+
+
+def desde_centavos(centavos):
+    """Convierte un entero de centavos a ``Decimal`` con dos decimales"""
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+def formatear_moneda(valor, simbolo="$", decimales=2):
+    """
+    Formatea un monto como "$12,345.67" (sin pasar por float).
+
+    Args:
+        valor: Monto en pesos (Decimal, int, float o texto); None o "" se
+            devuelven como ""
+        simbolo (str): Símbolo antepuesto al número
+        decimales (int): Cantidad de decimales
+
+    Returns:
+        str: Monto formateado
+    """
+    if valor is None or valor == "":
+        return ""
+    monto = a_decimal(valor)
+    signo = "-" if monto < 0 else ""
+    return f"{signo}{simbolo}{abs(monto):,.{decimales}f}"
@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from finanzas_app.services import cache_estadisticas
+from finanzas_app.services.estadisticas_service import EstadisticaService
+from finanzas_app.services.tablas import ProcesadorTablaSemanal
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra el backend y la versión de la caché de estadísticas y mide "
+        "aciertos, fallos y tiempos consultando las estadísticas del "
+        "dashboard, la tabla semanal y la deuda"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invalidar",
+            action="store_true",
+            help="Incrementar la versión de los datos antes de medir",
+        )
+        parser.add_argument(
+            "--repeticiones",
+            type=int,
+            default=3,
+            help="Veces que se consulta cada estadística (por defecto 3)",
+        )
+
+    def handle(self, *args, **options):
+        alias = settings.ESTADISTICAS_CONFIG["CACHE_ALIAS"]
+        self.stdout.write(self.style.SUCCESS("🗄️  Caché de estadísticas"))
+        self.stdout.write(f"  Backend: {settings.CACHES[alias]['BACKEND']}")
+
+        if options["invalidar"]:
+            cache_estadisticas.incrementar_version()
+        self.stdout.write(f"  Versión de los datos: {cache_estadisticas.version_datos()}")
+
+        consultas = {
+            "resumen_dashboard": lambda: EstadisticaService.obtener_resumen_dashboard(
+                ultimos=10
+            ),
+            "estadisticas": EstadisticaService.obtener_estadisticas,
+            "deuda_semanal": EstadisticaService.obtener_deuda_semanal,
+            "tabla_semanal": ProcesadorTablaSemanal.crear_tabla_semanal_resumida,
+        }
+
+        cache_estadisticas.reiniciar_contadores()
+        self.stdout.write(f"\n  {'estadística':<20} {'ms por consulta'}")
+        for nombre, consulta in consultas.items():
+            tiempos = []
+            for _ in range(options["repeticiones"]):
+                inicio = time.perf_counter()
+                consulta()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            self.stdout.write(
+                f"  {nombre:<20} " + " ".join(f"{t:>7.1f}" for t in tiempos)
+            )
+
+        contadores = cache_estadisticas.contadores()
+        self.stdout.write(
+            f"\n  Aciertos: {contadores['aciertos']}  Fallos: {contadores['fallos']}  "
+            f"Obsoletos: {contadores['obsoletos']}  "
+            f"Tasa de aciertos: {contadores['tasa_aciertos']:.0%}"
+        )
@@ -0,0 +1,114 @@
+import csv
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from finanzas_app.models.monedas import TasaCambio
+from finanzas_app.services.cache_estadisticas import incrementar_version
+
+FORMATOS_FECHA = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"]
+
+
+def _fecha(texto):
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.datetime.strptime(texto.strip(), formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Fecha no válida: {texto}")
+
+
+def _tasa(texto):
+    try:
+        tasa = Decimal(texto.replace(",", "").strip())
+    except InvalidOperation:
+        raise ValueError(f"Tasa no válida: {texto}")
+    if tasa <= 0:
+        raise ValueError(f"La tasa debe ser positiva: {texto}")
+    return tasa
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga una serie de tasas de cambio desde un CSV con columnas fecha y "
+        "tasa (CUP por unidad) y, opcionalmente, moneda"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", type=str, help="Ruta del archivo CSV")
+        parser.add_argument(
+            "--moneda",
+            type=str,
+            default="USD",
+            help="Moneda de las filas sin columna 'moneda' (por defecto USD)",
+        )
+        parser.add_argument(
+            "--sobreescribir",
+            action="store_true",
+            help="Reemplazar las tasas ya cargadas de las mismas fechas",
+        )
+
+    def handle(self, *args, **options):
+        disponibles = settings.MONEDAS_CONFIG["DISPONIBLES"]
+        origen = settings.MONEDAS_CONFIG["ORIGEN"]
+
+        tasas = {}
+        omitidas = 0
+        with open(options["archivo"], encoding="utf-8-sig", newline="") as archivo:
+            lector = csv.DictReader(archivo)
+            columnas = {c.strip().lower(): c for c in lector.fieldnames or []}
+            if "fecha" not in columnas or "tasa" not in columnas:
+                raise CommandError("El CSV debe tener las columnas 'fecha' y 'tasa'")
+
+            for numero, fila in enumerate(lector, start=2):
+                try:
+                    moneda = options["moneda"]
+                    if "moneda" in columnas and fila[columnas["moneda"]].strip():
+                        moneda = fila[columnas["moneda"]]
+                    moneda = moneda.strip().upper()
+                    if moneda == origen or moneda not in disponibles:
+                        raise ValueError(f"Moneda no disponible: {moneda}")
+                    fecha = _fecha(fila[columnas["fecha"]])
+                    tasa = _tasa(fila[columnas["tasa"]])
+                except (ValueError, AttributeError) as error:
+                    omitidas += 1
+                    self.stdout.write(self.style.WARNING(f"Línea {numero}: {error}"))
+                    continue
+                # Si una fecha se repite en el archivo, vale la última
+                tasas[(moneda, fecha)] = tasa
+
+        registros = [
+            TasaCambio(moneda=moneda, fecha=fecha, tasa=tasa)
+            for (moneda, fecha), tasa in sorted(tasas.items())
+        ]
+        # Una sola inserción; las filas existentes se actualizan o se dejan
+        with transaction.atomic():
+            antes = TasaCambio.objects.count()
+            if options["sobreescribir"]:
+                TasaCambio.objects.bulk_create(
+                    registros,
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=["moneda", "fecha"],
+                    update_fields=["tasa", "actualizado_en"],
+                )
+            else:
+                TasaCambio.objects.bulk_create(
+                    registros, batch_size=500, ignore_conflicts=True
+                )
+            nuevas = TasaCambio.objects.count() - antes
+
+        # ``bulk_create`` no emite señales
+        incrementar_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Tasas cargadas: {nuevas} nuevas, "
+                f"{len(registros) - nuevas} "
+                f"{'actualizadas' if options['sobreescribir'] else 'ya existentes'}, "
+                f"{omitidas} omitidas"
+            )
+        )
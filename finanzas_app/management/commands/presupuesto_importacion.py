@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MARCA = "--- fin de django.setup() ---"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide con 'python -X importtime' cuánto cuesta cargar las URLs (y por "
+        "tanto todas las vistas) y lo compara con el presupuesto configurado"
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modulo",
+            type=str,
+            default=settings.ROOT_URLCONF,
+            help="Módulo a importar después de django.setup()",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Cantidad de módulos más costosos a mostrar",
+        )
+
+    def handle(self, *args, **options):
+        modulo = options["modulo"]
+        presupuesto = settings.PRESUPUESTO_IMPORTACION
+
+        # Proceso nuevo: en este ya está todo importado
+        codigo = (
+            "import django, sys; django.setup(); "
+            f"sys.stderr.write({MARCA!r} + '\\n'); sys.stderr.flush(); "
+            # import_module() no pasa por el import de C y no se mediría
+            f"__import__({modulo!r})"
+        )
+        entorno = dict(os.environ)
+        entorno.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+
+        resultado = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", codigo],
+            capture_output=True,
+            text=True,
+            env=entorno,
+            cwd=settings.BASE_DIR,
+        )
+        if resultado.returncode != 0:
+            raise CommandError(f"No se pudo importar {modulo}:\n{resultado.stderr}")
+
+        importaciones = self._parsear(resultado.stderr)
+        total_ms = sum(
+            acumulado for _, acumulado, nombre, nivel in importaciones if nivel == 0
+        ) / 1000
+
+        self.stdout.write(self.style.SUCCESS(f"⏱️  Importación de {modulo}"))
+        self.stdout.write(f"Total: {total_ms:.1f} ms (máximo {presupuesto['MAX_MS']} ms)")
+        self.stdout.write("\nMódulos más costosos (acumulado):")
+        for _, acumulado, nombre, _ in sorted(importaciones, key=lambda i: -i[1])[
+            : options["top"]
+        ]:
+            self.stdout.write(f"  {acumulado / 1000:8.1f} ms  {nombre}")
+
+        errores = []
+        prohibidos = sorted(
+            {
+                nombre
+                for _, _, nombre, _ in importaciones
+                if nombre.split(".")[0] in presupuesto["MODULOS_PROHIBIDOS"]
+                and "." not in nombre
+            }
+        )
+        if prohibidos:
+            errores.append(
+                "Se importan módulos pesados al cargar las URLs: "
+                + ", ".join(prohibidos)
+            )
+        if total_ms > presupuesto["MAX_MS"]:
+            errores.append(
+                f"Se superó el presupuesto: {total_ms:.1f} ms > "
+                f"{presupuesto['MAX_MS']} ms"
+            )
+
+        if errores:
+            raise CommandError("\n".join(errores))
+
+        self.stdout.write(self.style.SUCCESS("\n✅ Dentro del presupuesto"))
+
+    @staticmethod
+    def _parsear(salida):
+        """
+        Extrae las líneas de ``-X importtime`` posteriores a la marca.
+
+        Returns:
+            list: (propio_us, acumulado_us, módulo, nivel de anidamiento)
+        """
+        importaciones = []
+        despues_de_marca = False
+
+        for linea in salida.splitlines():
+            if linea.strip() == MARCA:
+                despues_de_marca = True
+                continue
+            if not despues_de_marca or not linea.startswith("import time:"):
+                continue
+
+            partes = linea[len("import time:") :].split("|")
+            if len(partes) != 3 or not partes[0].strip().isdigit():
+                continue  # Cabecera de la tabla
+
+            # Un espacio antes del módulo es nivel 0; cada nivel suma dos
+            nombre = partes[2].rstrip()
+            nivel = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+            importaciones.append((int(partes[0]), int(partes[1]), nombre.strip(), nivel))
+
+        return importaciones
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from finanzas_app.services.cache_estadisticas import incrementar_version
+from finanzas_app.services.resumenes import ResumenService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde cero los resúmenes por semana, mes, día de la semana, "
+        "las cubetas de percentiles y el total general (p. ej. después de cambios con QuerySet.update o "
+        "directamente en la base de datos)"
+    )
+
+    def handle(self, *args, **options):
+        creados = ResumenService.reconstruir()
+        incrementar_version()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Resúmenes reconstruidos: {creados['semanas']} semanas, "
+                f"{creados['meses']} meses, {creados['dias_semana']} días de la semana, "
+                f"{creados['cubetas']} cubetas"
+            )
+        )
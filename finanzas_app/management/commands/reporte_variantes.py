@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from finanzas_app.services.dashboard_service import GeneradorGraficos
+from finanzas_app.services.estadisticas_service import EstadisticaService
+from finanzas_app.services.variantes_graficos import generar_variantes
+
+
+class Command(BaseCommand):
+    help = (
+        "Renderiza los gráficos del dashboard con Matplotlib y muestra, para "
+        "cada variante (PNG con paleta, WebP, anchos), su tamaño y lo que "
+        "costó codificarla"
+    )
+
+    def handle(self, *args, **options):
+        resumen = EstadisticaService.obtener_resumen_dashboard(ultimos=0)
+        trabajos = {
+            "semanal": list(resumen["por_semana"].values()),
+            "mensual": list(resumen["por_mes"].values()),
+            "diario": resumen["por_dia_semana"],
+            "promedio_diario": resumen["por_dia_semana"],
+        }
+
+        self.stdout.write(self.style.SUCCESS("🖼️  Variantes de los gráficos PNG"))
+
+        for tipo, datos in trabajos.items():
+            original = GeneradorGraficos.renderizar(tipo, datos, formato="png")
+            if original is None:
+                self.stdout.write(self.style.WARNING(f"\n{tipo}: sin datos"))
+                continue
+
+            self.stdout.write(
+                f"\n{tipo} (original a todo color: {len(original) / 1024:.1f} KB)"
+            )
+            self.stdout.write(
+                f"  {'variante':<14} {'ancho':>6} {'KB':>8} {'%':>6} {'ms':>7}"
+            )
+            for variante in generar_variantes(original):
+                nombre = f"{variante.extension}{variante.sufijo or ' original'}"
+                self.stdout.write(
+                    f"  {nombre:<14} {variante.ancho:>6} "
+                    f"{len(variante.contenido) / 1024:>8.1f} "
+                    f"{len(variante.contenido) / len(original) * 100:>5.0f}% "
+                    f"{variante.milisegundos:>7.1f}"
+                )
@@ -0,0 +1,128 @@
+# Generated by Django 5.2.9 on 2026-10-16 20:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def poblar_resumenes(apps, schema_editor):
+    """Calcula los resúmenes de las recaudaciones ya registradas"""
+    Recaudacion = apps.get_model("finanzas_app", "Recaudacion")
+    ResumenSemana = apps.get_model("finanzas_app", "ResumenSemana")
+    ResumenMes = apps.get_model("finanzas_app", "ResumenMes")
+    ResumenDiaSemana = apps.get_model("finanzas_app", "ResumenDiaSemana")
+    ResumenGeneral = apps.get_model("finanzas_app", "ResumenGeneral")
+
+    recaudaciones = Recaudacion.objects.order_by()
+    ResumenSemana.objects.bulk_create(
+        ResumenSemana(
+            numero_semana=fila["numero_semana"],
+            total=fila["total"],
+            dias=fila["dias"],
+            fecha_inicio=fila["inicio"],
+            fecha_fin=fila["fin"],
+        )
+        for fila in recaudaciones.values("numero_semana").annotate(
+            total=Sum("monto"), dias=Count("id"), inicio=Min("fecha"), fin=Max("fecha")
+        )
+    )
+    ResumenMes.objects.bulk_create(
+        ResumenMes(
+            anno=fila["fecha__year"],
+            mes=fila["fecha__month"],
+            total=fila["total"],
+            dias=fila["dias"],
+        )
+        for fila in recaudaciones.values("fecha__year", "fecha__month").annotate(
+            total=Sum("monto"), dias=Count("id")
+        )
+    )
+    ResumenDiaSemana.objects.bulk_create(
+        ResumenDiaSemana(
+            dia=(fila["fecha__week_day"] + 5) % 7,
+            total=fila["total"],
+            dias=fila["dias"],
+        )
+        for fila in recaudaciones.values("fecha__week_day").annotate(
+            total=Sum("monto"), dias=Count("id")
+        )
+    )
+    totales = recaudaciones.aggregate(total=Sum("monto"), dias=Count("id"))
+    ResumenGeneral.objects.create(
+        pk=1,
+        total=totales["total"] or 0,
+        dias=totales["dias"],
+        mejor_dia=recaudaciones.order_by("-monto", "fecha", "id").first(),
+        peor_dia=recaudaciones.order_by("monto", "fecha", "id").first(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas_app', '0002_alter_recaudacion_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenDiaSemana',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.PositiveSmallIntegerField(unique=True)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen por día de la semana',
+                'verbose_name_plural': 'Resúmenes por día de la semana',
+                'ordering': ['dia'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenSemana',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero_semana', models.PositiveIntegerField(unique=True, verbose_name='Semana')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias', models.PositiveIntegerField(default=0)),
+                ('fecha_inicio', models.DateField()),
+                ('fecha_fin', models.DateField()),
+            ],
+            options={
+                'verbose_name': 'Resumen semanal',
+                'verbose_name_plural': 'Resúmenes semanales',
+                'ordering': ['fecha_inicio'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenGeneral',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias', models.PositiveIntegerField(default=0)),
+                ('mejor_dia', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='finanzas_app.recaudacion')),
+                ('peor_dia', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='finanzas_app.recaudacion')),
+            ],
+            options={
+                'verbose_name': 'Resumen general',
+                'verbose_name_plural': 'Resumen general',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenMes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anno', models.PositiveIntegerField(verbose_name='Año')),
+                ('mes', models.PositiveSmallIntegerField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen mensual',
+                'verbose_name_plural': 'Resúmenes mensuales',
+                'ordering': ['anno', 'mes'],
+                'constraints': [models.UniqueConstraint(fields=('anno', 'mes'), name='resumen_mes_unico')],
+            },
+        ),
+        migrations.RunPython(poblar_resumenes, migrations.RunPython.noop),
+    ]
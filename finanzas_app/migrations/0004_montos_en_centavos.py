@@ -0,0 +1,98 @@
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import BigIntegerField, F, FloatField
+from django.db.models.functions import Cast, Round
+
+import finanzas_app.models.campos
+
+# (modelo, campo, definición anterior)
+CAMPOS = [
+    (
+        "recaudacion",
+        "monto",
+        dict(
+            decimal_places=2,
+            max_digits=10,
+            validators=[django.core.validators.MinValueValidator(0)],
+            verbose_name="Monto recaudado",
+        ),
+    ),
+    ("resumensemana", "total", dict(decimal_places=2, default=0, max_digits=14)),
+    ("resumenmes", "total", dict(decimal_places=2, default=0, max_digits=14)),
+    ("resumendiasemana", "total", dict(decimal_places=2, default=0, max_digits=14)),
+    ("resumengeneral", "total", dict(decimal_places=2, default=0, max_digits=14)),
+]
+
+
+def pesos_a_centavos(apps, schema_editor):
+    for modelo, campo, _ in CAMPOS:
+        apps.get_model("finanzas_app", modelo).objects.update(
+            **{
+                f"{campo}_centavos": Cast(
+                    Round(F(campo) * 100), output_field=BigIntegerField()
+                )
+            }
+        )
+
+
+def centavos_a_pesos(apps, schema_editor):
+    for modelo, campo, _ in CAMPOS:
+        apps.get_model("finanzas_app", modelo).objects.update(
+            **{
+                # En coma flotante: en SQLite la división de enteros trunca
+                campo: Cast(F(f"{campo}_centavos"), output_field=FloatField())
+                / 100
+            }
+        )
+
+
+def operaciones():
+    """
+    Pasa cada monto de ``DecimalField`` a ``CentavosField`` copiando los
+    datos a una columna nueva (un cambio de tipo en el lugar dejaría los
+    pesos tal cual en una columna de centavos).
+
+    El campo anterior se vuelve nullable antes de borrarlo para que la
+    migración se pueda revertir: al revertir se vuelve a crear vacío y se
+    llena desde los centavos antes de recuperar ``NOT NULL``.
+    """
+    antes, despues = [], []
+    for modelo, campo, anterior in CAMPOS:
+        antes += [
+            migrations.AlterField(
+                model_name=modelo,
+                name=campo,
+                field=models.DecimalField(null=True, **anterior),
+            ),
+            migrations.AddField(
+                model_name=modelo,
+                name=f"{campo}_centavos",
+                field=models.BigIntegerField(null=True),
+            ),
+        ]
+        final = {
+            clave: valor
+            for clave, valor in anterior.items()
+            if clave in ("default", "validators", "verbose_name")
+        }
+        despues += [
+            migrations.RemoveField(model_name=modelo, name=campo),
+            migrations.RenameField(
+                model_name=modelo, old_name=f"{campo}_centavos", new_name=campo
+            ),
+            migrations.AlterField(
+                model_name=modelo,
+                name=campo,
+                field=finanzas_app.models.campos.CentavosField(**final),
+            ),
+        ]
+    return antes + [migrations.RunPython(pesos_a_centavos, centavos_a_pesos)] + despues
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finanzas_app", "0003_resumenes"),
+    ]
+
+    operations = operaciones()
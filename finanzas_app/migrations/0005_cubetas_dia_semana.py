@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-16 21:07
+
+import finanzas_app.models.campos
+from django.db import migrations, models
+
+from finanzas_app.services.resumenes import ResumenService
+
+
+def poblar_cubetas(apps, schema_editor):
+    """Agrupa en cubetas las recaudaciones ya registradas"""
+    Recaudacion = apps.get_model("finanzas_app", "Recaudacion")
+    CubetaDiaSemana = apps.get_model("finanzas_app", "CubetaDiaSemana")
+
+    cubetas = ResumenService.cubetas(Recaudacion.objects.order_by())
+    CubetaDiaSemana.objects.bulk_create(
+        CubetaDiaSemana(
+            anno=anno,
+            dia=dia,
+            indice=indice,
+            total=total,
+            dias=cantidad,
+            cuadrados=cuadrados,
+        )
+        for (anno, dia, indice), (total, cantidad, cuadrados) in cubetas.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas_app', '0004_montos_en_centavos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CubetaDiaSemana',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anno', models.PositiveIntegerField(verbose_name='Año')),
+                ('dia', models.PositiveSmallIntegerField()),
+                ('indice', models.IntegerField()),
+                ('total', finanzas_app.models.campos.CentavosField(default=0)),
+                ('dias', models.PositiveIntegerField(default=0)),
+                ('cuadrados', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Cubeta por día de la semana',
+                'verbose_name_plural': 'Cubetas por día de la semana',
+                'ordering': ['anno', 'dia', 'indice'],
+                'constraints': [models.UniqueConstraint(fields=('anno', 'dia', 'indice'), name='cubeta_dia_semana_unica')],
+            },
+        ),
+        migrations.RunPython(poblar_cubetas, migrations.RunPython.noop),
+    ]
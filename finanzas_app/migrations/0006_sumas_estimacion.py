@@ -0,0 +1,46 @@
+# Generated by Django 5.2.9 on 2026-10-16 21:11
+
+from django.db import migrations, models
+
+from finanzas_app.services.resumenes import ResumenService
+
+
+def poblar_sumas(apps, schema_editor):
+    """Calcula las sumas del modelo de estimación de los registros existentes"""
+    Recaudacion = apps.get_model("finanzas_app", "Recaudacion")
+    ResumenDiaSemana = apps.get_model("finanzas_app", "ResumenDiaSemana")
+
+    grupos = ResumenService.dias_semana(Recaudacion.objects.order_by())
+    for dia, (_, _, sumas) in grupos.items():
+        ResumenDiaSemana.objects.filter(dia=dia).update(**sumas)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas_app', '0005_cubetas_dia_semana'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumendiasemana',
+            name='cuadrados',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumendiasemana',
+            name='suma_t',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumendiasemana',
+            name='suma_t2',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumendiasemana',
+            name='suma_ty',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(poblar_sumas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-16 21:13
+
+import django.core.validators
+import django.utils.timezone
+import finanzas_app.models.campos
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas_app', '0006_sumas_estimacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PagoDeuda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+                ('fecha', models.DateField(default=django.utils.timezone.now, verbose_name='Fecha del pago')),
+                ('monto', finanzas_app.models.campos.CentavosField(validators=[django.core.validators.MinValueValidator(0)], verbose_name='Monto pagado')),
+                ('numero_semana', models.PositiveIntegerField(blank=True, verbose_name='Semana')),
+                ('nota', models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                'verbose_name': 'Pago de deuda',
+                'verbose_name_plural': 'Pagos de deuda',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['numero_semana'], name='finanzas_ap_numero__c7ffa8_idx')],
+            },
+        ),
+    ]
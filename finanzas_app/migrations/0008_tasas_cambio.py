@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-16 21:18
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas_app', '0007_pagos_deuda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TasaCambio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+                ('moneda', models.CharField(default='USD', max_length=3)),
+                ('fecha', models.DateField(verbose_name='Vigente desde')),
+                ('tasa', models.DecimalField(decimal_places=4, max_digits=12, validators=[django.core.validators.MinValueValidator(Decimal('0.0001'))], verbose_name='Tasa (CUP por unidad)')),
+            ],
+            options={
+                'verbose_name': 'Tasa de cambio',
+                'verbose_name_plural': 'Tasas de cambio',
+                'ordering': ['moneda', '-fecha'],
+                'constraints': [models.UniqueConstraint(fields=('moneda', 'fecha'), name='tasa_unica_por_dia'), models.CheckConstraint(condition=models.Q(('tasa__gt', 0)), name='tasa_positiva')],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import migrations
+from django.db.models import Count, Max, Min, Sum
+
+
+def renumerar_semanas(apps, schema_editor):
+    """
+    Renumera las semanas de forma consecutiva desde la de
+    ``RECORDING_START_DATE`` (antes se restaban números de semana ISO, que
+    vuelven a empezar cada año) y recalcula los resúmenes semanales
+    """
+    Recaudacion = apps.get_model("finanzas_app", "Recaudacion")
+    PagoDeuda = apps.get_model("finanzas_app", "PagoDeuda")
+    ResumenSemana = apps.get_model("finanzas_app", "ResumenSemana")
+
+    inicio = datetime.strptime(settings.RECORDING_START_DATE, "%Y-%m-%d").date()
+    lunes = inicio - timedelta(days=inicio.weekday())
+
+    for modelo in (Recaudacion, PagoDeuda):
+        registros = list(modelo.objects.order_by().only("id", "fecha", "numero_semana"))
+        cambiados = []
+        for registro in registros:
+            semana = (registro.fecha - lunes).days // 7 + 1
+            if registro.numero_semana != semana:
+                registro.numero_semana = semana
+                cambiados.append(registro)
+        modelo.objects.bulk_update(cambiados, ["numero_semana"], batch_size=500)
+
+    ResumenSemana.objects.all().delete()
+    ResumenSemana.objects.bulk_create(
+        ResumenSemana(
+            numero_semana=fila["numero_semana"],
+            total=fila["total"],
+            dias=fila["dias"],
+            fecha_inicio=fila["inicio"],
+            fecha_fin=fila["fin"],
+        )
+        for fila in Recaudacion.objects.order_by()
+        .values("numero_semana")
+        .annotate(
+            total=Sum("monto"), dias=Count("id"), inicio=Min("fecha"), fin=Max("fecha")
+        )
+    )
+
+
+def invalidar_cache(apps, schema_editor):
+    """
+    Las estadísticas y filas en caché usan los números anteriores: se
+    incrementan las versiones de datos y de fragmentos de la caché de
+    estadísticas (mismas claves que ``cache_estadisticas`` al escribir esta
+    migración, sin importar el código actual)
+    """
+    cache = caches[settings.ESTADISTICAS_CONFIG["CACHE_ALIAS"]]
+    nombre = str(schema_editor.connection.settings_dict["NAME"])
+    espacio = "estadisticas:" + hashlib.sha256(nombre.encode("utf-8")).hexdigest()[:12]
+    for contador in ("version", "version_fragmentos"):
+        clave = f"{espacio}:{contador}"
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.add(clave, time.time_ns(), timeout=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finanzas_app', '0008_tasas_cambio'),
+    ]
+
+    operations = [
+        migrations.RunPython(renumerar_semanas, migrations.RunPython.noop),
+        migrations.RunPython(invalidar_cache, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django import forms
+from django.core import exceptions
+from django.db import models
+
+from finanzas_app.dinero import a_centavos, a_decimal, desde_centavos
+
+
+class CentavosField(models.BigIntegerField):
+    """
+    Monto de dinero guardado como entero de centavos.
+
+    En la base de datos es un ``bigint`` (las sumas son exactas y de
+    enteros); en Python y en los formularios es un ``Decimal`` con dos
+    decimales. Los filtros (``monto__gt=100``) usan pesos, como antes.
+    """
+
+    description = "Monto en centavos"
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return desde_centavos(value)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        try:
+            return a_decimal(value)
+        except ValueError:
+            raise exceptions.ValidationError(
+                self.error_messages["invalid"],
+                code="invalid",
+                params={"value": value},
+            )
+
+    def get_prep_value(self, value):
+        if value is None or hasattr(value, "resolve_expression"):
+            return value
+        return a_centavos(value)
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(
+            self,
+            **{"form_class": forms.DecimalField, "decimal_places": 2, **kwargs},
+        )
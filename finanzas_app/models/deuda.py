@@ -0,0 +1,32 @@
+from django.core.validators import MinValueValidator
+from django.db import models
+from django.utils import timezone
+
+from .base import BaseModel
+from .campos import CentavosField
+from .ingresos import numero_semana
+
+
+class PagoDeuda(BaseModel):
+    """Pago de la deuda semanal (en la moneda de ``DEUDA_CONFIG``)"""
+
+    fecha = models.DateField(verbose_name="Fecha del pago", default=timezone.now)
+    monto = CentavosField(
+        verbose_name="Monto pagado",
+        validators=[MinValueValidator(0)],
+    )
+    numero_semana = models.PositiveIntegerField(verbose_name="Semana", blank=True)
+    nota = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        verbose_name = "Pago de deuda"
+        verbose_name_plural = "Pagos de deuda"
+        ordering = ["-fecha"]
+        indexes = [models.Index(fields=["numero_semana"])]
+
+    def __str__(self):
+        return f"Fecha: {self.fecha}, Pago: $ {self.monto}"
+
+    def save(self, *args, **kwargs):
+        self.numero_semana = numero_semana(self.fecha)
+        super().save(*args, **kwargs)
@@ -1,17 +1,45 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from django.conf import settings
 from .base import BaseModel
+from .campos import CentavosField
+
+DIAS_SEMANA = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
+
+def _fecha_inicio_registro():
+    return datetime.strptime(settings.RECORDING_START_DATE, "%Y-%m-%d").date()
+
+
+def _lunes_inicio():
+    """Lunes de la semana de ``RECORDING_START_DATE`` (inicio de la semana 1)"""
+    inicio = _fecha_inicio_registro()
+    return inicio - timedelta(days=inicio.weekday())
+
+
+def numero_semana(fecha):
+    """
+    Semana de una fecha, contando desde la de ``RECORDING_START_DATE`` (1).
+
+    Las semanas van de lunes a domingo y se numeran de forma consecutiva,
+    también al cambiar de año.
+    """
+    if isinstance(fecha, datetime):
+        fecha = fecha.date()
+    return (fecha - _lunes_inicio()).days // 7 + 1
+
+
+def inicio_semana(numero):
+    """Lunes de la semana ``numero`` (inversa de ``numero_semana``)"""
+    return _lunes_inicio() + timedelta(weeks=numero - 1)
 
 
 class Recaudacion(BaseModel):
     fecha = models.DateField(verbose_name="Fecha de recaudación", default=timezone.now)
-    monto = models.DecimalField(
+    monto = CentavosField(
         verbose_name="Monto recaudado",
-        max_digits=10,
-        decimal_places=2,
         validators=[MinValueValidator(0)],
     )
     numero_semana = models.PositiveIntegerField(verbose_name="Semana", blank=True)
@@ -29,23 +57,9 @@ class Recaudacion(BaseModel):
         return f"Fecha: {self.fecha}, Recaudación: $ {self.monto}"
 
     def save(self, *args, **kwargs):
-        fecha_inicio = datetime.strptime(
-            settings.RECORDING_START_DATE, "%Y-%m-%d"
-        ).date()
-        self.numero_semana = (
-            self.fecha.isocalendar()[1] - fecha_inicio.isocalendar()[1] + 1
-        )
+        self.numero_semana = numero_semana(self.fecha)
         super().save(*args, **kwargs)
 
     @property
     def dia_semana(self):
-        dias = {
-            0: "Lunes",
-            1: "Martes",
-            2: "Miércoles",
-            3: "Jueves",
-            4: "Viernes",
-            5: "Sábado",
-            6: "Domingo",
-        }
-        return dias[self.fecha.weekday()]
+        return DIAS_SEMANA[self.fecha.weekday()]
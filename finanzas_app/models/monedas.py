@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from django.core.validators import MinValueValidator
+from django.db import models
+
+from .base import BaseModel
+
+
+class TasaCambio(BaseModel):
+    """
+    Tasa de cambio de un día: cuántas unidades de la moneda de origen
+    (``MONEDAS_CONFIG["ORIGEN"]``, CUP) vale una unidad de ``moneda``.
+
+    Rige desde ``fecha`` hasta la siguiente tasa de la misma moneda.
+    """
+
+    moneda = models.CharField(max_length=3, default="USD")
+    fecha = models.DateField(verbose_name="Vigente desde")
+    tasa = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        validators=[MinValueValidator(Decimal("0.0001"))],
+        verbose_name="Tasa (CUP por unidad)",
+    )
+
+    class Meta:
+        verbose_name = "Tasa de cambio"
+        verbose_name_plural = "Tasas de cambio"
+        ordering = ["moneda", "-fecha"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["moneda", "fecha"], name="tasa_unica_por_dia"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(tasa__gt=0), name="tasa_positiva"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha}: {self.tasa} CUP/{self.moneda}"
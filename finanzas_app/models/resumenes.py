@@ -0,0 +1,133 @@
+from django.db import models
+
+from .campos import CentavosField
+from .ingresos import Recaudacion
+
+
+class ResumenSemana(models.Model):
+    """Totales de una semana (``numero_semana``), mantenidos por delta"""
+
+    numero_semana = models.PositiveIntegerField(verbose_name="Semana", unique=True)
+    total = CentavosField(default=0)
+    dias = models.PositiveIntegerField(default=0)
+    fecha_inicio = models.DateField()
+    fecha_fin = models.DateField()
+
+    class Meta:
+        verbose_name = "Resumen semanal"
+        verbose_name_plural = "Resúmenes semanales"
+        ordering = ["fecha_inicio"]
+
+    def __str__(self):
+        return f"Semana {self.numero_semana}: $ {self.total} ({self.dias} días)"
+
+
+class ResumenMes(models.Model):
+    """Totales de un mes del calendario, mantenidos por delta"""
+
+    anno = models.PositiveIntegerField(verbose_name="Año")
+    mes = models.PositiveSmallIntegerField()
+    total = CentavosField(default=0)
+    dias = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Resumen mensual"
+        verbose_name_plural = "Resúmenes mensuales"
+        ordering = ["anno", "mes"]
+        constraints = [
+            models.UniqueConstraint(fields=["anno", "mes"], name="resumen_mes_unico")
+        ]
+
+    def __str__(self):
+        return f"{self.anno}-{self.mes:02d}: $ {self.total} ({self.dias} días)"
+
+
+class ResumenDiaSemana(models.Model):
+    """
+    Totales por día de la semana (0 = lunes ... 6 = domingo).
+
+    Las sumas ``suma_t``, ``suma_t2``, ``suma_ty`` y ``cuadrados`` (con
+    ``t`` en días desde ``ORIGEN_TENDENCIA`` y los montos en centavos) son
+    las de las ecuaciones normales del modelo de estimación (ver
+    ``services/estimacion.py``).
+    """
+
+    dia = models.PositiveSmallIntegerField(unique=True)
+    total = CentavosField(default=0)
+    dias = models.PositiveIntegerField(default=0)
+    suma_t = models.BigIntegerField(default=0)
+    suma_t2 = models.BigIntegerField(default=0)
+    suma_ty = models.BigIntegerField(default=0)
+    cuadrados = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Resumen por día de la semana"
+        verbose_name_plural = "Resúmenes por día de la semana"
+        ordering = ["dia"]
+
+    def __str__(self):
+        return f"Día {self.dia}: $ {self.total} ({self.dias} días)"
+
+
+class CubetaDiaSemana(models.Model):
+    """
+    Recaudaciones de un año y día de la semana cuyo monto cae en una cubeta
+    logarítmica (ver ``services/distribucion.py``), mantenidas por delta.
+
+    Las cubetas de un día forman un boceto de cuantiles; con ``total`` y
+    ``cuadrados`` (suma de los montos al cuadrado, en centavos²) dan además
+    la media y la varianza exactas. Los años se combinan sumando.
+    """
+
+    anno = models.PositiveIntegerField(verbose_name="Año")
+    dia = models.PositiveSmallIntegerField()
+    indice = models.IntegerField()
+    total = CentavosField(default=0)
+    dias = models.PositiveIntegerField(default=0)
+    cuadrados = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Cubeta por día de la semana"
+        verbose_name_plural = "Cubetas por día de la semana"
+        ordering = ["anno", "dia", "indice"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["anno", "dia", "indice"], name="cubeta_dia_semana_unica"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.anno}, día {self.dia}, cubeta {self.indice}: {self.dias} días"
+
+
+class ResumenGeneral(models.Model):
+    """
+    Totales de todo el historial (una sola fila, ``pk=1``).
+
+    ``mejor_dia`` y ``peor_dia`` son la recaudación de mayor y menor monto
+    (a igualdad, la más antigua).
+    """
+
+    total = CentavosField(default=0)
+    dias = models.PositiveIntegerField(default=0)
+    mejor_dia = models.ForeignKey(
+        Recaudacion,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    peor_dia = models.ForeignKey(
+        Recaudacion,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    class Meta:
+        verbose_name = "Resumen general"
+        verbose_name_plural = "Resumen general"
+
+    def __str__(self):
+        return f"Total: $ {self.total} ({self.dias} días)"
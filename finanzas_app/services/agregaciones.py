@@ -0,0 +1,533 @@
+# finanzas_app/services/agregaciones.py
+"""
+Capa de agregación de recaudaciones usada por ``EstadisticaService``.
+
+Hay cuatro implementaciones con la misma salida; se elige con
+``settings.ESTADISTICAS_CONFIG["BACKEND"]``:
+
+- ``AgregacionResumenes`` ("resumenes"): lee los resúmenes materializados
+  (``models/resumenes.py``), que se mantienen por delta en cada cambio.
+  Son unas pocas decenas de filas sin importar el largo del historial.
+- ``AgregacionSQL`` ("sql"): agrupa en la base de datos (``Sum``,
+  ``Count``, ``Min``/``Max``, ``TruncMonth``, ``ExtractWeekDay``) y solo
+  recibe una fila por grupo. Memoria y tiempo dependen del número de
+  semanas/meses, no del número de días registrados.
+- ``AgregacionNumpy`` ("numpy"): carga fecha y monto una vez en arreglos
+  NumPy (días y centavos enteros, ver ``services/instantanea.py``) y
+  agrupa con operaciones vectorizadas.
+- ``AgregacionPython`` ("python"): lee la tabla una vez como tuplas y
+  acumula todo en una sola pasada. Hace una única consulta, útil con
+  pocas filas o bases de datos remotas con mucha latencia.
+
+Los montos son ``Decimal`` exactos (en la base de datos son enteros de
+centavos, ver ``CentavosField``). Los promedios se calculan dividiendo
+``total / dias`` en Python y se redondean a centavos: ``Avg`` sobre una
+columna entera devuelve un float.
+
+En otra moneda (``obtener_agregacion(moneda)``) se usa siempre la
+instantánea de NumPy con los montos convertidos día por día: los resúmenes
+y las sumas en SQL están en la moneda de origen.
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import ExtractWeekDay, TruncMonth
+
+from finanzas_app.dinero import CENTAVO, desde_centavos
+from finanzas_app.models.ingresos import Recaudacion
+from finanzas_app.models.resumenes import (
+    ResumenDiaSemana,
+    ResumenGeneral,
+    ResumenMes,
+    ResumenSemana,
+)
+from finanzas_app.services.monedas import hay_conversion
+
+NOMBRES_MESES = [
+    "Enero",
+    "Febrero",
+    "Marzo",
+    "Abril",
+    "Mayo",
+    "Junio",
+    "Julio",
+    "Agosto",
+    "Septiembre",
+    "Octubre",
+    "Noviembre",
+    "Diciembre",
+]
+
+NOMBRES_DIAS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+CERO = Decimal("0.00")
+
+
+def centavos(valor):
+    """Redondea un monto a centavos"""
+    return valor.quantize(CENTAVO)
+
+
+def promedio(total, cantidad):
+    """Promedio exacto redondeado a centavos (0 si no hay registros)"""
+    if not cantidad:
+        return CERO
+    return (total / cantidad).quantize(CENTAVO)
+
+
+def recaudaciones(desde=None, hasta=None):
+    """
+    Recaudaciones dentro de una ventana de fechas (ambos extremos incluidos).
+
+    El filtro usa el índice de ``fecha``: el costo de las agregaciones es
+    proporcional a la ventana, no al historial completo.
+    """
+    consulta = Recaudacion.objects.all()
+    if desde is not None:
+        consulta = consulta.filter(fecha__gte=desde)
+    if hasta is not None:
+        consulta = consulta.filter(fecha__lte=hasta)
+    return consulta
+
+
+def estadisticas_vacias():
+    return {
+        "total_recaudado": 0,
+        "promedio_diario": 0,
+        "dias_registrados": 0,
+        "mejor_dia": None,
+        "peor_dia": None,
+    }
+
+
+def dias_semana_vacios():
+    return {dia: {"total": CERO, "count": 0, "promedio": CERO} for dia in NOMBRES_DIAS}
+
+
+def grupo_semana(numero_semana, total, dias):
+    return {
+        "semana": numero_semana,
+        "total": centavos(total),
+        "dias": dias,
+        "promedio": promedio(total, dias),
+    }
+
+
+def grupo_mes(anno, mes, total, dias):
+    return {
+        "mes": mes,
+        "mes_nombre": NOMBRES_MESES[mes - 1],
+        "año": anno,
+        "total": centavos(total),
+        "dias": dias,
+        "promedio": promedio(total, dias),
+    }
+
+
+class AgregacionSQL:
+    """Agregaciones resueltas con GROUP BY en la base de datos"""
+
+    @classmethod
+    def estadisticas(cls, desde=None, hasta=None):
+        totales = recaudaciones(desde, hasta).aggregate(
+            total=Sum("monto"),
+            dias=Count("id"),
+            maximo=Max("monto"),
+            minimo=Min("monto"),
+        )
+        if not totales["dias"]:
+            return estadisticas_vacias()
+
+        # Mejor y peor día en una sola consulta (a igualdad, el más antiguo)
+        mejor_dia = peor_dia = None
+        extremos = (
+            recaudaciones(desde, hasta)
+            .filter(Q(monto=totales["maximo"]) | Q(monto=totales["minimo"]))
+            .order_by("fecha", "id")
+        )
+        for registro in extremos:
+            if mejor_dia is None and registro.monto == totales["maximo"]:
+                mejor_dia = registro
+            if peor_dia is None and registro.monto == totales["minimo"]:
+                peor_dia = registro
+
+        return {
+            "total_recaudado": centavos(totales["total"]),
+            "promedio_diario": promedio(totales["total"], totales["dias"]),
+            "dias_registrados": totales["dias"],
+            "mejor_dia": mejor_dia,
+            "peor_dia": peor_dia,
+        }
+
+    @classmethod
+    def por_semana(cls, desde=None, hasta=None):
+        filas = (
+            recaudaciones(desde, hasta)
+            .values("numero_semana")
+            .annotate(total=Sum("monto"), dias=Count("id"), inicio=Min("fecha"))
+            .order_by("inicio")
+        )
+        return {
+            f"{fila['numero_semana']}": grupo_semana(
+                fila["numero_semana"], fila["total"], fila["dias"]
+            )
+            for fila in filas
+        }
+
+    @classmethod
+    def por_mes(cls, desde=None, hasta=None):
+        filas = (
+            recaudaciones(desde, hasta)
+            .annotate(mes=TruncMonth("fecha"))
+            .values("mes")
+            .annotate(total=Sum("monto"), dias=Count("id"))
+            .order_by("mes")
+        )
+        return {
+            f"{fila['mes'].year}-{fila['mes'].month}": grupo_mes(
+                fila["mes"].year, fila["mes"].month, fila["total"], fila["dias"]
+            )
+            for fila in filas
+        }
+
+    @classmethod
+    def por_dia_semana(cls, desde=None, hasta=None):
+        filas = (
+            recaudaciones(desde, hasta)
+            .annotate(dia=ExtractWeekDay("fecha"))
+            .values("dia")
+            .annotate(total=Sum("monto"), dias=Count("id"))
+            .order_by()
+        )
+        dias_semana = dias_semana_vacios()
+        for fila in filas:
+            # ExtractWeekDay: 1 = domingo ... 7 = sábado
+            dia = dias_semana[NOMBRES_DIAS[(fila["dia"] + 5) % 7]]
+            dia["total"] = centavos(fila["total"])
+            dia["count"] = fila["dias"]
+            dia["promedio"] = promedio(fila["total"], fila["dias"])
+        return dias_semana
+
+    @classmethod
+    def ultimos(cls, cantidad, desde=None, hasta=None):
+        if not cantidad:
+            return []
+        return list(recaudaciones(desde, hasta).order_by("-fecha")[:cantidad])
+
+    @classmethod
+    def resumen(cls, ultimos=10, desde=None, hasta=None):
+        return {
+            "estadisticas": cls.estadisticas(desde, hasta),
+            "por_semana": cls.por_semana(desde, hasta),
+            "por_mes": cls.por_mes(desde, hasta),
+            "por_dia_semana": cls.por_dia_semana(desde, hasta),
+            "ultimos_registros": cls.ultimos(ultimos, desde, hasta),
+        }
+
+
+class AgregacionPython:
+    """Todas las agregaciones en una sola lectura de la tabla"""
+
+    @classmethod
+    def resumen(cls, ultimos=10, desde=None, hasta=None):
+        campos = [campo.attname for campo in Recaudacion._meta.concrete_fields]
+        posicion_fecha = campos.index("fecha")
+        posicion_monto = campos.index("monto")
+        posicion_semana = campos.index("numero_semana")
+
+        consulta = (
+            recaudaciones(desde, hasta).order_by("fecha", "id").values_list(*campos)
+        )
+        filas = list(consulta)
+
+        total = CERO
+        mejor = peor = None
+        semanas = {}
+        meses = {}
+        dias_semana = {dia: [CERO, 0] for dia in NOMBRES_DIAS}
+
+        for fila in filas:
+            fecha = fila[posicion_fecha]
+            monto = fila[posicion_monto]
+
+            total += monto
+            if mejor is None or monto > mejor[posicion_monto]:
+                mejor = fila
+            if peor is None or monto < peor[posicion_monto]:
+                peor = fila
+
+            acumulado = semanas.setdefault(fila[posicion_semana], [CERO, 0])
+            acumulado[0] += monto
+            acumulado[1] += 1
+
+            acumulado = meses.setdefault((fecha.year, fecha.month), [CERO, 0])
+            acumulado[0] += monto
+            acumulado[1] += 1
+
+            acumulado = dias_semana[NOMBRES_DIAS[fecha.weekday()]]
+            acumulado[0] += monto
+            acumulado[1] += 1
+
+        if filas:
+            estadisticas = {
+                "total_recaudado": total,
+                "promedio_diario": promedio(total, len(filas)),
+                "dias_registrados": len(filas),
+                "mejor_dia": Recaudacion.from_db(consulta.db, campos, mejor),
+                "peor_dia": Recaudacion.from_db(consulta.db, campos, peor),
+            }
+        else:
+            estadisticas = estadisticas_vacias()
+
+        # Las filas ya están en memoria: los últimos salen sin otra consulta
+        recientes = filas[::-1][:ultimos] if ultimos else []
+
+        return {
+            "estadisticas": estadisticas,
+            "por_semana": {
+                f"{semana}": grupo_semana(semana, *acumulado)
+                for semana, acumulado in semanas.items()
+            },
+            "por_mes": {
+                f"{anno}-{mes}": grupo_mes(anno, mes, *acumulado)
+                for (anno, mes), acumulado in meses.items()
+            },
+            "por_dia_semana": {
+                dia: {
+                    "total": total_dia,
+                    "count": cantidad,
+                    "promedio": promedio(total_dia, cantidad),
+                }
+                for dia, (total_dia, cantidad) in dias_semana.items()
+            },
+            "ultimos_registros": [
+                Recaudacion.from_db(consulta.db, campos, fila) for fila in recientes
+            ],
+        }
+
+    @classmethod
+    def estadisticas(cls, desde=None, hasta=None):
+        return cls.resumen(0, desde, hasta)["estadisticas"]
+
+    @classmethod
+    def por_semana(cls, desde=None, hasta=None):
+        return cls.resumen(0, desde, hasta)["por_semana"]
+
+    @classmethod
+    def por_mes(cls, desde=None, hasta=None):
+        return cls.resumen(0, desde, hasta)["por_mes"]
+
+    @classmethod
+    def por_dia_semana(cls, desde=None, hasta=None):
+        return cls.resumen(0, desde, hasta)["por_dia_semana"]
+
+
+class AgregacionResumenes(AgregacionSQL):
+    """
+    Agregaciones leídas de los resúmenes materializados.
+
+    Los resúmenes cubren todo el historial: con una ventana de fechas
+    (``desde``/``hasta``) se agrupa en SQL sobre las recaudaciones de la
+    ventana, como ``AgregacionSQL``, de quien también se heredan los
+    últimos registros y el armado del resumen.
+    """
+
+    @classmethod
+    def estadisticas(cls, desde=None, hasta=None):
+        if desde is not None or hasta is not None:
+            return super().estadisticas(desde, hasta)
+        general = (
+            ResumenGeneral.objects.select_related("mejor_dia", "peor_dia")
+            .filter(pk=1)
+            .first()
+        )
+        if general is None or not general.dias:
+            return estadisticas_vacias()
+        return {
+            "total_recaudado": general.total,
+            "promedio_diario": promedio(general.total, general.dias),
+            "dias_registrados": general.dias,
+            "mejor_dia": general.mejor_dia,
+            "peor_dia": general.peor_dia,
+        }
+
+    @classmethod
+    def por_semana(cls, desde=None, hasta=None):
+        if desde is not None or hasta is not None:
+            return super().por_semana(desde, hasta)
+        filas = ResumenSemana.objects.order_by("fecha_inicio").values_list(
+            "numero_semana", "total", "dias"
+        )
+        return {
+            f"{semana}": grupo_semana(semana, total, dias)
+            for semana, total, dias in filas
+        }
+
+    @classmethod
+    def por_mes(cls, desde=None, hasta=None):
+        if desde is not None or hasta is not None:
+            return super().por_mes(desde, hasta)
+        filas = ResumenMes.objects.order_by("anno", "mes").values_list(
+            "anno", "mes", "total", "dias"
+        )
+        return {
+            f"{anno}-{mes}": grupo_mes(anno, mes, total, dias)
+            for anno, mes, total, dias in filas
+        }
+
+    @classmethod
+    def por_dia_semana(cls, desde=None, hasta=None):
+        if desde is not None or hasta is not None:
+            return super().por_dia_semana(desde, hasta)
+        dias_semana = dias_semana_vacios()
+        for dia, total, dias in ResumenDiaSemana.objects.values_list(
+            "dia", "total", "dias"
+        ):
+            dias_semana[NOMBRES_DIAS[dia]] = {
+                "total": total,
+                "count": dias,
+                "promedio": promedio(total, dias),
+            }
+        return dias_semana
+
+
+class AgregacionNumpy:
+    """Agregaciones vectorizadas sobre una instantánea columnar"""
+
+    # Moneda de los montos (None = la de origen); ver ``en_moneda``
+    moneda = None
+
+    @classmethod
+    def en_moneda(cls, moneda):
+        """Variante de esta clase con los montos convertidos a ``moneda``"""
+        if moneda not in _CONVERTIDAS:
+            _CONVERTIDAS[moneda] = type(
+                f"{cls.__name__}{moneda}", (cls,), {"moneda": moneda}
+            )
+        return _CONVERTIDAS[moneda]
+
+    @classmethod
+    def _instantanea(cls, desde=None, hasta=None):
+        from finanzas_app.services.instantanea import InstantaneaRecaudaciones
+
+        return InstantaneaRecaudaciones(recaudaciones(desde, hasta), cls.moneda)
+
+    @classmethod
+    def resumen(cls, ultimos=10, desde=None, hasta=None):
+        instantanea = cls._instantanea(desde, hasta)
+        return {
+            "estadisticas": cls._estadisticas(instantanea),
+            "por_semana": cls._por_semana(instantanea),
+            "por_mes": cls._por_mes(instantanea),
+            "por_dia_semana": cls._por_dia_semana(instantanea),
+            "ultimos_registros": cls._ultimos(instantanea, ultimos),
+        }
+
+    @classmethod
+    def estadisticas(cls, desde=None, hasta=None):
+        return cls._estadisticas(cls._instantanea(desde, hasta))
+
+    @classmethod
+    def por_semana(cls, desde=None, hasta=None):
+        return cls._por_semana(cls._instantanea(desde, hasta))
+
+    @classmethod
+    def por_mes(cls, desde=None, hasta=None):
+        return cls._por_mes(cls._instantanea(desde, hasta))
+
+    @classmethod
+    def por_dia_semana(cls, desde=None, hasta=None):
+        return cls._por_dia_semana(cls._instantanea(desde, hasta))
+
+    @staticmethod
+    def _estadisticas(instantanea):
+        if not len(instantanea):
+            return estadisticas_vacias()
+        mejor, peor = instantanea.extremos()
+        registros = _en_moneda(
+            instantanea, Recaudacion.objects.in_bulk({mejor, peor})
+        )
+        total = desde_centavos(instantanea.total())
+        return {
+            "total_recaudado": total,
+            "promedio_diario": promedio(total, len(instantanea)),
+            "dias_registrados": len(instantanea),
+            "mejor_dia": registros[mejor],
+            "peor_dia": registros[peor],
+        }
+
+    @staticmethod
+    def _por_semana(instantanea):
+        semanas, totales, dias = instantanea.agrupar(instantanea.semanas)
+        return {
+            f"{semana}": grupo_semana(int(semana), desde_centavos(total), int(n))
+            for semana, total, n in zip(semanas, totales, dias)
+        }
+
+    @staticmethod
+    def _por_mes(instantanea):
+        meses, totales, dias = instantanea.agrupar(instantanea.meses)
+        resultado = {}
+        for indice, total, n in zip(meses, totales, dias):
+            anno, mes = 1970 + int(indice) // 12, int(indice) % 12 + 1
+            resultado[f"{anno}-{mes}"] = grupo_mes(
+                anno, mes, desde_centavos(total), int(n)
+            )
+        return resultado
+
+    @staticmethod
+    def _por_dia_semana(instantanea):
+        dias_semana = dias_semana_vacios()
+        for dia, total, n in zip(*instantanea.agrupar(instantanea.dias_semana)):
+            total = desde_centavos(total)
+            dias_semana[NOMBRES_DIAS[dia]] = {
+                "total": total,
+                "count": int(n),
+                "promedio": promedio(total, int(n)),
+            }
+        return dias_semana
+
+    @staticmethod
+    def _ultimos(instantanea, cantidad):
+        if not cantidad:
+            return []
+        ids = [int(i) for i in instantanea.ids[::-1][:cantidad]]
+        registros = _en_moneda(instantanea, Recaudacion.objects.in_bulk(ids))
+        return [registros[i] for i in ids]
+
+
+_CONVERTIDAS = {}
+
+
+def _en_moneda(instantanea, registros):
+    """
+    Registros (id -> ``Recaudacion``) con el monto en la moneda de la
+    instantánea, para mostrarlos (no se guardan)
+    """
+    if instantanea.moneda is not None:
+        for id_registro, monto in instantanea.montos(registros).items():
+            registros[id_registro].monto = monto
+    return registros
+
+
+BACKENDS = {
+    "resumenes": AgregacionResumenes,
+    "sql": AgregacionSQL,
+    "numpy": AgregacionNumpy,
+    "python": AgregacionPython,
+}
+
+
+def obtener_agregacion(moneda=None):
+    """
+    Implementación configurada en ``ESTADISTICAS_CONFIG["BACKEND"]``, o la
+    de NumPy con los montos convertidos si se pide otra ``moneda``
+    """
+    backend = settings.ESTADISTICAS_CONFIG["BACKEND"]
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de estadísticas desconocido: {backend}")
+    if hay_conversion(moneda):
+        return AgregacionNumpy.en_moneda(moneda)
+    return BACKENDS[backend]
@@ -0,0 +1,242 @@
+# finanzas_app/services/cache_estadisticas.py
+"""
+Caché de estadísticas versionada por datos.
+
+Los resultados de ``EstadisticaService`` y ``ProcesadorTablaSemanal`` se
+guardan en la caché de Django (alias ``ESTADISTICAS_CONFIG["CACHE_ALIAS"]``:
+memoria local, archivos o Redis según ``CACHES``) junto con la versión de
+los datos con la que se calcularon. La versión se incrementa cada vez que
+se guarda o borra una ``Recaudacion`` (o un pago de deuda o una tasa de
+cambio) y al terminar una importación; un resultado de otra versión no se
+considera un acierto.
+
+La tabla semanal se guarda además por filas (fragmentos de plantilla, ver
+``tabla_semanal.html``), con la versión de los datos de cada semana: al
+guardar o borrar una recaudación solo cambia la de su semana (y la de la
+semana anterior si se movió de fecha).
+
+Stale-while-revalidate: cuando la versión cambió, la primera petición
+recalcula (con un bloqueo en la caché) y las que llegan mientras tanto
+reciben el resultado anterior en lugar de recalcular todas a la vez
+(``ESTADISTICAS_CONFIG["SERVIR_OBSOLETO"]``).
+
+Los contadores de aciertos, fallos y respuestas obsoletas son del proceso
+y se consultan con ``contadores()`` (ver ``manage.py cache_estadisticas``).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_contadores = {"aciertos": 0, "fallos": 0, "obsoletos": 0}
+_contadores_lock = threading.Lock()
+
+
+def _cache():
+    return caches[settings.ESTADISTICAS_CONFIG["CACHE_ALIAS"]]
+
+
+def _espacio():
+    """
+    Prefijo de las claves, propio de la base de datos en uso.
+
+    Evita que dos bases de datos (p. ej. la de pruebas) compartan entradas
+    en una caché de archivos o Redis.
+    """
+    nombre = str(connection.settings_dict["NAME"])
+    return "estadisticas:" + hashlib.sha256(nombre.encode("utf-8")).hexdigest()[:12]
+
+
+def _contar(evento):
+    with _contadores_lock:
+        _contadores[evento] += 1
+
+
+def _version(nombre):
+    """
+    Valor actual del contador de versión ``nombre``.
+
+    Si la clave no existe (caché vacía o expulsada) se inicia con la hora
+    actual en nanosegundos, nunca con un valor que ya se haya usado.
+    """
+    cache = _cache()
+    clave = f"{_espacio()}:{nombre}"
+    version = cache.get(clave)
+    if version is None:
+        cache.add(clave, time.time_ns(), timeout=None)
+        version = cache.get(clave)
+    return version
+
+
+def _incrementar(nombre):
+    cache = _cache()
+    clave = f"{_espacio()}:{nombre}"
+    try:
+        cache.incr(clave)
+    except ValueError:
+        # La clave no existía: cualquier versión nueva invalida lo anterior
+        cache.add(clave, time.time_ns(), timeout=None)
+
+
+def version_datos():
+    """Versión actual de los datos de recaudaciones"""
+    return _version("version")
+
+
+def version_fragmentos():
+    """
+    Versión de todos los fragmentos de la tabla semanal; cambia con los
+    cambios masivos o de tasas, que pueden tocar cualquier semana
+    """
+    return _version("version_fragmentos")
+
+
+def versiones_semanas(semanas):
+    """
+    Versión de los datos de cada semana, para los fragmentos de la tabla.
+
+    Args:
+        semanas (iterable): Números de semana
+
+    Returns:
+        dict: Semana -> versión
+    """
+    cache = _cache()
+    claves = {semana: f"{_espacio()}:version_semana:{semana}" for semana in semanas}
+    guardadas = cache.get_many(claves.values())
+    return {
+        semana: (
+            guardadas[clave]
+            if clave in guardadas
+            else _version(f"version_semana:{semana}")
+        )
+        for semana, clave in claves.items()
+    }
+
+
+def incrementar_version(semanas=None):
+    """
+    Invalida todas las estadísticas en caché (se llama tras cada cambio).
+
+    Args:
+        semanas (iterable): Semanas cuyas recaudaciones cambiaron; solo sus
+            fragmentos de la tabla semanal se invalidan. None (importaciones,
+            reconstrucciones, tasas) invalida los de todas las semanas
+    """
+    _incrementar("version")
+    if semanas is None:
+        _incrementar("version_fragmentos")
+    else:
+        for semana in set(semanas):
+            _incrementar(f"version_semana:{semana}")
+
+
+def contadores():
+    """
+    Aciertos, fallos y respuestas obsoletas de este proceso.
+
+    Returns:
+        dict: "aciertos", "fallos", "obsoletos" y "tasa_aciertos" (0-1)
+    """
+    with _contadores_lock:
+        resultado = dict(_contadores)
+    consultas = sum(resultado.values())
+    resultado["tasa_aciertos"] = (
+        (resultado["aciertos"] + resultado["obsoletos"]) / consultas
+        if consultas
+        else 0
+    )
+    return resultado
+
+
+def reiniciar_contadores():
+    with _contadores_lock:
+        for evento in _contadores:
+            _contadores[evento] = 0
+
+
+def obtener_o_calcular(nombre, calcular):
+    """
+    Devuelve el resultado en caché de ``nombre`` o lo calcula.
+
+    Args:
+        nombre (str): Identificador del resultado (incluye sus argumentos)
+        calcular (callable): Función sin argumentos que lo calcula
+
+    Returns:
+        El resultado de ``calcular()``, de la versión actual de los datos o,
+        si otra petición ya lo está recalculando, de la anterior
+    """
+    config = settings.ESTADISTICAS_CONFIG
+    if not config["CACHE"]:
+        return calcular()
+
+    cache = _cache()
+    clave = f"{_espacio()}:{nombre}"
+    version = version_datos()
+
+    entrada = cache.get(clave)
+    if entrada is not None and entrada[0] == version:
+        _contar("aciertos")
+        return entrada[1]
+
+    bloqueo = f"{clave}:calculando"
+    if cache.add(bloqueo, True, timeout=config["CACHE_BLOQUEO"]):
+        try:
+            _contar("fallos")
+            inicio = time.perf_counter()
+            valor = calcular()
+            cache.set(clave, (version, valor), timeout=config["CACHE_TIMEOUT"])
+            logger.debug(
+                "Estadística %s recalculada en %.1f ms (versión %s)",
+                nombre,
+                (time.perf_counter() - inicio) * 1000,
+                version,
+            )
+            return valor
+        finally:
+            cache.delete(bloqueo)
+
+    if entrada is not None and config["SERVIR_OBSOLETO"]:
+        _contar("obsoletos")
+        return entrada[1]
+
+    # Otra petición está calculando y no hay nada que servir mientras tanto
+    _contar("fallos")
+    return calcular()
+
+
+def cacheado(nombre):
+    """
+    Decorador: guarda en la caché versionada el resultado de un método.
+
+    Los argumentos forman parte de la clave; el primero se omite si es una
+    clase (métodos de clase).
+
+    Example:
+        @classmethod
+        @cacheado("por_semana")
+        def obtener_por_semana(cls): ...
+    """
+
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            argumentos = args[1:] if args and isinstance(args[0], type) else args
+            partes = [repr(a) for a in argumentos]
+            partes += [f"{k}={v!r}" for k, v in sorted(kwargs.items())]
+            # Sin espacios (``repr`` de fechas, etc.): memcached no los admite
+            clave = f"{nombre}({','.join(partes)})".replace(" ", "")
+            return obtener_o_calcular(clave, lambda: funcion(*args, **kwargs))
+
+        return envoltura
+
+    return decorador
@@ -0,0 +1,282 @@
+# finanzas_app/services/cache_graficos.py
+"""
+Caché de gráficos direccionada por contenido.
+
+Cada gráfico se identifica por una huella (hash) de los datos de entrada
+más ``CONFIG_GRAFICOS``. Si los datos no cambian, la huella tampoco, y el
+gráfico ya renderizado se reutiliza sin volver a pasar por Matplotlib.
+
+La caché tiene dos niveles:
+- Memoria: LRU limitada por número de entradas y por bytes
+- Disco: directorio de archivos con expulsión por tamaño (los menos usados)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+# Se incrementa cuando cambia el código de renderizado, para no servir
+# imágenes antiguas con la misma huella de datos.
+VERSION_RENDER = 5
+
+TIPOS_CONTENIDO = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "webp": "image/webp",
+}
+
+
+def calcular_huella(tipo, datos, config, **parametros):
+    """
+    Calcula la huella de un gráfico a partir de sus entradas.
+
+    Args:
+        tipo (str): Tipo de gráfico ("semanal", "mensual", ...)
+        datos: Serie de entrada (listas/diccionarios serializables)
+        config (dict): Configuración visual (CONFIG_GRAFICOS)
+        **parametros: Parámetros adicionales del renderizado
+
+    Returns:
+        str: Huella hexadecimal de 32 caracteres
+    """
+    contenido = json.dumps(
+        {
+            "version": VERSION_RENDER,
+            "tipo": tipo,
+            "datos": datos,
+            "config": config,
+            "parametros": parametros,
+        },
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:32]
+
+
+class CacheGraficos:
+    """
+    Caché de dos niveles (memoria + disco) para imágenes de gráficos.
+
+    Las claves son huellas de contenido, por lo que una entrada nunca se
+    invalida: si los datos cambian se genera una clave nueva y la antigua
+    termina expulsada por LRU.
+    """
+
+    def __init__(
+        self,
+        directorio=None,
+        max_entradas_memoria=64,
+        max_bytes_memoria=32 * 1024 * 1024,
+        max_bytes_disco=256 * 1024 * 1024,
+    ):
+        self.directorio = directorio
+        self.max_entradas_memoria = max_entradas_memoria
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._lock = threading.Lock()
+
+        if self.directorio:
+            os.makedirs(self.directorio, exist_ok=True)
+
+    @classmethod
+    def desde_settings(cls):
+        """Crea la caché usando ``settings.GRAFICOS_CONFIG``"""
+        config = settings.GRAFICOS_CONFIG
+        return cls(
+            directorio=config["CACHE_DIRECTORIO"],
+            max_entradas_memoria=config["CACHE_MAX_ENTRADAS_MEMORIA"],
+            max_bytes_memoria=config["CACHE_MAX_BYTES_MEMORIA"],
+            max_bytes_disco=config["CACHE_MAX_BYTES_DISCO"],
+        )
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def obtener(self, clave, extension="png"):
+        """
+        Busca una imagen en memoria y, si no está, en disco.
+
+        Args:
+            clave (str): Huella del gráfico
+            extension (str): Extensión/formato de la imagen
+
+        Returns:
+            bytes | None: Contenido de la imagen o None si no existe
+        """
+        nombre = self._nombre(clave, extension)
+
+        with self._lock:
+            contenido = self._memoria.get(nombre)
+            if contenido is not None:
+                self._memoria.move_to_end(nombre)
+                return contenido
+
+        contenido = self._leer_disco(nombre)
+        if contenido is not None:
+            self._guardar_memoria(nombre, contenido)
+        return contenido
+
+    def guardar(self, clave, contenido, extension="png"):
+        """
+        Guarda una imagen en ambos niveles de la caché.
+
+        Args:
+            clave (str): Huella del gráfico
+            contenido (bytes): Imagen renderizada
+            extension (str): Extensión/formato de la imagen
+        """
+        nombre = self._nombre(clave, extension)
+        self._guardar_memoria(nombre, contenido)
+        self._escribir_disco(nombre, contenido)
+
+    def contiene(self, clave, extension="png"):
+        """Indica si la imagen existe en algún nivel sin cargarla"""
+        nombre = self._nombre(clave, extension)
+        with self._lock:
+            if nombre in self._memoria:
+                return True
+        return bool(self.directorio) and os.path.exists(
+            os.path.join(self.directorio, nombre)
+        )
+
+    def obtener_o_renderizar(self, clave, renderizar, extension="png"):
+        """
+        Devuelve la imagen cacheada o la genera con ``renderizar()``.
+
+        Args:
+            clave (str): Huella del gráfico
+            renderizar (callable): Función sin argumentos que devuelve bytes
+            extension (str): Extensión/formato de la imagen
+
+        Returns:
+            bytes | None: Imagen (None si no hay datos para graficar)
+        """
+        contenido = self.obtener(clave, extension)
+        if contenido is None:
+            contenido = renderizar()
+            if contenido is not None:
+                self.guardar(clave, contenido, extension)
+        return contenido
+
+    def limpiar(self):
+        """Vacía la caché en memoria (el disco se conserva)"""
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+
+    # ------------------------------------------------------------------
+    # Nivel de memoria
+    # ------------------------------------------------------------------
+
+    def _guardar_memoria(self, nombre, contenido):
+        tamano = len(contenido)
+        if tamano > self.max_bytes_memoria:
+            return
+
+        with self._lock:
+            anterior = self._memoria.pop(nombre, None)
+            if anterior is not None:
+                self._bytes_memoria -= len(anterior)
+
+            self._memoria[nombre] = contenido
+            self._bytes_memoria += tamano
+
+            # Expulsar las entradas menos usadas
+            while self._memoria and (
+                len(self._memoria) > self.max_entradas_memoria
+                or self._bytes_memoria > self.max_bytes_memoria
+            ):
+                _, expulsado = self._memoria.popitem(last=False)
+                self._bytes_memoria -= len(expulsado)
+
+    # ------------------------------------------------------------------
+    # Nivel de disco
+    # ------------------------------------------------------------------
+
+    def _leer_disco(self, nombre):
+        if not self.directorio:
+            return None
+
+        ruta = os.path.join(self.directorio, nombre)
+        try:
+            with open(ruta, "rb") as archivo:
+                contenido = archivo.read()
+        except FileNotFoundError:
+            return None
+
+        # Marcar como usado recientemente para la expulsión LRU
+        try:
+            os.utime(ruta, None)
+        except OSError:
+            pass
+        return contenido
+
+    def _escribir_disco(self, nombre, contenido):
+        if not self.directorio:
+            return
+
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                archivo.write(contenido)
+            os.replace(temporal, os.path.join(self.directorio, nombre))
+        except OSError:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            return
+
+        self._expulsar_disco()
+
+    def _expulsar_disco(self):
+        """Borra los archivos menos usados hasta quedar bajo el límite"""
+        archivos = []
+        total = 0
+        with os.scandir(self.directorio) as entradas:
+            for entrada in entradas:
+                if not entrada.is_file() or entrada.name.endswith(".tmp"):
+                    continue
+                estado = entrada.stat()
+                archivos.append((estado.st_mtime, estado.st_size, entrada.path))
+                total += estado.st_size
+
+        if total <= self.max_bytes_disco:
+            return
+
+        archivos.sort()
+        for _, tamano, ruta in archivos:
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(ruta)
+                total -= tamano
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _nombre(clave, extension):
+        return f"{clave}.{extension}"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache():
+    """Devuelve la instancia compartida de la caché de gráficos"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheGraficos.desde_settings()
+    return _cache
@@ -2,22 +2,32 @@
 """
 Módulo para generar gráficos profesionales con Matplotlib.
 Configuración optimizada para visualización web con etiquetas claras.
+
+El renderizado no usa pyplot: ver ``motor_graficos`` (seguro entre hilos).
 """
 
-import matplotlib.pyplot as plt
-import matplotlib
 from django.conf import settings
+from django.urls import reverse
 import io
 import base64
-import copy
-import numpy as np
+import logging
 from decimal import Decimal
 
-# Configurar Matplotlib para modo no interactivo
-matplotlib.use("Agg")
-
-# Configuración global de estilos
-plt.style.use("seaborn-v0_8-whitegrid")  # Estilo profesional con grid
+from finanzas_app.services.cache_graficos import calcular_huella, obtener_cache
+from finanzas_app.services.etiquetas_graficos import EtiquetasValor
+from finanzas_app.services.motor_graficos import (
+    DIAS_FIN_SEMANA,
+    MotorGraficos,
+    crear_figura,
+    textos_grafico,
+    tipo_base,
+)
+from finanzas_app.services.muestreo import reducir_serie
+from finanzas_app.services.pool_graficos import renderizar_lote
+from finanzas_app.services.svg_graficos import RenderizadorSVG
+from finanzas_app.services.variantes_graficos import nombres_variantes
+
+logger = logging.getLogger(__name__)
 
 # Configuración personalizada para gráficos optimizados
 CONFIG_GRAFICOS = {
@@ -57,8 +67,40 @@ CONFIG_GRAFICOS = {
         "marcador_color": "#ffffff",
         "marcador_borde": 2,
     },
+    # Etiquetas de valor sobre barras y puntos
+    "etiquetas_valor": {
+        "adelgazar": True,  # Mostrar una de cada N si no caben todas
+        "separacion_minima": 4,  # Puntos libres entre etiquetas vecinas
+    },
 }
 
+# Motor compartido: reutiliza plantillas de figuras entre peticiones
+motor = MotorGraficos(CONFIG_GRAFICOS)
+
+# Camino rápido para gráficos simples (ver GRAFICOS_CONFIG["FORMATO"])
+renderizador_svg = RenderizadorSVG(CONFIG_GRAFICOS)
+
+# Ancho en píxeles del PNG que genera Matplotlib
+ANCHO_ORIGINAL = int(CONFIG_GRAFICOS["tamano_figura"][0] * CONFIG_GRAFICOS["dpi"])
+
+
+class ImagenGrafico:
+    """
+    Imagen de un gráfico lista para la plantilla.
+
+    Al convertirla a texto devuelve la URL principal, así que se puede usar
+    directamente en ``src``. Los PNG traen además ``srcset`` con sus
+    variantes WebP y PNG por ancho; los SVG no los necesitan.
+    """
+
+    def __init__(self, url, srcset_webp="", srcset_png=""):
+        self.url = url
+        self.srcset_webp = srcset_webp
+        self.srcset_png = srcset_png
+
+    def __str__(self):
+        return self.url
+
 
 class GeneradorGraficos:
     """
@@ -73,541 +115,120 @@ class GeneradorGraficos:
     """
 
     @staticmethod
-    def crear_grafico_semanal(datos_semanales, max_semanas=30):
+    def crear_grafico_semanal(
+        datos_semanales,
+        max_semanas=30,
+        formato="base64",
+        historial_completo=False,
+        moneda=None,
+    ):
         """
         Crea gráfico de barras para ingresos semanales.
 
         Args:
             datos_semanales (list): Lista de diccionarios con datos semanales
             max_semanas (int): Máximo número de semanas a mostrar
+            formato (str): "base64" (por defecto) o "png" para bytes crudos
+            historial_completo (bool): Mostrar todas las semanas, reducidas
+                con ``muestreo`` en lugar de cortar a ``max_semanas``
+            moneda (str): Moneda de los montos (None = la de origen)
 
         Returns:
-            str: Imagen en base64
+            str | bytes: Imagen en base64 o PNG
         """
         if not datos_semanales:
             return None
 
-        # Limitar semanas para mejor visualización
-        datos_a_mostrar = (
-            datos_semanales[-max_semanas:]
-            if len(datos_semanales) > max_semanas
-            else datos_semanales
-        )
-
-        # Preparar datos
-        semanas = []
-        ingresos = []
-
-        for semana in datos_a_mostrar:
-            # Formato de etiqueta: Año-Semana
-            etiqueta = f"Sem {semana['semana']}"
-            if "año" in semana:
-                etiqueta = f"{semana['año']}-{semana['semana']:02d}"
-            semanas.append(etiqueta)
-            ingresos.append(float(semana["total"]))
-
-        # Crear figura con tamaño optimizado
-        fig, ax = plt.subplots(
-            figsize=CONFIG_GRAFICOS["tamano_figura"],
-            dpi=CONFIG_GRAFICOS["dpi"],
-            facecolor=CONFIG_GRAFICOS["colores"]["fondo"],
-        )
-
-        # Crear barras
-        barras = ax.bar(
-            semanas,
-            ingresos,
-            width=CONFIG_GRAFICOS["barras"]["ancho"],
-            color=CONFIG_GRAFICOS["colores"]["principal"],
-            edgecolor=CONFIG_GRAFICOS["barras"]["borde_color"],
-            linewidth=CONFIG_GRAFICOS["barras"]["borde_ancho"],
-            alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            zorder=3,
-        )
-
-        # AÑADIR ETIQUETAS EN CADA BARRA (MEJORA PRINCIPAL)
-        GeneradorGraficos._agregar_etiquetas_barras(ax, barras)
-
-        # Configurar título
-        ax.set_title(
-            "📊 INGRESOS SEMANALES",
-            fontdict=CONFIG_GRAFICOS["fuentes"]["titulo"],
-            pad=25,
-        )
-
-        # Configurar eje X
-        ax.set_xlabel(
-            "SEMANA", fontdict=CONFIG_GRAFICOS["fuentes"]["ejes"], labelpad=20
-        )
-
-        # Configurar eje Y
-        ax.set_ylabel(
-            "INGRESOS (CUP)", fontdict=CONFIG_GRAFICOS["fuentes"]["ejes"], labelpad=20
-        )
-
-        # Configurar ticks
-        ax.tick_params(
-            axis="both",
-            labelsize=CONFIG_GRAFICOS["fuentes"]["etiquetas"]["size"],
-            colors=CONFIG_GRAFICOS["fuentes"]["etiquetas"]["color"],
-        )
-
-        # Rotar etiquetas del eje X para mejor legibilidad
-        plt.xticks(rotation=45, ha="right", rotation_mode="anchor")
-
-        # Añadir grid profesional
-        ax.grid(
-            True,
-            axis="y",
-            alpha=0.3,
-            color=CONFIG_GRAFICOS["colores"]["grid"],
-            linestyle="--",
-            linewidth=0.8,
-            zorder=0,
+        semanas, ingresos = GeneradorGraficos._serie_semanal(
+            datos_semanales, max_semanas, historial_completo
         )
 
-        # Remover bordes innecesarios
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        ax.spines["left"].set_linewidth(0.5)
-        ax.spines["bottom"].set_linewidth(0.5)
-
-        # Añadir línea de promedio
-        if ingresos:
-            promedio = np.mean(ingresos)
-            ax.axhline(
-                y=promedio,
-                color=CONFIG_GRAFICOS["colores"]["acento"],
-                linestyle="--",
-                linewidth=2,
-                alpha=0.7,
-                label=f"Promedio: ${promedio:,.2f}",
-            )
-
-            # Añadir leyenda
-            ax.legend(
-                fontsize=CONFIG_GRAFICOS["fuentes"]["leyenda"]["size"],
-                loc="upper right",
-                framealpha=0.9,
-                fancybox=True,
-                shadow=True,
-            )
-
-        # Ajustar layout automáticamente
-        plt.tight_layout()
-
-        # Convertir a base64
-        imagen = GeneradorGraficos._figura_a_base64(fig)
-        plt.close(fig)
-
-        return imagen
+        tipo = "semanal_historial" if historial_completo else "semanal"
+        imagen = motor.renderizar(tipo, semanas, ingresos, moneda)
+        return GeneradorGraficos._codificar(imagen, formato)
 
     @staticmethod
-    def crear_grafico_diario(datos_diarios):
+    def crear_grafico_diario(datos_diarios, formato="base64", moneda=None):
         """
         Crea gráfico de barras para recaudación por día de la semana.
 
         Args:
             datos_diarios (list): Lista de recaudaciones por día
+            formato (str): "base64" (por defecto) o "png" para bytes crudos
+            moneda (str): Moneda de los montos (None = la de origen)
 
         Returns:
-            str: Imagen en base64
+            str | bytes: Imagen en base64 o PNG
         """
         if not datos_diarios:
             return None
 
-        # Ordenar por día de la semana
-        dias_orden = [
-            "Lunes",
-            "Martes",
-            "Miércoles",
-            "Jueves",
-            "Viernes",
-            "Sábado",
-            "Domingo",
-        ]
-
-        # Preparar datos ordenados
-        dias = []
-        recaudacion = []
-
-        for nombre_dia in dias_orden:
-            datos_dia = datos_diarios[nombre_dia]
-            dias.append(nombre_dia[:3])  # Abreviar a 3 letras
-            recaudacion.append(float(datos_dia["total"]))
-
-        # Crear figura
-        fig, ax = plt.subplots(
-            figsize=CONFIG_GRAFICOS["tamano_figura"],
-            dpi=CONFIG_GRAFICOS["dpi"],
-            facecolor=CONFIG_GRAFICOS["colores"]["fondo"],
-        )
-
-        # Crear barras con colores diferenciados
-        colores = []
-        for dia in dias:
-            if dia in ["Sáb", "Dom"]:
-                colores.append(CONFIG_GRAFICOS["colores"]["destacado"])
-            else:
-                colores.append(CONFIG_GRAFICOS["colores"]["secundario"])
-
-        barras = ax.bar(
-            dias,
-            recaudacion,
-            width=CONFIG_GRAFICOS["barras"]["ancho"],
-            color=colores,
-            edgecolor=CONFIG_GRAFICOS["barras"]["borde_color"],
-            linewidth=CONFIG_GRAFICOS["barras"]["borde_ancho"],
-            alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            zorder=3,
-        )
-
-        font_config = copy.deepcopy(CONFIG_GRAFICOS["fuentes"])
-        font_config["titulo"]["size"] = 30
-        font_config["ejes"]["size"] = 20
-        font_config["etiquetas"]["size"] = 20
-        font_config["numeros"]["size"] = 27
-        font_config["leyenda"]["size"] = 25
-
-        # AÑADIR ETIQUETAS EN CADA BARRA
-        GeneradorGraficos._agregar_etiquetas_barras(ax, barras, font_size=20)
-
-        # Configurar título
-        ax.set_title(
-            "📈 INGRESOS POR DÍA",
-            fontdict=font_config["titulo"],
-            pad=25,
-        )
-
-        # Configurar eje X
-        ax.set_xlabel("DÍA DE LA SEMANA", fontdict=font_config["ejes"], labelpad=20)
-
-        # Configurar eje Y
-        ax.set_ylabel(
-            "TOTAL DE INGRESOS (CUP)",
-            fontdict=font_config["ejes"],
-            labelpad=20,
-        )
-
-        # Configurar ticks
-        ax.tick_params(
-            axis="both",
-            labelsize=font_config["etiquetas"]["size"],
-            colors=font_config["etiquetas"]["color"],
-        )
-
-        # Añadir grid
-        ax.grid(
-            True,
-            axis="y",
-            alpha=0.3,
-            color=CONFIG_GRAFICOS["colores"]["grid"],
-            linestyle="--",
-            linewidth=0.8,
-            zorder=0,
-        )
-
-        # Remover bordes
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+        dias, recaudacion = GeneradorGraficos._serie_por_dia(datos_diarios, "total")
 
-        # Crear leyenda personalizada
-        from matplotlib.patches import Patch
-
-        elementos_leyenda = [
-            Patch(
-                facecolor=CONFIG_GRAFICOS["colores"]["secundario"],
-                label="Días Laborables",
-                alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            ),
-            Patch(
-                facecolor=CONFIG_GRAFICOS["colores"]["destacado"],
-                label="Fin de Semana",
-                alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            ),
-        ]
-
-        # ax.legend(
-        #     handles=elementos_leyenda,
-        #     fontsize=CONFIG_GRAFICOS["fuentes"]["leyenda"]["size"],
-        #     loc="upper right",
-        #     framealpha=0.9,
-        # )
-
-        # Ajustar layout
-        plt.tight_layout()
-
-        # Convertir a base64
-        imagen = GeneradorGraficos._figura_a_base64(fig)
-        plt.close(fig)
-
-        return imagen
+        imagen = motor.renderizar("diario", dias, recaudacion, moneda)
+        return GeneradorGraficos._codificar(imagen, formato)
 
     @staticmethod
-    def crear_grafico_promedio_diario(promedios_diarios):
+    def crear_grafico_promedio_diario(
+        promedios_diarios, formato="base64", moneda=None
+    ):
         """
         Crea gráfico de barras para promedios diarios.
 
         Args:
             promedios_diarios (list): Lista de promedios por día
+            formato (str): "base64" (por defecto) o "png" para bytes crudos
+            moneda (str): Moneda de los montos (None = la de origen)
 
         Returns:
-            str: Imagen en base64
+            str | bytes: Imagen en base64 o PNG
         """
         if not promedios_diarios:
             return None
 
-        # Ordenar por día de la semana
-        dias_orden = [
-            "Lunes",
-            "Martes",
-            "Miércoles",
-            "Jueves",
-            "Viernes",
-            "Sábado",
-            "Domingo",
-        ]
-
-        # Preparar datos ordenados
-        dias = []
-        promedios = []
-
-        for nombre_dia in dias_orden:
-            datos_dia = promedios_diarios[nombre_dia]
-            dias.append(nombre_dia[:3])  # Abreviar a 3 letras
-            promedios.append(float(datos_dia["promedio"]))
-
-        # Crear figura
-        fig, ax = plt.subplots(
-            figsize=CONFIG_GRAFICOS["tamano_figura"],
-            dpi=CONFIG_GRAFICOS["dpi"],
-            facecolor=CONFIG_GRAFICOS["colores"]["fondo"],
-        )
-
-        # Crear barras con colores diferenciados
-        colores = []
-        for dia in dias:
-            if dia in ["Sáb", "Dom"]:
-                colores.append(CONFIG_GRAFICOS["colores"]["destacado"])
-            else:
-                colores.append(CONFIG_GRAFICOS["colores"]["secundario"])
-
-        barras = ax.bar(
-            dias,
-            promedios,
-            width=CONFIG_GRAFICOS["barras"]["ancho"],
-            color=colores,
-            edgecolor=CONFIG_GRAFICOS["barras"]["borde_color"],
-            linewidth=CONFIG_GRAFICOS["barras"]["borde_ancho"],
-            alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            zorder=3,
-        )
-
-        font_config = copy.deepcopy(CONFIG_GRAFICOS["fuentes"])
-        font_config["titulo"]["size"] = 30
-        font_config["ejes"]["size"] = 20
-        font_config["etiquetas"]["size"] = 20
-        font_config["numeros"]["size"] = 27
-        font_config["leyenda"]["size"] = 25
-
-        # AÑADIR ETIQUETAS EN CADA BARRA
-        GeneradorGraficos._agregar_etiquetas_barras(ax, barras, font_size=20)
-
-        # Configurar título
-        ax.set_title(
-            "📈 PROMEDIO DE INGRESOS POR DÍA",
-            fontdict=font_config["titulo"],
-            pad=25,
-        )
-
-        # Configurar eje X
-        ax.set_xlabel("DÍA DE LA SEMANA", fontdict=font_config["ejes"], labelpad=20)
-
-        # Configurar eje Y
-        ax.set_ylabel(
-            "PROMEDIO DE INGRESOS (CUP)",
-            fontdict=font_config["ejes"],
-            labelpad=20,
-        )
-
-        # Configurar ticks
-        ax.tick_params(
-            axis="both",
-            labelsize=font_config["etiquetas"]["size"],
-            colors=font_config["etiquetas"]["color"],
+        dias, promedios = GeneradorGraficos._serie_por_dia(
+            promedios_diarios, "promedio"
         )
 
-        # Añadir grid
-        ax.grid(
-            True,
-            axis="y",
-            alpha=0.3,
-            color=CONFIG_GRAFICOS["colores"]["grid"],
-            linestyle="--",
-            linewidth=0.8,
-            zorder=0,
-        )
-
-        # Remover bordes
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-
-        # Crear leyenda personalizada
-        from matplotlib.patches import Patch
-
-        elementos_leyenda = [
-            Patch(
-                facecolor=CONFIG_GRAFICOS["colores"]["secundario"],
-                label="Días Laborables",
-                alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            ),
-            Patch(
-                facecolor=CONFIG_GRAFICOS["colores"]["destacado"],
-                label="Fin de Semana",
-                alpha=CONFIG_GRAFICOS["barras"]["transparencia"],
-            ),
-        ]
-
-        # ax.legend(
-        #     handles=elementos_leyenda,
-        #     fontsize=CONFIG_GRAFICOS["fuentes"]["leyenda"]["size"],
-        #     loc="upper right",
-        #     framealpha=0.9,
-        # )
-
-        # Ajustar layout
-        plt.tight_layout()
-
-        # Convertir a base64
-        imagen = GeneradorGraficos._figura_a_base64(fig)
-        plt.close(fig)
-
-        return imagen
+        imagen = motor.renderizar("promedio_diario", dias, promedios, moneda)
+        return GeneradorGraficos._codificar(imagen, formato)
 
     @staticmethod
-    def crear_grafico_mensual(datos_mensuales, max_meses=12):
+    def crear_grafico_mensual(
+        datos_mensuales,
+        max_meses=12,
+        formato="base64",
+        historial_completo=False,
+        moneda=None,
+    ):
         """
         Crea gráfico de línea para tendencia mensual.
 
         Args:
             datos_mensuales (list): Datos mensuales
             max_meses (int): Máximo de meses a mostrar
+            formato (str): "base64" (por defecto) o "png" para bytes crudos
+            historial_completo (bool): Mostrar todos los meses, reducidos
+                con ``muestreo`` en lugar de cortar a ``max_meses``
+            moneda (str): Moneda de los montos (None = la de origen)
 
         Returns:
-            str: Imagen en base64
+            str | bytes: Imagen en base64 o PNG
         """
         if not datos_mensuales:
             return None
 
-        # Limitar meses para mejor visualización
-        datos_a_mostrar = (
-            datos_mensuales[-max_meses:]
-            if len(datos_mensuales) > max_meses
-            else datos_mensuales
-        )
-
-        # Preparar datos
-        meses = []
-        ingresos = []
-
-        for datos_mes in datos_a_mostrar:
-            etiqueta = f"{datos_mes['año']}-{datos_mes['mes']:02d}"
-            meses.append(etiqueta)
-            ingresos.append(float(datos_mes["total"]))
-
-        # Crear figura
-        fig, ax = plt.subplots(
-            figsize=CONFIG_GRAFICOS["tamano_figura"],
-            dpi=CONFIG_GRAFICOS["dpi"],
-            facecolor=CONFIG_GRAFICOS["colores"]["fondo"],
-        )
-
-        # Crear línea con marcadores
-        linea = ax.plot(
-            meses,
-            ingresos,
-            marker="o",
-            markersize=CONFIG_GRAFICOS["lineas"]["marcador_tamano"],
-            markerfacecolor=CONFIG_GRAFICOS["lineas"]["marcador_color"],
-            markeredgecolor=CONFIG_GRAFICOS["colores"]["principal"],
-            markeredgewidth=CONFIG_GRAFICOS["lineas"]["marcador_borde"],
-            linewidth=CONFIG_GRAFICOS["lineas"]["ancho"],
-            color=CONFIG_GRAFICOS["colores"]["principal"],
-            alpha=0.9,
-            zorder=3,
-            label="Ingresos Mensuales",
-        )[0]
-
-        # AÑADIR ETIQUETAS EN CADA PUNTO
-        GeneradorGraficos._agregar_etiquetas_puntos(ax, meses, ingresos)
-
-        # Configurar título
-        ax.set_title(
-            "📈 TENDENCIA DE INGRESOS MENSUALES",
-            fontdict=CONFIG_GRAFICOS["fuentes"]["titulo"],
-            pad=25,
-        )
-
-        # Configurar eje X
-        ax.set_xlabel("MES", fontdict=CONFIG_GRAFICOS["fuentes"]["ejes"], labelpad=20)
-
-        # Configurar eje Y
-        ax.set_ylabel(
-            "INGRESOS (CUP)", fontdict=CONFIG_GRAFICOS["fuentes"]["ejes"], labelpad=20
-        )
-
-        # Configurar ticks
-        ax.tick_params(
-            axis="both",
-            labelsize=CONFIG_GRAFICOS["fuentes"]["etiquetas"]["size"],
-            colors=CONFIG_GRAFICOS["fuentes"]["etiquetas"]["color"],
+        meses, ingresos = GeneradorGraficos._serie_mensual(
+            datos_mensuales, max_meses, historial_completo
         )
 
-        # Rotar etiquetas del eje X
-        plt.xticks(rotation=45, ha="right", rotation_mode="anchor")
-
-        # Añadir grid
-        ax.grid(
-            True,
-            alpha=0.3,
-            color=CONFIG_GRAFICOS["colores"]["grid"],
-            linestyle="--",
-            linewidth=0.8,
-            zorder=0,
-        )
-
-        # Remover bordes
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-
-        # Añadir área sombreada bajo la línea
-        ax.fill_between(
-            meses,
-            ingresos,
-            alpha=0.2,
-            color=CONFIG_GRAFICOS["colores"]["principal"],
-            zorder=1,
-        )
-
-        # Añadir leyenda
-        ax.legend(
-            fontsize=CONFIG_GRAFICOS["fuentes"]["leyenda"]["size"],
-            loc="upper left",
-            framealpha=0.9,
-        )
-
-        # Ajustar layout
-        plt.tight_layout()
-
-        # Convertir a base64
-        imagen = GeneradorGraficos._figura_a_base64(fig)
-        plt.close(fig)
-
-        return imagen
+        tipo = "mensual_historial" if historial_completo else "mensual"
+        imagen = motor.renderizar(tipo, meses, ingresos, moneda)
+        return GeneradorGraficos._codificar(imagen, formato)
 
     @staticmethod
     def crear_grafico_comparativo(
-        datos_actuales, datos_anteriores, titulo="COMPARACIÓN"
+        datos_actuales, datos_anteriores, titulo="COMPARACIÓN", formato="base64"
     ):
         """
         Crea gráfico de comparación entre dos conjuntos de datos.
@@ -616,9 +237,10 @@ class GeneradorGraficos:
             datos_actuales: Datos actuales
             datos_anteriores: Datos anteriores
             titulo: Título del gráfico
+            formato: "base64" (por defecto) o "png" para bytes crudos
 
         Returns:
-            str: Imagen en base64
+            str | bytes: Imagen en base64 o PNG
         """
         # Preparar datos
         etiquetas = ["Actual", "Anterior"]
@@ -627,12 +249,8 @@ class GeneradorGraficos:
             float(datos_anteriores[0]["total_ingresos"]) if datos_anteriores else 0,
         ]
 
-        # Crear figura
-        fig, ax = plt.subplots(
-            figsize=(12, 7),
-            dpi=CONFIG_GRAFICOS["dpi"],
-            facecolor=CONFIG_GRAFICOS["colores"]["fondo"],
-        )
+        # Crear figura (sin pyplot, segura entre hilos)
+        fig, ax = crear_figura(CONFIG_GRAFICOS, tamano=(12, 7))
 
         # Crear barras
         colores = [
@@ -687,96 +305,250 @@ class GeneradorGraficos:
         )
 
         # Ajustar layout
-        plt.tight_layout()
+        fig.tight_layout()
+
+        # Exportar en el formato pedido
+        return GeneradorGraficos._exportar_figura(fig, formato)
+
+    @staticmethod
+    def preparar_serie(tipo, datos):
+        """
+        Convierte los datos de entrada de un gráfico en etiquetas y valores.
+
+        Es la misma preparación que usan los generadores de Matplotlib, para
+        que cualquier backend (PNG, SVG, ...) muestre exactamente lo mismo.
+
+        Args:
+            tipo (str): "semanal", "mensual", "diario", "promedio_diario" o
+                un tipo de historial completo ("semanal_historial", ...)
+            datos: Serie de entrada del gráfico
+
+        Returns:
+            tuple: (etiquetas, valores)
+        """
+        if tipo == "semanal":
+            return GeneradorGraficos._serie_semanal(datos)
+        if tipo == "semanal_historial":
+            return GeneradorGraficos._serie_semanal(datos, historial_completo=True)
+        if tipo == "mensual":
+            return GeneradorGraficos._serie_mensual(datos)
+        if tipo == "mensual_historial":
+            return GeneradorGraficos._serie_mensual(datos, historial_completo=True)
+        if tipo == "diario":
+            return GeneradorGraficos._serie_por_dia(datos, "total")
+        if tipo == "promedio_diario":
+            return GeneradorGraficos._serie_por_dia(datos, "promedio")
+        raise ValueError(f"Tipo de gráfico desconocido: {tipo}")
+
+    @staticmethod
+    def serie_json(tipo, datos, moneda=None):
+        """
+        Serie agregada de un gráfico lista para dibujar con Chart.js.
+
+        Args:
+            tipo (str): "semanal", "mensual", "diario" o "promedio_diario"
+            datos: Serie de entrada del gráfico
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            dict: Textos, etiquetas, valores y colores del gráfico; "tipo_base"
+                es el tipo que se dibuja ("mensual" para "mensual_historial")
+        """
+        titulo, eje_x, eje_y = textos_grafico(tipo, moneda)
+        colores = CONFIG_GRAFICOS["colores"]
+
+        etiquetas, valores = (
+            GeneradorGraficos.preparar_serie(tipo, datos) if datos else ([], [])
+        )
+        valores = [round(valor, 2) for valor in valores]
+
+        if tipo in ("diario", "promedio_diario"):
+            colores_serie = [
+                colores["destacado"] if dia in DIAS_FIN_SEMANA else colores["secundario"]
+                for dia in etiquetas
+            ]
+        else:
+            colores_serie = [colores["principal"]] * len(valores)
+
+        serie = {
+            "tipo": tipo,
+            "tipo_base": tipo_base(tipo),
+            "titulo": titulo,
+            "eje_x": eje_x,
+            "eje_y": eje_y,
+            "etiquetas": etiquetas,
+            "valores": valores,
+            "colores": colores_serie,
+        }
+        # Con el historial reducido el promedio de los puntos no sería el real
+        if tipo == "semanal" and valores:
+            serie["promedio"] = round(sum(valores) / len(valores), 2)
+        return serie
+
+    @staticmethod
+    def _serie_semanal(datos_semanales, max_semanas=30, historial_completo=False):
+        """
+        Etiquetas y totales de las últimas ``max_semanas`` semanas, o de
+        todo el historial reducido a ``GRAFICOS_CONFIG["HISTORIAL"]``.
+        """
+        # Limitar semanas para mejor visualización
+        datos_a_mostrar = (
+            datos_semanales[-max_semanas:]
+            if len(datos_semanales) > max_semanas and not historial_completo
+            else datos_semanales
+        )
+
+        semanas = []
+        ingresos = []
+
+        for semana in datos_a_mostrar:
+            # Formato de etiqueta: Año-Semana
+            etiqueta = f"Sem {semana['semana']}"
+            if "año" in semana:
+                etiqueta = f"{semana['año']}-{semana['semana']:02d}"
+            semanas.append(etiqueta)
+            ingresos.append(float(semana["total"]))
+
+        if historial_completo:
+            return GeneradorGraficos._reducir_historial("semanal", semanas, ingresos)
+        return semanas, ingresos
+
+    @staticmethod
+    def _serie_mensual(datos_mensuales, max_meses=12, historial_completo=False):
+        """
+        Etiquetas y totales de los últimos ``max_meses`` meses, o de todo el
+        historial reducido a ``GRAFICOS_CONFIG["HISTORIAL"]``.
+        """
+        # Limitar meses para mejor visualización
+        datos_a_mostrar = (
+            datos_mensuales[-max_meses:]
+            if len(datos_mensuales) > max_meses and not historial_completo
+            else datos_mensuales
+        )
+
+        meses = []
+        ingresos = []
+
+        for datos_mes in datos_a_mostrar:
+            etiqueta = f"{datos_mes['año']}-{datos_mes['mes']:02d}"
+            meses.append(etiqueta)
+            ingresos.append(float(datos_mes["total"]))
+
+        if historial_completo:
+            return GeneradorGraficos._reducir_historial("mensual", meses, ingresos)
+        return meses, ingresos
+
+    @staticmethod
+    def _reducir_historial(tipo, etiquetas, valores):
+        """
+        Reduce una serie de historial completo a un número acotado de puntos.
+
+        Los picos y valles se conservan (LTTB o min/max) y los periodos más
+        recientes se muestran todos, con su valor exacto.
+        """
+        config = settings.GRAFICOS_CONFIG["HISTORIAL"]
+        return reducir_serie(
+            etiquetas,
+            valores,
+            max_puntos=config["MAX_PUNTOS"][tipo],
+            recientes=config["RECIENTES_EXACTOS"][tipo],
+            metodo=config["METODO"],
+        )
+
+    @staticmethod
+    def _serie_por_dia(datos_diarios, campo):
+        """
+        Ordena los datos por día de la semana (Lunes a Domingo).
+
+        Args:
+            datos_diarios (dict): Datos indexados por nombre de día
+            campo (str): Campo a graficar ("total" o "promedio")
+
+        Returns:
+            tuple: (días abreviados a 3 letras, valores)
+        """
+        dias_orden = [
+            "Lunes",
+            "Martes",
+            "Miércoles",
+            "Jueves",
+            "Viernes",
+            "Sábado",
+            "Domingo",
+        ]
+
+        dias = []
+        valores = []
+        for nombre_dia in dias_orden:
+            dias.append(nombre_dia[:3])  # Abreviar a 3 letras
+            valores.append(float(datos_diarios[nombre_dia][campo]))
+
+        return dias, valores
+
+    @staticmethod
+    def _codificar(imagen, formato="base64"):
+        """
+        Devuelve la imagen PNG en el formato pedido por el llamador.
 
-        # Convertir a base64
-        imagen = GeneradorGraficos._figura_a_base64(fig)
-        plt.close(fig)
+        Args:
+            imagen (bytes): Imagen PNG
+            formato (str): "base64" o "png"
 
-        return imagen
+        Returns:
+            str | bytes: Imagen en base64 o bytes PNG
+        """
+        if formato == "png":
+            return imagen
+        if formato == "base64":
+            return base64.b64encode(imagen).decode("utf-8")
+        raise ValueError(f"Formato de gráfico no soportado: {formato}")
 
     @staticmethod
     def _agregar_etiquetas_barras(ax, barras, font_size=12):
         """
-        Agrega etiquetas de valor encima de cada barra.
+        Agrega etiquetas de valor encima de cada barra (en lote).
 
         Args:
             ax: Ejes de Matplotlib
             barras: Objetos de barras
         """
-        for barra in barras:
-            altura = barra.get_height()
-            if altura > 0:  # Solo mostrar etiquetas para valores positivos
-                # Formatear valor con separadores de miles
-                texto = f"${altura:,.0f}"
-
-                # Calcular posición
-                x_pos = barra.get_x() + barra.get_width() / 2
-                y_pos = altura
-
-                # Crear etiqueta
-                ax.annotate(
-                    texto,
-                    xy=(x_pos, y_pos),
-                    xytext=(0, 8),  # Desplazamiento vertical
-                    textcoords="offset points",
-                    ha="center",
-                    va="bottom",
-                    fontsize=font_size,
-                    fontweight=CONFIG_GRAFICOS["fuentes"]["numeros"]["weight"],
-                    color=CONFIG_GRAFICOS["fuentes"]["numeros"]["color"],
-                    bbox=dict(
-                        boxstyle="round,pad=0.3",
-                        facecolor="white",
-                        edgecolor=CONFIG_GRAFICOS["colores"]["grid"],
-                        alpha=0.9,
-                        linewidth=1,
-                    ),
-                )
+        etiquetas = EtiquetasValor(
+            ax, CONFIG_GRAFICOS, font_size, desplazamiento=8, relleno=0.3
+        )
+        etiquetas.actualizar(
+            [barra.get_x() + barra.get_width() / 2 for barra in barras],
+            [barra.get_height() for barra in barras],
+        )
 
     @staticmethod
     def _agregar_etiquetas_puntos(ax, x_valores, y_valores):
         """
-        Agrega etiquetas de valor a los puntos de un gráfico de línea.
+        Agrega etiquetas de valor a los puntos de un gráfico de línea (en lote).
 
         Args:
             ax: Ejes de Matplotlib
             x_valores: Valores en el eje X
             y_valores: Valores en el eje Y
         """
-        for i, (x, y) in enumerate(zip(x_valores, y_valores)):
-            if y > 0:  # Solo mostrar etiquetas para valores positivos
-                texto = f"${y:,.0f}"
-
-                ax.annotate(
-                    texto,
-                    xy=(i, y),
-                    xytext=(0, 12),  # Desplazamiento vertical
-                    textcoords="offset points",
-                    ha="center",
-                    va="bottom",
-                    fontsize=CONFIG_GRAFICOS["fuentes"]["numeros"]["size"] - 1,
-                    fontweight=CONFIG_GRAFICOS["fuentes"]["numeros"]["weight"],
-                    color=CONFIG_GRAFICOS["fuentes"]["numeros"]["color"],
-                    bbox=dict(
-                        boxstyle="round,pad=0.2",
-                        facecolor="white",
-                        edgecolor=CONFIG_GRAFICOS["colores"]["grid"],
-                        alpha=0.9,
-                        linewidth=1,
-                    ),
-                )
+        etiquetas = EtiquetasValor(
+            ax,
+            CONFIG_GRAFICOS,
+            CONFIG_GRAFICOS["fuentes"]["numeros"]["size"] - 1,
+            desplazamiento=12,
+            relleno=0.2,
+        )
+        etiquetas.actualizar(range(len(y_valores)), y_valores)
 
     @staticmethod
-    def _figura_a_base64(fig):
+    def _figura_a_png(fig):
         """
-        Convierte una figura de Matplotlib a string base64.
+        Convierte una figura de Matplotlib a bytes PNG.
 
         Args:
             fig: Figura de Matplotlib
 
         Returns:
-            str: Imagen en formato base64
+            bytes: Imagen PNG
         """
         # Crear buffer
         buf = io.BytesIO()
@@ -791,13 +563,40 @@ class GeneradorGraficos:
             edgecolor="none",
             pad_inches=0.1,
         )
-        buf.seek(0)
-
-        # Codificar a base64
-        imagen_base64 = base64.b64encode(buf.getvalue()).decode("utf-8")
+        contenido = buf.getvalue()
         buf.close()
 
-        return imagen_base64
+        return contenido
+
+    @staticmethod
+    def _figura_a_base64(fig):
+        """
+        Convierte una figura de Matplotlib a string base64.
+
+        Args:
+            fig: Figura de Matplotlib
+
+        Returns:
+            str: Imagen en formato base64
+        """
+        contenido = GeneradorGraficos._figura_a_png(fig)
+        return base64.b64encode(contenido).decode("utf-8")
+
+    @staticmethod
+    def _exportar_figura(fig, formato="base64"):
+        """
+        Exporta una figura en el formato pedido por el llamador.
+
+        Args:
+            fig: Figura de Matplotlib
+            formato (str): "base64" o "png"
+
+        Returns:
+            str | bytes: Imagen en base64 o bytes PNG
+        """
+        return GeneradorGraficos._codificar(
+            GeneradorGraficos._figura_a_png(fig), formato
+        )
 
     @staticmethod
     def obtener_todos_los_graficos(
@@ -835,3 +634,211 @@ class GeneradorGraficos:
             )
 
         return graficos
+
+    @staticmethod
+    def renderizar(tipo, datos, formato="png", moneda=None):
+        """
+        Renderiza un gráfico del dashboard a partir de su tipo.
+
+        Args:
+            tipo (str): "semanal", "mensual", "diario" o "promedio_diario"
+            datos: Serie de entrada del gráfico
+            formato (str): "png" (por defecto), "base64" o "svg"
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            bytes | str | None: Imagen renderizada o None si no hay datos
+        """
+        if formato == "svg":
+            if not datos:
+                return None
+            etiquetas, valores = GeneradorGraficos.preparar_serie(tipo, datos)
+            return renderizador_svg.renderizar(tipo, etiquetas, valores, moneda)
+
+        generadores = {
+            "semanal": GeneradorGraficos.crear_grafico_semanal,
+            "mensual": GeneradorGraficos.crear_grafico_mensual,
+            "diario": GeneradorGraficos.crear_grafico_diario,
+            "promedio_diario": GeneradorGraficos.crear_grafico_promedio_diario,
+        }
+        base = tipo_base(tipo)
+        if base not in generadores:
+            raise ValueError(f"Tipo de gráfico desconocido: {tipo}")
+        if base != tipo:
+            return generadores[base](
+                datos, formato=formato, historial_completo=True, moneda=moneda
+            )
+        return generadores[tipo](datos, formato=formato, moneda=moneda)
+
+    @staticmethod
+    def urls_graficos(trabajos, moneda=None):
+        """
+        Devuelve las imágenes de varios gráficos, renderizando solo los que
+        no están en caché.
+
+        Los gráficos que faltan se renderizan juntos en el pool de procesos
+        (ver ``pool_graficos``), junto con sus variantes WebP / PNG con
+        paleta a varios anchos (ver ``variantes_graficos``). La URL contiene
+        la huella de los datos, así que el navegador puede cachear la imagen
+        indefinidamente.
+
+        Args:
+            trabajos (dict): nombre -> (tipo, datos)
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            dict: nombre -> ImagenGrafico (None si no hay datos)
+        """
+        cache = obtener_cache()
+        # Los títulos de los ejes dicen la moneda: es parte de la imagen
+        moneda = moneda or settings.MONEDAS_CONFIG["ORIGEN"]
+        claves = {}
+        extensiones = {}
+        faltantes = {}
+
+        for nombre, (tipo, datos) in trabajos.items():
+            if not datos:
+                continue
+            parametros = {"moneda": moneda}
+            if tipo_base(tipo) != tipo:
+                # La serie se reduce al renderizar: la reducción es parte
+                # de la imagen
+                parametros["historial"] = settings.GRAFICOS_CONFIG["HISTORIAL"]
+            extension = GeneradorGraficos._formato_salida(tipo, datos)
+            if extension != "svg":
+                # Anchos y colores de la paleta de las variantes PNG/WebP
+                parametros["variantes"] = settings.GRAFICOS_CONFIG["VARIANTES"]
+            clave = calcular_huella(tipo, datos, CONFIG_GRAFICOS, **parametros)
+            claves[nombre] = clave
+            extensiones[nombre] = extension
+
+            if extension == "svg":
+                if not cache.contiene(clave, extension):
+                    # Camino rápido: no vale la pena enviarlo al pool
+                    contenido = GeneradorGraficos.renderizar(
+                        tipo, datos, formato="svg", moneda=moneda
+                    )
+                    cache.guardar(clave, contenido, extension)
+            elif not all(
+                cache.contiene(clave + sufijo, ext)
+                for sufijo, ext, _ in nombres_variantes()
+            ):
+                faltantes[nombre] = (tipo, datos)
+
+        for nombre, variantes in renderizar_lote(faltantes, moneda).items():
+            if variantes is None:
+                del claves[nombre]
+                continue
+            for variante in variantes:
+                cache.guardar(
+                    claves[nombre] + variante.sufijo,
+                    variante.contenido,
+                    variante.extension,
+                )
+                logger.info(
+                    "Gráfico %s %s%s: %d px, %.1f KB, %.1f ms",
+                    nombre,
+                    variante.extension,
+                    variante.sufijo,
+                    variante.ancho,
+                    len(variante.contenido) / 1024,
+                    variante.milisegundos,
+                )
+
+        return {
+            nombre: (
+                GeneradorGraficos._imagen(claves[nombre], extensiones[nombre])
+                if nombre in claves
+                else None
+            )
+            for nombre in trabajos
+        }
+
+    @staticmethod
+    def _imagen(clave, extension):
+        """Construye la ``ImagenGrafico`` de un gráfico ya cacheado"""
+
+        def url(sufijo, ext):
+            return reverse(
+                "finanzas_app:grafico",
+                kwargs={"clave": clave + sufijo, "extension": ext},
+            )
+
+        if extension == "svg":
+            return ImagenGrafico(url("", "svg"))
+
+        srcset = {"png": [], "webp": []}
+        for sufijo, ext, ancho in nombres_variantes():
+            ancho = min(ancho or ANCHO_ORIGINAL, ANCHO_ORIGINAL)
+            srcset[ext].append((ancho, f"{url(sufijo, ext)} {ancho}w"))
+
+        return ImagenGrafico(
+            url("", "png"),
+            srcset_webp=", ".join(c for _, c in sorted(srcset["webp"])),
+            srcset_png=", ".join(c for _, c in sorted(srcset["png"])),
+        )
+
+    @staticmethod
+    def _formato_salida(tipo, datos):
+        """
+        Elige el formato de un gráfico según ``GRAFICOS_CONFIG["FORMATO"]``.
+
+        Con "svg" se usa el renderizador directo cuando el gráfico es simple;
+        el resto sigue saliendo como PNG desde Matplotlib.
+        """
+        if settings.GRAFICOS_CONFIG["FORMATO"] != "svg":
+            return "png"
+        etiquetas, _ = GeneradorGraficos.preparar_serie(tipo, datos)
+        if renderizador_svg.soporta(tipo, len(etiquetas)):
+            return "svg"
+        return "png"
+
+    @staticmethod
+    def url_grafico(tipo, datos, moneda=None):
+        """
+        Devuelve la imagen de un único gráfico (ver ``urls_graficos``).
+
+        Args:
+            tipo (str): Tipo de gráfico
+            datos: Serie de entrada del gráfico
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            ImagenGrafico | None: Imagen o None si no hay datos
+        """
+        return GeneradorGraficos.urls_graficos({tipo: (tipo, datos)}, moneda)[tipo]
+
+    @staticmethod
+    def obtener_graficos_dashboard(
+        por_semana, por_mes, por_dia_semana, historial_completo=False, moneda=None
+    ):
+        """
+        Obtiene las imágenes de los cuatro gráficos del dashboard.
+
+        Args:
+            por_semana (dict): Resultado de EstadisticaService.obtener_por_semana
+            por_mes (dict): Resultado de EstadisticaService.obtener_por_mes
+            por_dia_semana (dict): Resultado de
+                EstadisticaService.obtener_por_dia_semana
+            historial_completo (bool): Gráficos semanal y mensual con todo el
+                historial en lugar de los últimos periodos
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            dict: ImagenGrafico listas para usar en el contexto de la plantilla
+        """
+        return GeneradorGraficos.urls_graficos(
+            {
+                "grafico_semana": (
+                    "semanal_historial" if historial_completo else "semanal",
+                    list(por_semana.values()),
+                ),
+                "grafico_mes": (
+                    "mensual_historial" if historial_completo else "mensual",
+                    list(por_mes.values()),
+                ),
+                "grafico_dia_semana": ("diario", por_dia_semana),
+                "grafico_promedio_dia_semana": ("promedio_diario", por_dia_semana),
+            },
+            moneda,
+        )
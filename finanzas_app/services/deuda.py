@@ -0,0 +1,171 @@
+# finanzas_app/services/deuda.py
+"""
+Libro de la deuda semanal.
+
+Desde ``DEUDA_CONFIG["SEMANA_INICIO"]`` cada semana devenga
+``MONTO_SEMANAL_CUP``; los ``PagoDeuda`` se imputan a la semana en que se
+hicieron (los anteriores al inicio, a la primera semana). El libro se arma
+en una sola pasada con sumas acumuladas (devengado, pagado y saldo por
+semana) y, como ambas sumas son crecientes, responde con búsqueda binaria
+(``bisect``) el saldo de cualquier semana y la semana en que se saldó (o se
+saldará) la deuda hasta una semana dada.
+
+``EstadisticaService.obtener_deuda_semanal`` guarda en la caché versionada
+los totales y el calendario (no el libro); los pagos, como las
+recaudaciones, incrementan la versión de los datos.
+"""
+
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Max, Sum
+
+from finanzas_app.models.deuda import PagoDeuda
+from finanzas_app.models.ingresos import inicio_semana
+from finanzas_app.models.resumenes import ResumenSemana
+
+CERO = Decimal("0.00")
+
+
+class LibroDeuda:
+    """Devengado, pagado y saldo acumulados de semanas consecutivas"""
+
+    def __init__(self, primera, ultima, monto_semanal, pagos):
+        """
+        Args:
+            primera (int): Primera semana con deuda
+            ultima (int): Última semana del libro
+            monto_semanal (Decimal): Deuda que devenga cada semana
+            pagos (dict): Semana -> total pagado en esa semana
+        """
+        self.monto_semanal = monto_semanal
+        self.semanas = list(range(primera, ultima + 1))
+        self.pagos = [pagos.get(semana, CERO) for semana in self.semanas]
+        if self.semanas:
+            self.pagos[0] = sum(
+                (monto for semana, monto in pagos.items() if semana <= primera),
+                CERO,
+            )
+
+        # Sumas acumuladas, en una pasada
+        self.devengado = []
+        self.pagado = []
+        devengado = pagado = CERO
+        for pago in self.pagos:
+            devengado += monto_semanal
+            pagado += pago
+            self.devengado.append(devengado)
+            self.pagado.append(pagado)
+
+    def __len__(self):
+        return len(self.semanas)
+
+    @property
+    def devengado_total(self):
+        return self.devengado[-1] if self.semanas else CERO
+
+    @property
+    def pagado_total(self):
+        return self.pagado[-1] if self.semanas else CERO
+
+    @property
+    def saldo_total(self):
+        return self.devengado_total - self.pagado_total
+
+    def _posicion(self, semana):
+        """Índice de la última semana del libro <= ``semana`` (-1 si ninguna)"""
+        return bisect_right(self.semanas, semana) - 1
+
+    def saldo(self, semana):
+        """
+        Saldo al cierre de una semana (negativo si hay pagos adelantados).
+
+        Después de la última semana del libro se sigue devengando el monto
+        semanal sin pagos.
+        """
+        posicion = self._posicion(semana)
+        if posicion < 0:
+            return CERO
+        atraso = semana - self.semanas[posicion]
+        return (
+            self.devengado[posicion]
+            - self.pagado[posicion]
+            + atraso * self.monto_semanal
+        )
+
+    def semana_saldada(self, semana=None):
+        """
+        Primera semana en la que lo pagado cubre lo devengado hasta
+        ``semana`` (por defecto, la última del libro).
+
+        Returns:
+            int: Número de semana, o None si todavía no se pagó
+        """
+        if not self.semanas:
+            return None
+        posicion = self._posicion(self.semanas[-1] if semana is None else semana)
+        if posicion < 0:
+            return self.semanas[0]
+        encontrada = bisect_left(self.pagado, self.devengado[posicion])
+        return self.semanas[encontrada] if encontrada < len(self) else None
+
+    def semanas_cubiertas(self):
+        """
+        Cantidad de semanas de deuda que cubre todo lo pagado (con las
+        pagadas por adelantado, después de la última del libro)
+        """
+        cubiertas = bisect_right(self.devengado, self.pagado_total)
+        if cubiertas == len(self) and self.monto_semanal > 0:
+            cubiertas += int(-self.saldo_total // self.monto_semanal)
+        return cubiertas
+
+    def filas(self):
+        """
+        Calendario completo del libro.
+
+        Returns:
+            list: Por semana, "semana", "fecha_inicio", "devengado",
+                "pagado", "devengado_acumulado", "pagado_acumulado" y
+                "saldo"
+        """
+        return [
+            {
+                "semana": semana,
+                "fecha_inicio": inicio_semana(semana),
+                "devengado": self.monto_semanal,
+                "pagado": pago,
+                "devengado_acumulado": devengado,
+                "pagado_acumulado": pagado,
+                "saldo": devengado - pagado,
+            }
+            for semana, pago, devengado, pagado in zip(
+                self.semanas, self.pagos, self.devengado, self.pagado
+            )
+        ]
+
+
+class DeudaService:
+    @staticmethod
+    def libro():
+        """
+        Arma el libro desde la semana inicial hasta la última semana con
+        recaudaciones o pagos.
+
+        Returns:
+            LibroDeuda: El libro (vacío si todavía no empezó la deuda)
+        """
+        config = settings.DEUDA_CONFIG
+        primera = config["SEMANA_INICIO"]
+        monto_semanal = Decimal(str(config["MONTO_SEMANAL_CUP"])).quantize(CERO)
+
+        pagos = dict(
+            PagoDeuda.objects.order_by()
+            .values_list("numero_semana")
+            .annotate(total=Sum("monto"))
+        )
+        ultima = max(
+            ResumenSemana.objects.aggregate(ultima=Max("numero_semana"))["ultima"] or 0,
+            max(pagos, default=0),
+        )
+        return LibroDeuda(primera, ultima, monto_semanal, pagos)
@@ -0,0 +1,313 @@
+# finanzas_app/services/distribucion.py
+"""
+Dispersión y percentiles de las recaudaciones, calculados en flujo.
+
+- ``Momentos``: cantidad, media y varianza con el algoritmo de Welford.
+  Admite agregar y quitar valores de a uno y combinar dos momentos
+  (fórmula de Chan), así que sirve para ventanas móviles y para unir años.
+- ``BocetoCuantiles``: percentiles aproximados con cubetas logarítmicas
+  (como DDSketch). Cada monto cae en la cubeta ``indice_cubeta(centavos)``;
+  el percentil estimado tiene un error relativo de a lo sumo
+  ``PRECISION``. La cantidad de cubetas solo depende del rango de los
+  montos (unas 1.150 para todo el rango de ``monto``, en la práctica menos
+  de cien), no de la cantidad de registros. Dos bocetos se combinan sumando
+  sus cubetas.
+- ``VentanaMovil``: media y desviación de los últimos N días de calendario.
+
+Sin ventana de fechas, los percentiles y la desviación por día de la semana
+salen de ``CubetaDiaSemana``, que se mantiene por delta como los demás
+resúmenes (ver ``services/resumenes.py``): cada alta o borrado toca una
+sola fila, y los años se combinan con un GROUP BY.
+"""
+
+import datetime
+import math
+from collections import deque
+
+from django.conf import settings
+from django.db.models import Sum
+
+from finanzas_app.dinero import a_centavos, desde_centavos
+from finanzas_app.models.resumenes import CubetaDiaSemana
+from finanzas_app.services.agregaciones import NOMBRES_DIAS, recaudaciones
+from finanzas_app.services.monedas import ConversorMoneda, hay_conversion
+
+# Error relativo máximo de los percentiles. Cambiarlo invalida las cubetas
+# guardadas: hay que correr ``manage.py reconstruir_resumenes``.
+PRECISION = 0.01
+_LOG_GAMMA = math.log((1 + PRECISION) / (1 - PRECISION))
+
+# Cubeta de los montos en cero (los índices de los montos positivos son >= 0)
+CUBETA_CERO = -1
+
+
+def indice_cubeta(centavos):
+    """Cubeta de un monto en centavos: la ``i`` cubre (γ^(i-1), γ^i]"""
+    if centavos <= 0:
+        return CUBETA_CERO
+    return math.ceil(math.log(centavos) / _LOG_GAMMA)
+
+
+class Momentos:
+    """Cantidad, media y suma de cuadrados de las desviaciones (Welford)"""
+
+    def __init__(self, cantidad=0, media=0.0, m2=0.0):
+        self.cantidad = cantidad
+        self.media = media
+        self.m2 = m2
+
+    @classmethod
+    def desde_sumas(cls, cantidad, suma, cuadrados):
+        """Momentos a partir de la suma y la suma de cuadrados (enteros)"""
+        if not cantidad:
+            return cls()
+        # En enteros, exacto: n·Σx² - (Σx)² no pierde precisión
+        m2 = (cantidad * cuadrados - suma**2) / cantidad
+        return cls(cantidad, suma / cantidad, m2)
+
+    def agregar(self, valor):
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / self.cantidad
+        self.m2 += delta * (valor - self.media)
+
+    def quitar(self, valor):
+        if self.cantidad <= 1:
+            self.cantidad, self.media, self.m2 = 0, 0.0, 0.0
+            return
+        media_anterior = self.media
+        self.cantidad -= 1
+        self.media = (media_anterior * (self.cantidad + 1) - valor) / self.cantidad
+        self.m2 = max(self.m2 - (valor - media_anterior) * (valor - self.media), 0.0)
+
+    def combinar(self, otro):
+        """Devuelve los momentos de la unión de ambos conjuntos"""
+        cantidad = self.cantidad + otro.cantidad
+        if not cantidad:
+            return Momentos()
+        delta = otro.media - self.media
+        return Momentos(
+            cantidad,
+            self.media + delta * otro.cantidad / cantidad,
+            self.m2 + otro.m2 + delta**2 * self.cantidad * otro.cantidad / cantidad,
+        )
+
+    @property
+    def varianza(self):
+        """Varianza muestral (n - 1); 0 con menos de dos valores"""
+        return self.m2 / (self.cantidad - 1) if self.cantidad > 1 else 0.0
+
+    @property
+    def desviacion(self):
+        return math.sqrt(self.varianza)
+
+
+class BocetoCuantiles:
+    """Percentiles aproximados de montos en centavos, en cubetas logarítmicas"""
+
+    def __init__(self):
+        # indice -> [cantidad, suma de centavos]
+        self.cubetas = {}
+        self.cantidad = 0
+
+    def agregar(self, centavos):
+        self.cargar_cubeta(indice_cubeta(centavos), 1, centavos)
+
+    def cargar_cubeta(self, indice, cantidad, suma):
+        """Agrega una cubeta guardada (p. ej. una fila de ``CubetaDiaSemana``)"""
+        cubeta = self.cubetas.setdefault(indice, [0, 0])
+        cubeta[0] += cantidad
+        cubeta[1] += suma
+        self.cantidad += cantidad
+
+    def combinar(self, otro):
+        """Devuelve el boceto de la unión de ambos conjuntos"""
+        union = BocetoCuantiles()
+        for boceto in (self, otro):
+            for indice, (cantidad, suma) in boceto.cubetas.items():
+                union.cargar_cubeta(indice, cantidad, suma)
+        return union
+
+    def cuantil(self, q):
+        """
+        Valor aproximado (en centavos) del cuantil ``q`` (0 a 1).
+
+        Se devuelve la media de la cubeta que contiene el rango pedido: está
+        dentro de la cubeta, así que su error relativo es a lo sumo
+        ``PRECISION`` (y es exacto si todos los montos de la cubeta son
+        iguales). None si el boceto está vacío.
+        """
+        if not self.cantidad:
+            return None
+        rango = q * (self.cantidad - 1)
+        acumulado = 0
+        for indice in sorted(self.cubetas):
+            cantidad, suma = self.cubetas[indice]
+            acumulado += cantidad
+            if acumulado > rango:
+                return suma / cantidad
+        return suma / cantidad
+
+
+class VentanaMovil:
+    """Momentos de los valores de los últimos ``dias`` días de calendario"""
+
+    def __init__(self, dias):
+        self.dias = dias
+        self.valores = deque()
+        self.momentos = Momentos()
+
+    def agregar(self, fecha, valor):
+        """Agrega un valor (en orden de fecha) y descarta los que salen"""
+        self.valores.append((fecha, valor))
+        self.momentos.agregar(valor)
+        limite = fecha - datetime.timedelta(days=self.dias - 1)
+        while self.valores[0][0] < limite:
+            self.momentos.quitar(self.valores.popleft()[1])
+
+
+def _monto(centavos):
+    """Centavos (int o float) a ``Decimal`` en pesos; None se mantiene"""
+    return None if centavos is None else desde_centavos(round(centavos))
+
+
+class DistribucionService:
+    """
+    Desviación, percentiles por día de la semana y medias móviles.
+
+    Como ``EstadisticaService``, los métodos aceptan una ventana opcional
+    ``desde``/``hasta`` y una ``moneda``; los montos se devuelven como
+    ``Decimal``.
+    """
+
+    @staticmethod
+    def por_dia_semana(desde=None, hasta=None, moneda=None):
+        """
+        Desviación estándar y percentiles de cada día de la semana.
+
+        Sin ventana se leen las cubetas mantenidas por delta (combinando los
+        años); con ventana se recorren solo las recaudaciones de la ventana.
+        Las cubetas están en la moneda de origen: en otra moneda también se
+        recorren las recaudaciones, convertidas.
+
+        Returns:
+            dict: Por nombre de día, "dias", "desviacion" y un valor por
+                percentil de ``ESTADISTICAS_CONFIG["PERCENTILES"]``
+                (claves "p10", "p50", ...)
+        """
+        momentos = {dia: Momentos() for dia in range(7)}
+        bocetos = {dia: BocetoCuantiles() for dia in range(7)}
+
+        if desde is None and hasta is None and not hay_conversion(moneda):
+            cubetas = (
+                CubetaDiaSemana.objects.values("dia", "indice")
+                .annotate(
+                    cantidad=Sum("dias"),
+                    suma=Sum("total"),
+                    suma_cuadrados=Sum("cuadrados"),
+                )
+                .order_by()
+            )
+            sumas = {dia: [0, 0, 0] for dia in range(7)}
+            for fila in cubetas:
+                suma = a_centavos(fila["suma"])
+                bocetos[fila["dia"]].cargar_cubeta(
+                    fila["indice"], fila["cantidad"], suma
+                )
+                acumulado = sumas[fila["dia"]]
+                acumulado[0] += fila["cantidad"]
+                acumulado[1] += suma
+                acumulado[2] += fila["suma_cuadrados"]
+            for dia, (cantidad, suma, cuadrados) in sumas.items():
+                momentos[dia] = Momentos.desde_sumas(cantidad, suma, cuadrados)
+        else:
+            for fecha, centavos in DistribucionService._centavos(desde, hasta, moneda):
+                momentos[fecha.weekday()].agregar(centavos)
+                bocetos[fecha.weekday()].agregar(centavos)
+
+        resultado = {}
+        for dia, nombre in enumerate(NOMBRES_DIAS):
+            datos = {
+                "dias": momentos[dia].cantidad,
+                "desviacion": _monto(momentos[dia].desviacion),
+            }
+            for percentil in settings.ESTADISTICAS_CONFIG["PERCENTILES"]:
+                datos[f"p{percentil}"] = _monto(bocetos[dia].cuantil(percentil / 100))
+            resultado[nombre] = datos
+        return resultado
+
+    @staticmethod
+    def moviles(desde=None, hasta=None, moneda=None):
+        """
+        Media y desviación móviles de ``ESTADISTICAS_CONFIG["VENTANAS_MOVILES"]``
+        días.
+
+        Cada registro entra y sale de cada ventana una sola vez (Welford con
+        borrado), así que el costo es lineal en los registros leídos. Se
+        leen también los días anteriores a ``desde`` que caben en la ventana
+        más larga, para que los primeros puntos no queden cortos. Sin
+        ``desde``, la serie cubre la ventana más larga antes del último
+        registro.
+
+        Returns:
+            dict: "ventanas" (los tamaños), "serie" (por registro: "fecha",
+                "monto" y por ventana "media_N"/"desviacion_N") y "actual"
+                (por tamaño, "dias", "media" y "desviacion" al final de la
+                serie)
+        """
+        ventanas = tuple(settings.ESTADISTICAS_CONFIG["VENTANAS_MOVILES"])
+        mayor = max(ventanas)
+
+        if desde is None:
+            ultima = (
+                recaudaciones(None, hasta)
+                .order_by("-fecha")
+                .values_list("fecha", flat=True)
+                .first()
+            )
+            if ultima is None:
+                return {"ventanas": ventanas, "serie": [], "actual": {}}
+            desde = ultima - datetime.timedelta(days=mayor - 1)
+
+        moviles = {dias: VentanaMovil(dias) for dias in ventanas}
+        previo = desde - datetime.timedelta(days=mayor - 1)
+        serie = []
+        for fecha, centavos in DistribucionService._centavos(previo, hasta, moneda):
+            for ventana in moviles.values():
+                ventana.agregar(fecha, centavos)
+            if fecha < desde:
+                continue
+            punto = {"fecha": fecha, "monto": _monto(centavos)}
+            for dias, ventana in moviles.items():
+                punto[f"media_{dias}"] = _monto(ventana.momentos.media)
+                punto[f"desviacion_{dias}"] = _monto(ventana.momentos.desviacion)
+            serie.append(punto)
+
+        actual = {}
+        if serie:
+            for dias, ventana in moviles.items():
+                actual[dias] = {
+                    "dias": ventana.momentos.cantidad,
+                    "media": _monto(ventana.momentos.media),
+                    "desviacion": _monto(ventana.momentos.desviacion),
+                }
+        return {"ventanas": ventanas, "serie": serie, "actual": actual}
+
+    @staticmethod
+    def _centavos(desde, hasta, moneda=None):
+        """(fecha, centavos) de las recaudaciones de la ventana, por fecha"""
+        filas = (
+            recaudaciones(desde, hasta)
+            .order_by("fecha", "id")
+            .values_list("fecha", "monto")
+        )
+        if not hay_conversion(moneda):
+            for fecha, monto in filas:
+                yield fecha, a_centavos(monto)
+            return
+
+        # Todas las tasas en una búsqueda vectorizada
+        fechas, montos = zip(*filas) if filas else ((), ())
+        convertidos = ConversorMoneda.convertir(moneda, fechas, montos)
+        for fecha, monto in zip(fechas, convertidos):
+            yield fecha, a_centavos(monto)
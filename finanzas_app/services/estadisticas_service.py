@@ -1,156 +1,103 @@
 from decimal import Decimal
 from django.conf import settings
-from django.db import models
-from finanzas_app.models.ingresos import Recaudacion
+from finanzas_app.services.agregaciones import obtener_agregacion
+from finanzas_app.services.cache_estadisticas import cacheado
+from finanzas_app.services.deuda import DeudaService
+from finanzas_app.services.distribucion import DistribucionService
+from finanzas_app.services.monedas import ConversorMoneda
 
 
 class EstadisticaService:
-    @classmethod
-    def obtener_estadisticas(cls):
-        """Obtiene estadísticas generales de todos los registros"""
-        registros = Recaudacion.objects.all()
+    """
+    Estadísticas de las recaudaciones.
 
-        if not registros.exists():
-            return {
-                "total_recaudado": 0,
-                "promedio_diario": 0,
-                "dias_registrados": 0,
-                "mejor_dia": None,
-                "peor_dia": None,
-            }
+    Las agregaciones las resuelve el backend configurado en
+    ``ESTADISTICAS_CONFIG["BACKEND"]`` (ver ``services/agregaciones.py``);
+    los totales y promedios son ``Decimal`` exactos. Los resultados se
+    guardan en la caché versionada de ``services/cache_estadisticas.py``.
 
-        total = sum(r.monto for r in registros)
-        promedio = total / registros.count()
+    Los métodos aceptan una ventana opcional ``desde``/``hasta`` (fechas,
+    ambos extremos incluidos; ver ``services/periodos.py``) que filtra por el
+    índice de ``fecha``. Sin ventana se usa todo el historial. Con
+    ``moneda`` (p. ej. "USD") los montos se convierten con la tasa de cada
+    día (ver ``services/monedas.py``); None es la moneda de origen.
+    """
 
-        mejor_dia = registros.order_by("-monto").first()
-        peor_dia = registros.order_by("monto").first()
+    @classmethod
+    @cacheado("resumen_dashboard")
+    def obtener_resumen_dashboard(cls, ultimos=10, desde=None, hasta=None, moneda=None):
+        """
+        Calcula todas las estadísticas del dashboard.
+
+        Args:
+            ultimos (int): Cantidad de registros recientes a devolver
+            desde (date): Primera fecha incluida (None = sin límite)
+            hasta (date): Última fecha incluida (None = sin límite)
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            dict: "estadisticas", "por_semana", "por_mes" y "por_dia_semana"
+                con la misma forma que los métodos individuales, más
+                "ultimos_registros" (los más recientes primero)
+        """
+        return obtener_agregacion(moneda).resumen(
+            ultimos=ultimos, desde=desde, hasta=hasta
+        )
 
-        return {
-            "total_recaudado": total,
-            "promedio_diario": promedio,
-            "dias_registrados": registros.count(),
-            "mejor_dia": mejor_dia,
-            "peor_dia": peor_dia,
-        }
+    @classmethod
+    @cacheado("estadisticas")
+    def obtener_estadisticas(cls, desde=None, hasta=None, moneda=None):
+        """Obtiene estadísticas generales de los registros del periodo"""
+        return obtener_agregacion(moneda).estadisticas(desde, hasta)
 
     @classmethod
-    def obtener_por_semana(cls):
+    @cacheado("por_semana")
+    def obtener_por_semana(cls, desde=None, hasta=None, moneda=None):
         """Agrupa registros por semana"""
-        registros = Recaudacion.objects.all().order_by("fecha")
-
-        semanas = {}
-        for registro in registros:
-            semana_key = f"{registro.numero_semana}"
-            if semana_key not in semanas:
-                semanas[semana_key] = {
-                    "semana": registro.numero_semana,
-                    "total": 0,
-                    "dias": 0,
-                    "promedio": 0,
-                }
-
-            semanas[semana_key]["total"] += float(registro.monto)
-            semanas[semana_key]["dias"] += 1
-
-        # Calcular promedio por semana
-        for semana in semanas.values():
-            semana["promedio"] = semana["total"] / semana["dias"]
-
-        return semanas
+        return obtener_agregacion(moneda).por_semana(desde, hasta)
 
     @classmethod
-    def obtener_por_mes(cls):
+    @cacheado("por_mes")
+    def obtener_por_mes(cls, desde=None, hasta=None, moneda=None):
         """Agrupa registros por mes"""
-        registros = Recaudacion.objects.all().order_by("fecha")
-
-        meses = {}
-        for registro in registros:
-            registro_anno = registro.fecha.year
-            registro_mes = registro.fecha.month
-            mes_key = f"{registro_anno}-{registro_mes}"
-            if mes_key not in meses:
-                meses_nombres = [
-                    "Enero",
-                    "Febrero",
-                    "Marzo",
-                    "Abril",
-                    "Mayo",
-                    "Junio",
-                    "Julio",
-                    "Agosto",
-                    "Septiembre",
-                    "Octubre",
-                    "Noviembre",
-                    "Diciembre",
-                ]
-                meses[mes_key] = {
-                    "mes": registro_mes,
-                    "mes_nombre": meses_nombres[registro_mes - 1],
-                    "año": registro_anno,
-                    "total": 0,
-                    "dias": 0,
-                    "promedio": 0,
-                }
-
-            meses[mes_key]["total"] += float(registro.monto)
-            meses[mes_key]["dias"] += 1
-
-        # Calcular promedio por mes
-        for mes in meses.values():
-            mes["promedio"] = mes["total"] / mes["dias"]
-
-        return meses
+        return obtener_agregacion(moneda).por_mes(desde, hasta)
 
     @classmethod
-    def obtener_por_dia_semana(cls):
+    @cacheado("por_dia_semana")
+    def obtener_por_dia_semana(cls, desde=None, hasta=None, moneda=None):
         """Agrupa registros por día de la semana"""
-        registros = Recaudacion.objects.all()
-
-        dias_semana = {
-            "Lunes": {"total": 0, "count": 0, "promedio": 0},
-            "Martes": {"total": 0, "count": 0, "promedio": 0},
-            "Miércoles": {"total": 0, "count": 0, "promedio": 0},
-            "Jueves": {"total": 0, "count": 0, "promedio": 0},
-            "Viernes": {"total": 0, "count": 0, "promedio": 0},
-            "Sábado": {"total": 0, "count": 0, "promedio": 0},
-            "Domingo": {"total": 0, "count": 0, "promedio": 0},
-        }
-
-        for registro in registros:
-            dia = registro.dia_semana
-            dias_semana[dia]["total"] += float(registro.monto)
-            dias_semana[dia]["count"] += 1
+        return obtener_agregacion(moneda).por_dia_semana(desde, hasta)
 
-        # Calcular promedio por día
-        for dia in dias_semana.values():
-            if dia["count"] > 0:
-                dia["promedio"] = dia["total"] / dia["count"]
+    @classmethod
+    @cacheado("distribucion_dia_semana")
+    def obtener_distribucion_dia_semana(cls, desde=None, hasta=None, moneda=None):
+        """Desviación estándar y percentiles por día de la semana"""
+        return DistribucionService.por_dia_semana(desde, hasta, moneda)
 
-        return dias_semana
+    @classmethod
+    @cacheado("moviles")
+    def obtener_moviles(cls, desde=None, hasta=None, moneda=None):
+        """Medias y desviaciones móviles (7, 28 y 90 días por defecto)"""
+        return DistribucionService.moviles(desde, hasta, moneda)
 
     @classmethod
+    @cacheado("deuda_semanal")
     def obtener_deuda_semanal(cls):
         """
-        Calcula la deuda acumulada desde la semana inicial configurada
-        """
+        Calcula la deuda acumulada desde la semana inicial configurada,
+        descontando los pagos (ver ``services/deuda.py``)
 
-        # Obtener todas las recaudaciones
-        recaudaciones = Recaudacion.objects.all()
+        El equivalente en USD del total usa la tasa vigente (la deuda se
+        paga hoy); el de cada semana del calendario, la tasa de esa semana.
 
-        if not recaudaciones.exists():
-            return {
-                "deuda_total_cup": Decimal("0"),
-                "deuda_total_usd": Decimal("0"),
-                "semanas_con_deuda": 0,
-                "detalle_por_semana": [],
-            }
-
-        # Encontrar la semana máxima registrada
-        max_semana = recaudaciones.aggregate(models.Max("numero_semana"))[
-            "numero_semana__max"
-        ]
-
-        if max_semana < settings.DEUDA_CONFIG["SEMANA_INICIO"]:
+        Returns:
+            dict: Totales y "detalle_por_semana" (el calendario completo).
+                Solo datos simples, que es lo que se guarda en la caché;
+                para consultar el saldo de otras semanas se arma el libro
+                con ``DeudaService.libro()``
+        """
+        libro = DeudaService.libro()
+        if not len(libro):
             return {
                 "deuda_total_cup": Decimal("0"),
                 "deuda_total_usd": Decimal("0"),
@@ -158,24 +105,34 @@ class EstadisticaService:
                 "detalle_por_semana": [],
             }
 
-        # Calcular cuántas semanas deben
-        semanas_con_deuda = max_semana - settings.DEUDA_CONFIG["SEMANA_INICIO"] + 1
+        moneda = settings.DEUDA_CONFIG["MONEDA_DESTINO"]
+        tasa_cambio = ConversorMoneda.tasa_actual(moneda)
 
-        # Calcular deuda total en CUP
-        deuda_total_cup = semanas_con_deuda * settings.DEUDA_CONFIG["MONTO_SEMANAL_CUP"]
-
-        # Obtener tasa de cambio de settings
-        tasa_cambio = Decimal(str(settings.DEUDA_CONFIG["TASA_CAMBIO_CUP_A_USD"]))
-
-        # Calcular deuda en USD
+        # Deuda pendiente: lo devengado menos lo pagado
+        deuda_total_cup = libro.saldo_total
         deuda_total_usd = deuda_total_cup / tasa_cambio
 
+        # Saldo de cada semana con la tasa de esa semana, en una búsqueda
+        filas = libro.filas()
+        saldos_usd = ConversorMoneda.convertir(
+            moneda,
+            [fila["fecha_inicio"] for fila in filas],
+            [fila["saldo"] for fila in filas],
+        )
+        for fila, saldo_usd in zip(filas, saldos_usd):
+            fila["saldo_usd"] = saldo_usd
+
         return {
             "deuda_total_cup": deuda_total_cup,
             "deuda_total_usd": deuda_total_usd,
-            "semanas_con_deuda": semanas_con_deuda,
+            "devengado_total_cup": libro.devengado_total,
+            "pagado_total_cup": libro.pagado_total,
+            "semanas_con_deuda": len(libro),
+            "semanas_cubiertas": libro.semanas_cubiertas(),
+            "semana_saldada": libro.semana_saldada(),
             "tasa_cambio": tasa_cambio,
             "deuda_semanal_cup": settings.DEUDA_CONFIG["MONTO_SEMANAL_CUP"],
             "semana_inicio_deuda": settings.DEUDA_CONFIG["SEMANA_INICIO"],
-            "ultima_semana_registrada": max_semana,
+            "ultima_semana_registrada": libro.semanas[-1],
+            "detalle_por_semana": filas,
         }
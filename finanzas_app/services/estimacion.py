@@ -0,0 +1,255 @@
+# finanzas_app/services/estimacion.py
+"""
+Estimación de la recaudación de las próximas semanas y meses.
+
+El monto de un día trabajado se modela como un nivel propio de su día de la
+semana más una tendencia lineal::
+
+    y = β[día de la semana] + γ · (t - centro)
+
+con ``t`` en días desde ``ORIGEN_TENDENCIA``, ajustado por mínimos
+cuadrados con NumPy. El ajuste solo necesita las ecuaciones normales
+(XᵀX, Xᵀy e yᵀy), que son sumas por día de la semana: ``ResumenDiaSemana``
+las mantiene por delta como el resto de los resúmenes (ver
+``services/resumenes.py``). Cada recaudación nueva suma su aporte y
+reajustar es resolver un sistema de 8×8, sin leer el historial. Los
+parámetros y las proyecciones se guardan en la caché versionada.
+
+Los días sin registro se consideran no trabajados: cada día de la semana
+entra en la proyección con la frecuencia con que se trabajó en el
+historial.
+"""
+
+import datetime
+import math
+from statistics import NormalDist
+
+from django.conf import settings
+from django.db.models import Max, Min, Sum
+
+from finanzas_app.dinero import a_centavos, desde_centavos
+from finanzas_app.models.resumenes import ResumenDiaSemana, ResumenSemana
+from finanzas_app.services.agregaciones import CERO, NOMBRES_MESES, recaudaciones
+from finanzas_app.services.cache_estadisticas import cacheado
+from finanzas_app.services.monedas import ConversorMoneda, hay_conversion
+
+# Origen de ``t``: fijo, para que el aporte de cada registro no cambie
+ORIGEN_TENDENCIA = datetime.date(2025, 1, 1)
+
+
+def dia_tendencia(fecha):
+    """``t`` de una fecha: días desde ``ORIGEN_TENDENCIA``"""
+    return (fecha - ORIGEN_TENDENCIA).days
+
+
+def _ocurrencias(dia, primera, ultima):
+    """Cantidad de fechas con día de la semana ``dia`` entre dos fechas"""
+    semanas, resto = divmod((ultima - primera).days + 1, 7)
+    return semanas + ((dia - primera.weekday()) % 7 < resto)
+
+
+def _monto(centavos):
+    return desde_centavos(round(centavos))
+
+
+class EstimacionService:
+    """Proyección de la recaudación con intervalos de confianza"""
+
+    @staticmethod
+    @cacheado("modelo_estimacion")
+    def ajustar():
+        """
+        Ajusta el modelo con las sumas de ``ResumenDiaSemana``.
+
+        Returns:
+            dict: "dias_semana" (los días trabajados, 0 = lunes),
+                "coeficientes" (un nivel por día trabajado y la pendiente,
+                en centavos), "centro", "inversa" ((XᵀX)⁻¹), "varianza"
+                (de los residuos), "frecuencias" (por día de la semana),
+                "dias", "primera" y "ultima" (fechas); None si hay menos
+                registros que parámetros
+        """
+        import numpy as np
+
+        filas = [fila for fila in ResumenDiaSemana.objects.order_by("dia") if fila.dias]
+        cantidad = sum(fila.dias for fila in filas)
+        parametros = len(filas) + 1
+        if cantidad <= parametros:
+            return None
+
+        # Sumas centradas en ``t`` con enteros de Python (exactas) antes de
+        # pasar a coma flotante
+        centro = round(sum(fila.suma_t for fila in filas) / cantidad)
+        gram = np.zeros((parametros, parametros))
+        xty = np.zeros(parametros)
+        suma_t2 = suma_ty = yty = 0
+        for i, fila in enumerate(filas):
+            total = a_centavos(fila.total)
+            suma_t = fila.suma_t - fila.dias * centro
+            gram[i, i] = fila.dias
+            gram[i, -1] = gram[-1, i] = suma_t
+            xty[i] = total
+            suma_t2 += fila.suma_t2 - 2 * centro * fila.suma_t + fila.dias * centro**2
+            suma_ty += fila.suma_ty - centro * total
+            yty += fila.cuadrados
+        gram[-1, -1] = suma_t2
+        xty[-1] = suma_ty
+
+        coeficientes = np.linalg.lstsq(gram, xty, rcond=None)[0]
+        # En el óptimo, βᵀXᵀXβ = βᵀXᵀy
+        residuos = max(yty - float(coeficientes @ xty), 0.0)
+
+        rango = ResumenSemana.objects.aggregate(
+            primera=Min("fecha_inicio"), ultima=Max("fecha_fin")
+        )
+        frecuencias = [0.0] * 7
+        for fila in filas:
+            ocurrencias = _ocurrencias(fila.dia, rango["primera"], rango["ultima"])
+            frecuencias[fila.dia] = min(fila.dias / ocurrencias, 1.0)
+
+        return {
+            "dias_semana": [fila.dia for fila in filas],
+            "coeficientes": coeficientes.tolist(),
+            "centro": centro,
+            "inversa": np.linalg.pinv(gram).tolist(),
+            "varianza": residuos / (cantidad - parametros),
+            "frecuencias": frecuencias,
+            "dias": cantidad,
+            "primera": rango["primera"],
+            "ultima": rango["ultima"],
+        }
+
+    @staticmethod
+    def proyectar(modelo, inicio, fin):
+        """
+        Total esperado de los días entre ``inicio`` y ``fin`` y su varianza.
+
+        La varianza suma la de cada día (residuo del modelo y si se trabaja
+        o no, con la frecuencia histórica) y la de los coeficientes
+        estimados.
+
+        Returns:
+            tuple: (total esperado, varianza), en centavos
+        """
+        import numpy as np
+
+        if fin < inicio:
+            return 0.0, 0.0
+
+        fechas = np.arange(
+            np.datetime64(inicio), np.datetime64(fin) + np.timedelta64(1, "D")
+        )
+        dias = fechas.astype(np.int64)
+        # 1970-01-01 fue jueves (weekday() == 3)
+        dias_semana = (dias + 3) % 7
+        t = dias - np.datetime64(ORIGEN_TENDENCIA).astype(np.int64) - modelo["centro"]
+
+        # Una fila de X por fecha (solo días de la semana trabajados)
+        columnas = {dia: i for i, dia in enumerate(modelo["dias_semana"])}
+        trabajados = np.isin(dias_semana, modelo["dias_semana"])
+        x = np.zeros((trabajados.sum(), len(columnas) + 1))
+        x[np.arange(len(x)), [columnas[d] for d in dias_semana[trabajados]]] = 1.0
+        x[:, -1] = t[trabajados]
+
+        frecuencia = np.asarray(modelo["frecuencias"])[dias_semana[trabajados]]
+        esperado = np.clip(x @ np.asarray(modelo["coeficientes"]), 0, None)
+        agregado = frecuencia @ x
+
+        varianza = (
+            modelo["varianza"] * frecuencia.sum()
+            + float(frecuencia * (1 - frecuencia) @ esperado**2)
+            + modelo["varianza"]
+            * float(agregado @ np.asarray(modelo["inversa"]) @ agregado)
+        )
+        return float(frecuencia @ esperado), varianza
+
+    @classmethod
+    @cacheado("estimacion")
+    def obtener_estimacion(cls, moneda=None):
+        """
+        Estimación de las próximas semanas y meses.
+
+        Los periodos empiezan en la semana (lunes a domingo) y en el mes del
+        día siguiente al último registro; en el primero, lo ya registrado se
+        suma a lo proyectado para el resto.
+
+        El modelo se ajusta en la moneda de origen. En otra ``moneda``, lo
+        registrado se convierte con la tasa de cada día y lo proyectado con
+        la tasa vigente (las futuras no se conocen).
+
+        Returns:
+            dict: "semanas" y "meses" (listas con "etiqueta", "inicio",
+                "fin", "real", "estimado", "minimo" y "maximo"),
+                "confianza" y "modelo" (resumen del ajuste, o None si no hay
+                datos suficientes)
+        """
+        config = settings.ESTIMACION_CONFIG
+        modelo = cls.ajustar()
+        if modelo is None:
+            return {
+                "semanas": [],
+                "meses": [],
+                "confianza": config["CONFIANZA"],
+                "modelo": None,
+            }
+
+        siguiente = modelo["ultima"] + datetime.timedelta(days=1)
+        lunes = siguiente - datetime.timedelta(days=siguiente.weekday())
+        semanas = []
+        for i in range(config["SEMANAS"]):
+            inicio = lunes + datetime.timedelta(weeks=i)
+            fin = inicio + datetime.timedelta(days=6)
+            etiqueta = f"{inicio:%d/%m} - {fin:%d/%m}"
+            semanas.append(cls._periodo(modelo, etiqueta, inicio, fin, moneda))
+
+        meses = []
+        anno, mes = siguiente.year, siguiente.month
+        for _ in range(config["MESES"]):
+            inicio = datetime.date(anno, mes, 1)
+            anno, mes = (anno + 1, 1) if mes == 12 else (anno, mes + 1)
+            fin = datetime.date(anno, mes, 1) - datetime.timedelta(days=1)
+            etiqueta = f"{NOMBRES_MESES[inicio.month - 1]} {inicio.year}"
+            meses.append(cls._periodo(modelo, etiqueta, inicio, fin, moneda))
+
+        tasa = float(ConversorMoneda.tasa_actual(moneda))
+        return {
+            "semanas": semanas,
+            "meses": meses,
+            "confianza": config["CONFIANZA"],
+            "modelo": {
+                "dias": modelo["dias"],
+                "tendencia_diaria": _monto(modelo["coeficientes"][-1] / tasa),
+                "desviacion": _monto(math.sqrt(modelo["varianza"]) / tasa),
+            },
+        }
+
+    @staticmethod
+    def _periodo(modelo, etiqueta, inicio, fin, moneda=None):
+        """Real, estimado e intervalo de un periodo"""
+        siguiente = modelo["ultima"] + datetime.timedelta(days=1)
+        real = CERO
+        if inicio < siguiente:
+            registradas = recaudaciones(inicio, modelo["ultima"])
+            if hay_conversion(moneda):
+                filas = list(registradas.values_list("fecha", "monto"))
+                fechas, montos = zip(*filas) if filas else ((), ())
+                real = sum(ConversorMoneda.convertir(moneda, fechas, montos), CERO)
+            else:
+                real = registradas.aggregate(total=Sum("monto"))["total"] or CERO
+
+        esperado, varianza = EstimacionService.proyectar(
+            modelo, max(inicio, siguiente), fin
+        )
+        confianza = settings.ESTIMACION_CONFIG["CONFIANZA"]
+        margen = NormalDist().inv_cdf(0.5 + confianza / 2) * math.sqrt(varianza)
+        tasa = float(ConversorMoneda.tasa_actual(moneda))
+        esperado, margen = esperado / tasa, margen / tasa
+        return {
+            "etiqueta": etiqueta,
+            "inicio": inicio,
+            "fin": fin,
+            "real": real,
+            "estimado": real + _monto(esperado),
+            "minimo": real + _monto(max(esperado - margen, 0)),
+            "maximo": real + _monto(esperado + margen),
+        }
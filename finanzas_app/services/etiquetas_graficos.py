@@ -0,0 +1,291 @@
+# finanzas_app/services/etiquetas_graficos.py
+"""
+Etiquetas de valor ("$12,345" con recuadro redondeado) dibujadas en lote.
+
+Con ``ax.annotate`` cada etiqueta es un ``Text`` con su ``FancyBboxPatch``:
+Matplotlib calcula su layout y su caja por separado (dos veces por
+renderizado con ``layout="tight"``), así que el tiempo crece con cada barra.
+
+Aquí todas las etiquetas se colocan en una sola pasada con NumPy y se
+dibujan como dos colecciones (recuadros y texto), independientemente de la
+cantidad de barras:
+
+- Los glifos de cada carácter se convierten a trazos una sola vez y se
+  reutilizan (caché por fuente y tamaño).
+- El ancho de cada etiqueta es la suma de los avances de sus caracteres.
+- Los recuadros redondeados se generan a la vez a partir de una plantilla.
+- Si las barras están muy juntas se puede mostrar solo una etiqueta de
+  cada N (siempre la última), en lugar de dejar que se solapen.
+
+Matplotlib y NumPy se importan al crear la primera etiqueta.
+"""
+
+import math
+import threading
+from functools import lru_cache
+
+# Constante de Bézier para aproximar un cuarto de círculo
+_KAPPA = 0.5522847498
+
+_glifos = {}
+_glifos_lock = threading.Lock()
+
+
+def _glifo(propiedades, caracter):
+    """
+    Devuelve el trazo de un carácter en el origen y su avance horizontal.
+
+    Args:
+        propiedades: FontProperties (fuente, peso y tamaño en puntos)
+        caracter (str): Carácter a convertir
+
+    Returns:
+        tuple: (vértices Nx2, códigos, avance), en puntos
+    """
+    clave = (hash(propiedades), caracter)
+    glifo = _glifos.get(clave)
+    if glifo is not None:
+        return glifo
+
+    import numpy as np
+    from matplotlib.font_manager import findfont, get_font
+    from matplotlib.ft2font import LoadFlags
+    from matplotlib.textpath import TextPath
+
+    # FT2Font es compartido: set_size/load_char no deben intercalarse
+    with _glifos_lock:
+        fuente = get_font(findfont(propiedades))
+        fuente.set_size(propiedades.get_size_in_points(), 72)
+        glifo_ft = fuente.load_char(ord(caracter), flags=LoadFlags.NO_HINTING)
+        avance = glifo_ft.linearHoriAdvance / 65536
+        trazo = TextPath((0, 0), caracter, prop=propiedades)
+
+    glifo = (
+        np.asarray(trazo.vertices, dtype=float).reshape(-1, 2),
+        np.asarray(trazo.codes, dtype=np.uint8).reshape(-1),
+        avance,
+    )
+    _glifos[clave] = glifo
+    return glifo
+
+
+@lru_cache(maxsize=None)
+def _plantilla_recuadro():
+    """
+    Vértices de un rectángulo redondeado como (signo de esquina, arco).
+
+    Cada vértice es ``signo * (semieje - radio) + arco * radio``, lo que
+    permite generar todos los recuadros de una vez con NumPy.
+    """
+    import numpy as np
+    from matplotlib.path import Path
+
+    signos, arcos, codigos = [], [], []
+    # Esquinas en sentido antihorario empezando por la inferior derecha
+    esquinas = (((1, -1), -90), ((1, 1), 0), ((-1, 1), 90), ((-1, -1), 180))
+    for signo, angulo in esquinas:
+        inicio = math.radians(angulo)
+        fin = math.radians(angulo + 90)
+        puntos = [
+            (math.cos(inicio), math.sin(inicio)),
+            (
+                math.cos(inicio) - _KAPPA * math.sin(inicio),
+                math.sin(inicio) + _KAPPA * math.cos(inicio),
+            ),
+            (
+                math.cos(fin) + _KAPPA * math.sin(fin),
+                math.sin(fin) - _KAPPA * math.cos(fin),
+            ),
+            (math.cos(fin), math.sin(fin)),
+        ]
+        for i, punto in enumerate(puntos):
+            signos.append(signo)
+            arcos.append(punto)
+            if i == 0:
+                codigos.append(Path.MOVETO if not codigos else Path.LINETO)
+            else:
+                codigos.append(Path.CURVE4)
+
+    signos.append(signos[0])
+    arcos.append(arcos[0])
+    codigos.append(Path.CLOSEPOLY)
+    return (
+        np.array(signos, dtype=float),
+        np.array(arcos, dtype=float),
+        np.array(codigos, dtype=np.uint8),
+    )
+
+
+class EtiquetasValor:
+    """
+    Conjunto de etiquetas de valor de unos ejes, dibujado como colecciones.
+
+    Sustituye a un ``ax.annotate`` por barra o punto con
+    ``xytext=(0, desplazamiento)``, ``va="bottom"`` y
+    ``bbox=dict(boxstyle="round,pad=relleno")``.
+    """
+
+    def __init__(self, ax, config, tamano, desplazamiento, relleno, adelgazar=None):
+        """
+        Args:
+            ax: Ejes donde se dibujan las etiquetas
+            config (dict): Configuración visual (CONFIG_GRAFICOS)
+            tamano (float): Tamaño de fuente en puntos
+            desplazamiento (float): Separación en puntos sobre el valor
+            relleno (float): Margen del recuadro, en fracción del tamaño
+            adelgazar (bool): Omitir etiquetas cuando no caben; por defecto
+                ``config["etiquetas_valor"]["adelgazar"]``
+        """
+        import numpy as np
+        from matplotlib.collections import PathCollection
+        from matplotlib.colors import to_rgba
+        from matplotlib.font_manager import FontProperties
+        from matplotlib.transforms import Affine2D
+
+        fuente = config["fuentes"]["numeros"]
+        opciones = config["etiquetas_valor"]
+
+        self.ax = ax
+        self.desplazamiento = desplazamiento
+        self.relleno = relleno * tamano
+        self.separacion = opciones["separacion_minima"]
+        self.adelgazar = opciones["adelgazar"] if adelgazar is None else adelgazar
+        self.propiedades = FontProperties(weight=fuente["weight"], size=tamano)
+
+        # Trazos en puntos, colocados en coordenadas de datos
+        puntos_a_pixeles = Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans
+        comunes = dict(
+            offsets=np.empty((0, 2)),
+            offset_transform=ax.transData,
+            transform=puntos_a_pixeles,
+        )
+        self.recuadros = PathCollection(
+            [],
+            facecolors=[to_rgba("white", 0.9)],
+            edgecolors=[config["colores"]["grid"]],
+            linewidths=1,
+            zorder=4,
+            **comunes,
+        )
+        self.textos = PathCollection(
+            [],
+            facecolors=[fuente["color"]],
+            edgecolors="none",
+            linewidths=0,
+            zorder=5,
+            **comunes,
+        )
+        for coleccion in (self.recuadros, self.textos):
+            # Como annotate: sin recorte en el borde de los ejes y fuera del
+            # cálculo de layout="tight" (ylim ya deja margen para ellas)
+            coleccion.set_clip_on(False)
+            coleccion.set_in_layout(False)
+            ax.add_collection(coleccion, autolim=False)
+
+    def actualizar(self, posiciones, valores):
+        """
+        Coloca una etiqueta sobre cada valor positivo.
+
+        Args:
+            posiciones (list): Coordenada X de cada barra o punto
+            valores (list): Valores (coordenada Y y texto de la etiqueta)
+        """
+        import numpy as np
+
+        x = np.asarray(posiciones, dtype=float)
+        y = np.asarray(valores, dtype=float)
+        indices = np.flatnonzero(y > 0)
+        textos = [f"${valor:,.0f}" for valor in y[indices]]
+
+        if self.adelgazar and len(textos) > 1:
+            paso = self._paso_adelgazado(x, max(map(self._ancho, textos)))
+            if paso > 1:
+                # Se conserva siempre la última etiqueta (la semana actual)
+                conservar = (len(indices) - 1 - np.arange(len(indices))) % paso == 0
+                indices = indices[conservar]
+                textos = [t for t, c in zip(textos, conservar) if c]
+
+        self._colocar(x[indices], y[indices], textos)
+
+    def _ancho(self, texto):
+        return sum(_glifo(self.propiedades, c)[2] for c in texto)
+
+    def _paso_adelgazado(self, x, ancho_etiqueta):
+        """Cada cuántas etiquetas se muestra una para que no se solapen"""
+        x0, x1 = self.ax.get_xlim()
+        figura = self.ax.figure
+        # La posición de los ejes la fija el layout "tight", que solo corre
+        # al dibujar: se aplica antes de medir para que el paso no dependa
+        # de si la plantilla ya se había renderizado (las etiquetas no
+        # participan del layout)
+        motor = figura.get_layout_engine()
+        if motor is not None:
+            motor.execute(figura)
+        ancho_ejes = self.ax.get_position().width * figura.bbox.width
+        # Separación en puntos entre dos barras consecutivas
+        hueco = ancho_ejes / abs(x1 - x0) * abs(x[1] - x[0]) * 72 / figura.dpi
+        necesario = ancho_etiqueta + 2 * self.relleno + self.separacion
+        return max(1, math.ceil(necesario / hueco)) if hueco > 0 else 1
+
+    def _colocar(self, x, y, textos):
+        """Genera los trazos de texto y recuadros en una sola pasada"""
+        import numpy as np
+        from matplotlib.path import Path
+
+        if not textos:
+            for coleccion in (self.recuadros, self.textos):
+                coleccion.set_paths([])
+                coleccion.set_offsets(np.empty((0, 2)))
+            return
+
+        # Avance de cada carácter y ancho de cada etiqueta
+        glifos = [_glifo(self.propiedades, c) for c in "".join(textos)]
+        avances = np.fromiter((g[2] for g in glifos), float, len(glifos))
+        longitudes = np.fromiter(map(len, textos), int, len(textos))
+        inicios = np.concatenate(([0], np.cumsum(longitudes)[:-1]))
+        anchos = np.add.reduceat(avances, inicios)
+
+        n = len(textos)
+        etiqueta_de = np.repeat(np.arange(n), longitudes)
+
+        # Posición X de cada carácter: avance acumulado dentro de su
+        # etiqueta, centrado
+        acumulado = np.cumsum(avances) - avances
+        x_caracter = (
+            acumulado - acumulado[inicios][etiqueta_de] - anchos[etiqueta_de] / 2
+        )
+
+        vertices = [g[0] for g in glifos]
+        cantidades = np.fromiter(map(len, vertices), int, len(vertices))
+        todos = np.concatenate(vertices)
+        codigos = np.concatenate([g[1] for g in glifos])
+
+        # Altura de la tinta (el "$" y la coma bajan de la línea base)
+        abajo = todos[:, 1].min()
+        arriba = todos[:, 1].max()
+        base = self.desplazamiento + self.relleno - abajo
+
+        todos = todos + np.column_stack(
+            (np.repeat(x_caracter, cantidades), np.full(len(todos), base))
+        )
+        cortes = np.cumsum(np.add.reduceat(cantidades, inicios))[:-1]
+        trazos = [
+            Path(v, c)
+            for v, c in zip(np.split(todos, cortes), np.split(codigos, cortes))
+        ]
+
+        # Recuadros redondeados, todos a la vez
+        signos, arcos, codigos_recuadro = _plantilla_recuadro()
+        semiancho = anchos / 2 + self.relleno
+        semialto = (arriba - abajo) / 2 + self.relleno
+        centro_y = self.desplazamiento + semialto
+        radio = min(self.relleno, semialto)
+        semiejes = np.column_stack((semiancho, np.full(n, semialto))) - radio
+        recuadros = signos[None] * semiejes[:, None] + arcos[None] * radio
+        recuadros[:, :, 1] += centro_y
+
+        desplazamientos = np.column_stack((x, y))
+        self.textos.set_paths(trazos)
+        self.textos.set_offsets(desplazamientos)
+        self.recuadros.set_paths([Path(r, codigos_recuadro) for r in recuadros])
+        self.recuadros.set_offsets(desplazamientos)
@@ -0,0 +1,159 @@
+# finanzas_app/services/monedas.py
+"""
+Conversión de montos a otra moneda con la tasa histórica de cada día.
+
+Las tasas (``TasaCambio``) son una serie por moneda: cada tasa rige desde
+su fecha hasta la siguiente. La serie se guarda en la caché versionada como
+dos arreglos NumPy ordenados (días desde 1970-01-01 y tasas), y la tasa de
+cada fecha a convertir se busca con ``searchsorted`` (búsqueda binaria
+vectorizada): convertir N montos cuesta O(N log T), sin una consulta por
+registro.
+
+Antes de la primera tasa cargada se usa la primera; sin tasas cargadas, la
+de ``MONEDAS_CONFIG["TASAS_RESPALDO"]``. Cada monto se convierte y se
+redondea a centavos por separado, así que los totales en otra moneda son
+sumas exactas de centavos, como en la moneda de origen.
+
+NumPy se importa al convertir por primera vez.
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+
+from finanzas_app.dinero import a_centavos, desde_centavos
+from finanzas_app.models.monedas import TasaCambio
+from finanzas_app.services.cache_estadisticas import cacheado
+
+
+def moneda_origen():
+    return settings.MONEDAS_CONFIG["ORIGEN"]
+
+
+def validar_moneda(moneda):
+    """
+    Moneda pedida, normalizada (None o vacía = la de origen).
+
+    Raises:
+        ValueError: Si la moneda no está en ``MONEDAS_CONFIG["DISPONIBLES"]``
+    """
+    moneda = (moneda or moneda_origen()).upper()
+    if moneda not in settings.MONEDAS_CONFIG["DISPONIBLES"]:
+        raise ValueError(f"Moneda no disponible: {moneda}")
+    return moneda
+
+
+def hay_conversion(moneda):
+    """True si los montos se tienen que convertir para mostrarlos en ``moneda``"""
+    return moneda is not None and moneda != moneda_origen()
+
+
+def tasa_respaldo(moneda):
+    return Decimal(str(settings.MONEDAS_CONFIG["TASAS_RESPALDO"][moneda]))
+
+
+class ConversorMoneda:
+    """Serie de tasas de una moneda y conversión vectorizada de montos"""
+
+    @staticmethod
+    @cacheado("serie_tasas")
+    def serie(moneda):
+        """
+        Serie de tasas de ``moneda``, ordenada por fecha.
+
+        Returns:
+            dict: "dias" (días desde 1970-01-01, ``int64``), "tasas"
+                (``float64``) y "ultima" (la tasa vigente, ``Decimal``)
+        """
+        import numpy as np
+
+        filas = list(
+            TasaCambio.objects.filter(moneda=moneda)
+            .order_by("fecha")
+            .values_list("fecha", "tasa")
+        )
+        if not filas:
+            respaldo = tasa_respaldo(moneda)
+            return {
+                "dias": np.zeros(1, dtype=np.int64),
+                "tasas": np.array([float(respaldo)]),
+                "ultima": respaldo,
+            }
+
+        fechas, tasas = zip(*filas)
+        return {
+            "dias": np.array(fechas, dtype="datetime64[D]").astype(np.int64),
+            "tasas": np.array([float(tasa) for tasa in tasas]),
+            "ultima": tasas[-1],
+        }
+
+    @classmethod
+    def tasa_actual(cls, moneda):
+        """Tasa vigente (la última cargada) de ``moneda``, como ``Decimal``"""
+        if not hay_conversion(moneda):
+            return Decimal("1")
+        return cls.serie(moneda)["ultima"]
+
+    @classmethod
+    def tasas(cls, moneda, dias):
+        """
+        Tasa de cada día.
+
+        Args:
+            moneda (str): Moneda de destino
+            dias (numpy.ndarray): Días desde 1970-01-01
+
+        Returns:
+            numpy.ndarray: Tasas (``float64``), una por día
+        """
+        import numpy as np
+
+        serie = cls.serie(moneda)
+        # Última tasa con fecha <= día; antes de la primera, la primera
+        posiciones = np.searchsorted(serie["dias"], dias, side="right") - 1
+        return serie["tasas"][np.maximum(posiciones, 0)]
+
+    @classmethod
+    def convertir_centavos(cls, moneda, dias, centavos):
+        """
+        Convierte montos en centavos de la moneda de origen a ``moneda``.
+
+        Args:
+            moneda (str): Moneda de destino (None = sin conversión)
+            dias (numpy.ndarray): Día de cada monto (días desde 1970-01-01)
+            centavos (numpy.ndarray): Montos en centavos (``int64``)
+
+        Returns:
+            numpy.ndarray: Centavos de ``moneda`` (``int64``), redondeados
+        """
+        import numpy as np
+
+        if not hay_conversion(moneda) or not len(centavos):
+            return centavos
+        # Redondeo al centavo más cercano (mitades hacia arriba, como
+        # ``a_decimal``)
+        convertidos = np.floor(centavos / cls.tasas(moneda, dias) + 0.5)
+        return convertidos.astype(np.int64)
+
+    @classmethod
+    def convertir(cls, moneda, fechas, montos):
+        """
+        Convierte montos (``Decimal`` en la moneda de origen) de varias fechas.
+
+        Args:
+            moneda (str): Moneda de destino (None = sin conversión)
+            fechas (list): Fecha de cada monto
+            montos (list): Montos en la moneda de origen
+
+        Returns:
+            list: Montos en ``moneda`` (``Decimal`` con dos decimales)
+        """
+        import numpy as np
+
+        if not hay_conversion(moneda):
+            return list(montos)
+        dias = np.array(fechas, dtype="datetime64[D]").astype(np.int64)
+        centavos = np.fromiter((a_centavos(m) for m in montos), np.int64, len(dias))
+        return [
+            desde_centavos(c) for c in cls.convertir_centavos(moneda, dias, centavos)
+        ]
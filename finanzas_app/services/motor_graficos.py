@@ -0,0 +1,452 @@
+# finanzas_app/services/motor_graficos.py
+"""
+Motor de renderizado de gráficos sin pyplot.
+
+Trabaja directamente con ``matplotlib.figure.Figure`` y ``FigureCanvasAgg``,
+sin estado global, por lo que se puede usar desde varios hilos a la vez
+(servidores WSGI/ASGI con hilos).
+
+Cada tipo de gráfico tiene plantillas ya estilizadas (ejes, bordes, grid,
+fuentes y títulos). En cada renderizado solo se cambian los datos
+(``set_height``, ``set_data``, etiquetas de valor) en lugar de reconstruir
+la figura completa. Las etiquetas de valor se dibujan en lote (ver
+``etiquetas_graficos``).
+
+Matplotlib se importa al crear la primera figura, no al importar el módulo,
+para que las vistas y comandos que no dibujan no paguen ese coste.
+"""
+
+import copy
+import io
+import threading
+
+from django.conf import settings
+
+from finanzas_app.services.etiquetas_graficos import EtiquetasValor
+
+ESTILO = "seaborn-v0_8-whitegrid"
+
+# matplotlib.style.context modifica rcParams (global): solo se usa al crear
+# figuras, y siempre bajo este lock.
+_estilo_lock = threading.Lock()
+
+DIAS_FIN_SEMANA = ["Sáb", "Dom"]
+
+# Título, eje X y eje Y de cada tipo de gráfico (compartido con el SVG).
+# ``{moneda}`` se sustituye por la moneda mostrada (ver ``textos_grafico``)
+TEXTOS_GRAFICOS = {
+    "semanal": ("📊 INGRESOS SEMANALES", "SEMANA", "INGRESOS ({moneda})"),
+    "diario": (
+        "📈 INGRESOS POR DÍA",
+        "DÍA DE LA SEMANA",
+        "TOTAL DE INGRESOS ({moneda})",
+    ),
+    "promedio_diario": (
+        "📈 PROMEDIO DE INGRESOS POR DÍA",
+        "DÍA DE LA SEMANA",
+        "PROMEDIO DE INGRESOS ({moneda})",
+    ),
+    "mensual": ("📈 TENDENCIA DE INGRESOS MENSUALES", "MES", "INGRESOS ({moneda})"),
+    "semanal_historial": (
+        "📊 HISTORIAL DE INGRESOS SEMANALES",
+        "SEMANA",
+        "INGRESOS ({moneda})",
+    ),
+    "mensual_historial": (
+        "📈 HISTORIAL DE INGRESOS MENSUALES",
+        "MES",
+        "INGRESOS ({moneda})",
+    ),
+}
+
+# Los gráficos de historial completo se dibujan como su tipo base, con la
+# serie reducida (ver ``muestreo``) y sin línea de promedio
+TIPOS_BASE = {"semanal_historial": "semanal", "mensual_historial": "mensual"}
+
+
+def textos_grafico(tipo, moneda=None):
+    """
+    Título, eje X y eje Y de un tipo de gráfico en la moneda mostrada.
+
+    Args:
+        tipo (str): Tipo de gráfico (clave de ``TEXTOS_GRAFICOS``)
+        moneda (str): Moneda de los valores (None = la de origen)
+
+    Raises:
+        ValueError: Si el tipo de gráfico no existe
+    """
+    if tipo not in TEXTOS_GRAFICOS:
+        raise ValueError(f"Tipo de gráfico desconocido: {tipo}")
+    moneda = moneda or settings.MONEDAS_CONFIG["ORIGEN"]
+    return tuple(texto.format(moneda=moneda) for texto in TEXTOS_GRAFICOS[tipo])
+
+
+def tipo_base(tipo):
+    """Tipo de gráfico que determina el dibujo ("semanal_historial" -> "semanal")"""
+    return TIPOS_BASE.get(tipo, tipo)
+
+
+def crear_figura(config, tamano=None):
+    """
+    Crea una figura estilizada con su canvas Agg, sin pasar por pyplot.
+
+    Args:
+        config (dict): Configuración visual (CONFIG_GRAFICOS)
+        tamano (tuple): Tamaño en pulgadas (por defecto el de la config)
+
+    Returns:
+        tuple: (figura, ejes)
+    """
+    import matplotlib.style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    with _estilo_lock, matplotlib.style.context(ESTILO):
+        figura = Figure(
+            figsize=tamano or config["tamano_figura"],
+            dpi=config["dpi"],
+            facecolor=config["colores"]["fondo"],
+        )
+        FigureCanvasAgg(figura)
+        ax = figura.add_subplot()
+    return figura, ax
+
+
+def fuentes_grandes(config):
+    """Fuentes ampliadas usadas en los gráficos por día de la semana"""
+    fuentes = copy.deepcopy(config["fuentes"])
+    fuentes["titulo"]["size"] = 30
+    fuentes["ejes"]["size"] = 20
+    fuentes["etiquetas"]["size"] = 20
+    fuentes["numeros"]["size"] = 27
+    fuentes["leyenda"]["size"] = 25
+    return fuentes
+
+
+class PlantillaGrafico:
+    """
+    Figura pre-estilizada que se reutiliza entre renderizados.
+
+    Las subclases construyen los elementos fijos en ``_construir`` y
+    cambian solo los datos en ``_actualizar``.
+    """
+
+    def __init__(self, config, titulo, eje_x, eje_y, fuentes=None):
+        import matplotlib.style
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.config = config
+        self.fuentes = fuentes or config["fuentes"]
+
+        with _estilo_lock, matplotlib.style.context(ESTILO):
+            self.figura = Figure(
+                figsize=config["tamano_figura"],
+                dpi=config["dpi"],
+                facecolor=config["colores"]["fondo"],
+                layout="tight",
+            )
+            FigureCanvasAgg(self.figura)
+            self.ax = self.figura.add_subplot()
+
+            self.ax.set_title(titulo, fontdict=self.fuentes["titulo"], pad=25)
+            self.ax.set_xlabel(eje_x, fontdict=self.fuentes["ejes"], labelpad=20)
+            self.ax.set_ylabel(eje_y, fontdict=self.fuentes["ejes"], labelpad=20)
+            self.ax.tick_params(
+                axis="both",
+                labelsize=self.fuentes["etiquetas"]["size"],
+                colors=self.fuentes["etiquetas"]["color"],
+            )
+            self.ax.spines["top"].set_visible(False)
+            self.ax.spines["right"].set_visible(False)
+
+            self._construir()
+
+    def renderizar(self, etiquetas, valores):
+        """
+        Cambia los datos de la plantilla y la rasteriza a PNG.
+
+        Args:
+            etiquetas (list): Etiquetas del eje X
+            valores (list): Valores numéricos (float)
+
+        Returns:
+            bytes: Imagen PNG
+        """
+        self._actualizar(list(etiquetas), [float(v) for v in valores])
+
+        buf = io.BytesIO()
+        self.figura.savefig(
+            buf,
+            format="png",
+            dpi=self.config["dpi"],
+            facecolor=self.figura.get_facecolor(),
+            edgecolor="none",
+        )
+        return buf.getvalue()
+
+    def _construir(self):
+        raise NotImplementedError
+
+    def _actualizar(self, etiquetas, valores):
+        raise NotImplementedError
+
+    def _ajustar_limites(self, n, ancho, valores):
+        """Límites equivalentes al autoescalado, con espacio para etiquetas"""
+        extension = (n - 1) + ancho
+        margen = 0.05 * extension if extension > 0 else 0.5
+        self.ax.set_xlim(-ancho / 2 - margen, n - 1 + ancho / 2 + margen)
+        maximo = max(valores) if valores and max(valores) > 0 else 1
+        self.ax.set_ylim(0, maximo * 1.15)
+
+
+class PlantillaBarras(PlantillaGrafico):
+    """Gráfico de barras con etiquetas de valor y línea de promedio opcional"""
+
+    def __init__(
+        self,
+        config,
+        titulo,
+        eje_x,
+        eje_y,
+        fuentes=None,
+        tamano_etiquetas=12,
+        rotar_etiquetas=False,
+        linea_promedio=False,
+        colorear_fin_semana=False,
+        bordes_finos=False,
+    ):
+        self.tamano_etiquetas = tamano_etiquetas
+        self.rotar_etiquetas = rotar_etiquetas
+        self.bordes_finos = bordes_finos
+        self.con_promedio = linea_promedio
+        self.colorear_fin_semana = colorear_fin_semana
+        super().__init__(config, titulo, eje_x, eje_y, fuentes)
+
+    def _construir(self):
+        self.barras = []
+        self.etiquetas_valor = EtiquetasValor(
+            self.ax, self.config, self.tamano_etiquetas, desplazamiento=8, relleno=0.3
+        )
+
+        self.ax.grid(
+            True,
+            axis="y",
+            alpha=0.3,
+            color=self.config["colores"]["grid"],
+            linestyle="--",
+            linewidth=0.8,
+            zorder=0,
+        )
+        if self.bordes_finos:
+            self.ax.spines["left"].set_linewidth(0.5)
+            self.ax.spines["bottom"].set_linewidth(0.5)
+
+        self.linea_promedio = None
+        self.leyenda = None
+        if self.con_promedio:
+            self.linea_promedio = self.ax.axhline(
+                y=0,
+                color=self.config["colores"]["acento"],
+                linestyle="--",
+                linewidth=2,
+                alpha=0.7,
+                label="Promedio",
+            )
+            self.leyenda = self.ax.legend(
+                fontsize=self.config["fuentes"]["leyenda"]["size"],
+                loc="upper right",
+                framealpha=0.9,
+                fancybox=True,
+                shadow=True,
+            )
+
+    def _asegurar_capacidad(self, n):
+        """Crea barras adicionales solo si hacen falta"""
+        faltan = n - len(self.barras)
+        if faltan <= 0:
+            return
+
+        inicio = len(self.barras)
+        nuevas = self.ax.bar(
+            range(inicio, n),
+            [0] * faltan,
+            width=self.config["barras"]["ancho"],
+            color=self.config["colores"]["principal"],
+            edgecolor=self.config["barras"]["borde_color"],
+            linewidth=self.config["barras"]["borde_ancho"],
+            alpha=self.config["barras"]["transparencia"],
+            zorder=3,
+        )
+        self.barras.extend(nuevas.patches)
+
+    def _color_barra(self, etiqueta):
+        colores = self.config["colores"]
+        if not self.colorear_fin_semana:
+            return colores["principal"]
+        if etiqueta in DIAS_FIN_SEMANA:
+            return colores["destacado"]
+        return colores["secundario"]
+
+    def _actualizar(self, etiquetas, valores):
+        n = len(valores)
+        ancho = self.config["barras"]["ancho"]
+        self._asegurar_capacidad(n)
+
+        for i, barra in enumerate(self.barras):
+            if i < n:
+                barra.set_x(i - ancho / 2)
+                barra.set_height(valores[i])
+                barra.set_facecolor(self._color_barra(etiquetas[i]))
+                barra.set_visible(True)
+            else:
+                barra.set_visible(False)
+
+        if self.rotar_etiquetas:
+            self.ax.set_xticks(
+                range(n), etiquetas, rotation=45, ha="right", rotation_mode="anchor"
+            )
+        else:
+            self.ax.set_xticks(range(n), etiquetas)
+
+        # Después de los límites: el adelgazado depende del ancho por barra
+        self._ajustar_limites(n, ancho, valores)
+        self.etiquetas_valor.actualizar(range(n), valores)
+
+        if self.linea_promedio is not None:
+            promedio = sum(valores) / n
+            self.linea_promedio.set_ydata([promedio, promedio])
+            self.leyenda.get_texts()[0].set_text(f"Promedio: ${promedio:,.2f}")
+
+
+class PlantillaLinea(PlantillaGrafico):
+    """Gráfico de línea con marcadores, área sombreada y etiquetas de valor"""
+
+    def _construir(self):
+        colores = self.config["colores"]
+        lineas = self.config["lineas"]
+        self.etiquetas_valor = EtiquetasValor(
+            self.ax,
+            self.config,
+            self.config["fuentes"]["numeros"]["size"] - 1,
+            desplazamiento=12,
+            relleno=0.2,
+        )
+
+        (self.linea,) = self.ax.plot(
+            [],
+            [],
+            marker="o",
+            markersize=lineas["marcador_tamano"],
+            markerfacecolor=lineas["marcador_color"],
+            markeredgecolor=colores["principal"],
+            markeredgewidth=lineas["marcador_borde"],
+            linewidth=lineas["ancho"],
+            color=colores["principal"],
+            alpha=0.9,
+            zorder=3,
+            label="Ingresos Mensuales",
+        )
+        self.area = self.ax.fill_between(
+            [0, 1], [0, 0], alpha=0.2, color=colores["principal"], zorder=1
+        )
+
+        self.ax.grid(
+            True,
+            alpha=0.3,
+            color=colores["grid"],
+            linestyle="--",
+            linewidth=0.8,
+            zorder=0,
+        )
+        self.ax.legend(
+            fontsize=self.config["fuentes"]["leyenda"]["size"],
+            loc="upper left",
+            framealpha=0.9,
+        )
+
+    def _actualizar(self, etiquetas, valores):
+        n = len(valores)
+        posiciones = list(range(n))
+
+        self.linea.set_data(posiciones, valores)
+        self.area.set_data(posiciones, valores, 0)
+
+        self.ax.set_xticks(
+            range(n), etiquetas, rotation=45, ha="right", rotation_mode="anchor"
+        )
+
+        self._ajustar_limites(n, 0, valores)
+        self.etiquetas_valor.actualizar(posiciones, valores)
+
+
+class MotorGraficos:
+    """
+    Renderiza gráficos reutilizando plantillas, seguro entre hilos.
+
+    Cada plantilla se usa por un solo hilo a la vez: los hilos toman una
+    plantilla libre del tipo y moneda pedidos (o crean una nueva si no hay)
+    y la devuelven al terminar.
+    """
+
+    def __init__(self, config, max_plantillas=4):
+        self.config = config
+        self.max_plantillas = max_plantillas
+        self._libres = {}
+        self._lock = threading.Lock()
+
+    def renderizar(self, tipo, etiquetas, valores, moneda=None):
+        """
+        Renderiza un gráfico a PNG.
+
+        Args:
+            tipo (str): "semanal", "mensual", "diario" o "promedio_diario"
+            etiquetas (list): Etiquetas del eje X
+            valores (list): Valores a graficar
+            moneda (str): Moneda de los valores, para los títulos de los ejes
+                (None = la de origen)
+
+        Returns:
+            bytes: Imagen PNG
+        """
+        clave = (tipo, moneda or settings.MONEDAS_CONFIG["ORIGEN"])
+        plantilla = self._tomar(clave)
+        try:
+            return plantilla.renderizar(etiquetas, valores)
+        finally:
+            self._devolver(clave, plantilla)
+
+    def _tomar(self, clave):
+        with self._lock:
+            libres = self._libres.get(clave)
+            if libres:
+                return libres.pop()
+        return self._crear_plantilla(*clave)
+
+    def _devolver(self, clave, plantilla):
+        with self._lock:
+            libres = self._libres.setdefault(clave, [])
+            if len(libres) < self.max_plantillas:
+                libres.append(plantilla)
+
+    def _crear_plantilla(self, tipo, moneda):
+        config = self.config
+        textos = textos_grafico(tipo, moneda)
+
+        if tipo_base(tipo) == "semanal":
+            return PlantillaBarras(
+                config,
+                *textos,
+                rotar_etiquetas=True,
+                linea_promedio=tipo == "semanal",
+                bordes_finos=True,
+            )
+        if tipo in ("diario", "promedio_diario"):
+            return PlantillaBarras(
+                config,
+                *textos,
+                fuentes=fuentes_grandes(config),
+                tamano_etiquetas=20,
+                colorear_fin_semana=True,
+            )
+        return PlantillaLinea(config, *textos)
@@ -0,0 +1,127 @@
+# finanzas_app/services/muestreo.py
+"""
+Reducción de series largas para graficarlas sin perder su forma.
+
+Con el historial completo el gráfico semanal puede tener cientos de
+semanas. En lugar de cortar a las últimas N, se eligen los puntos que
+mejor conservan la forma de la serie (picos y valles):
+
+- ``lttb``: Largest-Triangle-Three-Buckets. En cada cubeta se elige el
+  punto que forma el triángulo de mayor área con el punto elegido antes y
+  el promedio de la cubeta siguiente.
+- ``minmax``: el mínimo y el máximo de cada cubeta.
+
+Ambos devuelven índices de puntos reales (no promedios), así que cada
+barra sigue mostrando una semana y su valor exactos. Los últimos puntos
+se conservan siempre sin reducir.
+
+NumPy se importa al reducir la primera serie.
+"""
+
+
+def lttb(valores, umbral):
+    """
+    Índices de ``umbral`` puntos elegidos con Largest-Triangle-Three-Buckets.
+
+    Args:
+        valores (list): Valores de la serie (eje X equiespaciado)
+        umbral (int): Cantidad de puntos a conservar
+
+    Returns:
+        numpy.ndarray: Índices crecientes; incluye el primero y el último
+    """
+    import numpy as np
+
+    y = np.asarray(valores, dtype=float)
+    n = len(y)
+    if umbral >= n or umbral < 3:
+        return np.arange(n) if umbral >= n else np.array([0, n - 1][:umbral])
+
+    x = np.arange(n, dtype=float)
+
+    # Cubetas para los puntos intermedios (el primero y el último se fijan);
+    # la "cubeta siguiente" de la última es el punto final
+    limites = np.append(np.linspace(1, n - 1, umbral - 1).astype(int), n)
+
+    indices = np.empty(umbral, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    anterior = 0
+    for i in range(umbral - 2):
+        inicio, fin = limites[i], limites[i + 1]
+        siguiente = slice(limites[i + 1], limites[i + 2])
+        promedio_x = x[siguiente].mean()
+        promedio_y = y[siguiente].mean()
+
+        # Área (doble) de los triángulos con todos los puntos de la cubeta
+        areas = np.abs(
+            (x[anterior] - promedio_x) * (y[inicio:fin] - y[anterior])
+            - (x[anterior] - x[inicio:fin]) * (promedio_y - y[anterior])
+        )
+        anterior = inicio + int(areas.argmax())
+        indices[i + 1] = anterior
+
+    return indices
+
+
+def minmax(valores, umbral):
+    """
+    Índices del mínimo y el máximo de cada cubeta (unos ``umbral`` puntos).
+
+    Totalmente vectorizado: no recorre las cubetas en Python.
+
+    Args:
+        valores (list): Valores de la serie
+        umbral (int): Cantidad aproximada de puntos a conservar
+
+    Returns:
+        numpy.ndarray: Índices crecientes, sin repetidos
+    """
+    import numpy as np
+
+    y = np.asarray(valores, dtype=float)
+    n = len(y)
+    cubetas = max(1, umbral // 2)
+    if umbral >= n:
+        return np.arange(n)
+
+    limites = np.linspace(0, n, cubetas + 1).astype(int)
+    cubeta = np.repeat(np.arange(cubetas), np.diff(limites))
+
+    # Ordenando por (cubeta, valor) el primero de cada cubeta es su mínimo
+    # y, ordenando por (cubeta, -valor), su máximo
+    minimos = np.lexsort((y, cubeta))[limites[:-1]]
+    maximos = np.lexsort((-y, cubeta))[limites[:-1]]
+    return np.unique(np.concatenate((minimos, maximos)))
+
+
+METODOS = {"lttb": lttb, "minmax": minmax}
+
+
+def reducir_serie(etiquetas, valores, max_puntos, recientes=0, metodo="lttb"):
+    """
+    Reduce una serie a ``max_puntos`` conservando intactos los últimos.
+
+    Args:
+        etiquetas (list): Etiquetas del eje X
+        valores (list): Valores de la serie
+        max_puntos (int): Puntos máximos del resultado
+        recientes (int): Últimos puntos que se muestran siempre, sin reducir
+        metodo (str): "lttb" o "minmax"
+
+    Returns:
+        tuple: (etiquetas, valores) reducidas, en orden cronológico
+    """
+    n = len(valores)
+    if n <= max_puntos:
+        return list(etiquetas), list(valores)
+    if metodo not in METODOS:
+        raise ValueError(f"Método de reducción desconocido: {metodo}")
+
+    recientes = min(recientes, max_puntos - 1)
+    corte = n - recientes
+    indices = METODOS[metodo](valores[:corte], max_puntos - recientes)
+
+    seleccion = [int(i) for i in indices] + list(range(corte, n))
+    return [etiquetas[i] for i in seleccion], [valores[i] for i in seleccion]
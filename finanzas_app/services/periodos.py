@@ -0,0 +1,172 @@
+# finanzas_app/services/periodos.py
+"""
+Ventanas de fechas (``desde``/``hasta``) para estadísticas, tablas y gráficos.
+
+Un ``Periodo`` se arma a partir de los parámetros de la URL:
+
+- ``?periodo=mes_actual``: desde el día 1 del mes en curso
+- ``?periodo=ultimas_semanas&semanas=N``: las últimas N semanas
+  (lunes a domingo), incluida la actual
+- ``?desde=AAAA-MM-DD&hasta=AAAA-MM-DD``: una ventana explícita (cualquiera
+  de los dos extremos se puede omitir)
+
+Sin parámetros (o con ``?periodo=todo``) el periodo es todo el historial.
+
+``?moneda=USD`` pide los montos convertidos con la tasa histórica de cada
+día (ver ``services/monedas.py``); viaja con el periodo para que los
+enlaces y las series de los gráficos la conserven.
+"""
+
+import datetime
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils import timezone
+
+from finanzas_app.services.monedas import hay_conversion, moneda_origen, validar_moneda
+
+SEMANAS_POR_DEFECTO = 4
+MAX_SEMANAS = 520
+
+PRESETS = {
+    "mes_actual": "Este mes",
+    "ultimas_semanas": "Últimas semanas",
+}
+
+
+class Periodo:
+    """Ventana de fechas, ambos extremos incluidos (None = sin límite)"""
+
+    def __init__(self, desde=None, hasta=None, preset=None, semanas=None, moneda=None):
+        if desde is not None and hasta is not None and desde > hasta:
+            raise ValueError("La fecha inicial es posterior a la final")
+        self.desde = desde
+        self.hasta = hasta
+        self.preset = preset
+        self.semanas = semanas
+        # None = moneda de origen, sin conversión
+        self.moneda = moneda if hay_conversion(moneda) else None
+
+    @property
+    def activo(self):
+        """True si el periodo limita las fechas"""
+        return self.desde is not None or self.hasta is not None
+
+    @property
+    def filtros(self):
+        """Argumentos ``desde``/``hasta`` para los servicios"""
+        return {"desde": self.desde, "hasta": self.hasta}
+
+    @property
+    def moneda_mostrada(self):
+        """Moneda de los montos (la de origen si no se pidió otra)"""
+        return self.moneda or moneda_origen()
+
+    @property
+    def monedas(self):
+        """Monedas que se pueden elegir"""
+        return settings.MONEDAS_CONFIG["DISPONIBLES"]
+
+    @property
+    def parametros(self):
+        """Parámetros de URL que reproducen este periodo (y su moneda)"""
+        parametros = {}
+        if self.preset == "ultimas_semanas":
+            parametros = {"periodo": self.preset, "semanas": self.semanas}
+        elif self.preset:
+            parametros = {"periodo": self.preset}
+        else:
+            if self.desde is not None:
+                parametros["desde"] = self.desde.isoformat()
+            if self.hasta is not None:
+                parametros["hasta"] = self.hasta.isoformat()
+        if self.moneda:
+            parametros["moneda"] = self.moneda
+        return parametros
+
+    @property
+    def consulta(self):
+        """Query string del periodo (sin "?"), para enlaces y peticiones"""
+        return urlencode(self.parametros)
+
+    @property
+    def descripcion(self):
+        if self.preset == "ultimas_semanas":
+            return f"Últimas {self.semanas} semanas"
+        if self.preset:
+            return PRESETS[self.preset]
+        if self.desde and self.hasta:
+            return f"Del {self.desde:%d/%m/%Y} al {self.hasta:%d/%m/%Y}"
+        if self.desde:
+            return f"Desde el {self.desde:%d/%m/%Y}"
+        if self.hasta:
+            return f"Hasta el {self.hasta:%d/%m/%Y}"
+        return "Todo el historial"
+
+    def __repr__(self):
+        return (
+            f"Periodo(desde={self.desde!r}, hasta={self.hasta!r}, "
+            f"moneda={self.moneda!r})"
+        )
+
+
+def _fecha(texto, nombre):
+    try:
+        return datetime.date.fromisoformat(texto)
+    except ValueError:
+        raise ValueError(f"Fecha no válida en '{nombre}': {texto}")
+
+
+def periodo_desde_parametros(parametros, hoy=None):
+    """
+    Arma el periodo pedido en los parámetros de una petición.
+
+    Args:
+        parametros (QueryDict | dict): Normalmente ``request.GET``
+        hoy (date): Fecha de referencia de los presets (por defecto, hoy)
+
+    Returns:
+        Periodo: Periodo pedido (todo el historial si no hay parámetros)
+
+    Raises:
+        ValueError: Si un parámetro no es válido
+    """
+    moneda = validar_moneda(parametros.get("moneda"))
+    periodo = _ventana(parametros, hoy or timezone.localdate())
+    periodo.moneda = moneda if hay_conversion(moneda) else None
+    return periodo
+
+
+def _ventana(parametros, hoy):
+    """Fechas (y preset) del periodo pedido"""
+    preset = parametros.get("periodo") or None
+
+    if preset == "todo":
+        return Periodo()
+
+    if preset is None:
+        desde = parametros.get("desde") or None
+        hasta = parametros.get("hasta") or None
+        return Periodo(
+            desde=_fecha(desde, "desde") if desde else None,
+            hasta=_fecha(hasta, "hasta") if hasta else None,
+        )
+
+    if preset == "mes_actual":
+        return Periodo(desde=hoy.replace(day=1), preset=preset)
+
+    if preset == "ultimas_semanas":
+        try:
+            semanas = int(parametros.get("semanas") or SEMANAS_POR_DEFECTO)
+        except ValueError:
+            raise ValueError("La cantidad de semanas debe ser un número")
+        if not 1 <= semanas <= MAX_SEMANAS:
+            raise ValueError(f"La cantidad de semanas debe estar entre 1 y {MAX_SEMANAS}")
+        lunes = hoy - datetime.timedelta(days=hoy.weekday())
+        return Periodo(
+            desde=lunes - datetime.timedelta(weeks=semanas - 1),
+            preset=preset,
+            semanas=semanas,
+        )
+
+    raise ValueError(f"Periodo desconocido: {preset}")
@@ -0,0 +1,119 @@
+# finanzas_app/services/pool_graficos.py
+"""
+Renderizado de gráficos en paralelo con un pool de procesos acotado.
+
+Los gráficos del dashboard son independientes entre sí, así que se pueden
+rasterizar a la vez en procesos distintos. La latencia pasa a ser la del
+gráfico más lento en lugar de la suma de todos.
+
+Si el pool no está disponible (desactivado, roto o sin permisos para crear
+procesos) se renderiza en serie dentro del propio proceso.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturoTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _inicializar_proceso():
+    """Importa Matplotlib una sola vez por proceso del pool"""
+    import matplotlib.figure  # noqa: F401
+    from matplotlib.backends import backend_agg  # noqa: F401
+
+
+def _renderizar_trabajo(tipo, datos, moneda=None):
+    """
+    Renderiza un gráfico y sus variantes (se ejecuta dentro del proceso hijo).
+
+    La codificación de las variantes (WebP, PNG con paleta, varios anchos)
+    también se reparte entre los procesos.
+    """
+    from finanzas_app.services.dashboard_service import GeneradorGraficos
+    from finanzas_app.services.variantes_graficos import generar_variantes
+
+    png = GeneradorGraficos.renderizar(tipo, datos, moneda=moneda)
+    if png is None:
+        return None
+    return generar_variantes(png)
+
+
+def obtener_pool():
+    """
+    Devuelve el pool compartido, creándolo la primera vez.
+
+    Returns:
+        ProcessPoolExecutor | None: None si el modo paralelo está desactivado
+    """
+    global _pool
+
+    procesos = settings.GRAFICOS_CONFIG["PROCESOS_RENDER"]
+    if procesos <= 1:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" evita heredar locks de los hilos del servidor web
+            _pool = ProcessPoolExecutor(
+                max_workers=procesos,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_inicializar_proceso,
+            )
+    return _pool
+
+
+def _descartar_pool():
+    """Cierra el pool actual para que se cree uno nuevo en el próximo uso"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def renderizar_lote(trabajos, moneda=None):
+    """
+    Renderiza varios gráficos, en paralelo cuando es posible.
+
+    Args:
+        trabajos (dict): nombre -> (tipo, datos)
+        moneda (str): Moneda de los montos (None = la de origen)
+
+    Returns:
+        dict: nombre -> lista de ``Variante`` (o None si no había datos)
+    """
+    resultados = {}
+    pendientes = dict(trabajos)
+
+    pool = obtener_pool() if len(trabajos) > 1 else None
+    if pool is not None:
+        timeout = settings.GRAFICOS_CONFIG["TIMEOUT_RENDER"]
+        try:
+            futuros = {
+                nombre: pool.submit(_renderizar_trabajo, tipo, datos, moneda)
+                for nombre, (tipo, datos) in trabajos.items()
+            }
+            for nombre, futuro in futuros.items():
+                resultados[nombre] = futuro.result(timeout=timeout)
+                del pendientes[nombre]
+        except (BrokenProcessPool, FuturoTimeoutError, OSError, RuntimeError) as e:
+            logger.warning(
+                "Pool de gráficos no disponible, renderizando en serie: %s", e
+            )
+            _descartar_pool()
+
+    # Modo serie (o lo que el pool no llegó a terminar)
+    for nombre, (tipo, datos) in pendientes.items():
+        resultados[nombre] = _renderizar_trabajo(tipo, datos, moneda)
+
+    return resultados
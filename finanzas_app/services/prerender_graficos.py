@@ -0,0 +1,147 @@
+# finanzas_app/services/prerender_graficos.py
+"""
+Pre-renderizado de los gráficos del dashboard en segundo plano.
+
+Cuando cambia una recaudación, los gráficos se vuelven a generar en un hilo
+aparte para que el siguiente visitante del dashboard los encuentre ya en la
+caché. Los cambios se agrupan (debounce): una ráfaga de altas o ediciones
+dispara un único renderizado cuando pasan ``PRERENDER_ESPERA`` segundos sin
+cambios nuevos.
+
+Durante una importación masiva (``importacion_masiva()``) no se programa
+nada por fila; al terminar se invalida la caché de estadísticas y se
+renderiza una sola vez.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from finanzas_app.services.cache_estadisticas import incrementar_version
+
+logger = logging.getLogger(__name__)
+
+_temporizador = None
+_estado_lock = threading.Lock()
+_render_lock = threading.Lock()
+_importaciones_activas = 0
+_cambios_durante_importacion = False
+
+
+def prerenderizar_dashboard():
+    """
+    Calcula las estadísticas y deja en caché los gráficos del dashboard.
+
+    Es lo mismo que hace ``dashboard_views.index``; como las claves de la
+    caché son huellas de los datos, la vista encuentra las imágenes ya
+    generadas.
+    """
+    from finanzas_app.services.dashboard_service import GeneradorGraficos
+    from finanzas_app.services.estadisticas_service import EstadisticaService
+
+    historial_completo = settings.GRAFICOS_CONFIG["HISTORIAL"]["MODO"] == "completo"
+
+    # Un solo renderizado a la vez; si llega otro cambio se encola detrás
+    with _render_lock:
+        resumen = EstadisticaService.obtener_resumen_dashboard(ultimos=0)
+        GeneradorGraficos.obtener_graficos_dashboard(
+            resumen["por_semana"],
+            resumen["por_mes"],
+            resumen["por_dia_semana"],
+            historial_completo=historial_completo,
+        )
+
+
+def _ejecutar_programado():
+    global _temporizador
+
+    with _estado_lock:
+        _temporizador = None
+
+    try:
+        prerenderizar_dashboard()
+    except Exception:
+        logger.exception("Error pre-renderizando los gráficos del dashboard")
+    finally:
+        # Este hilo abrió sus propias conexiones a la base de datos
+        connections.close_all()
+
+
+def programar_prerenderizado():
+    """
+    Programa un pre-renderizado, reiniciando la espera si ya había uno.
+
+    Se llama desde las señales de ``Recaudacion`` después del commit.
+    """
+    global _temporizador, _cambios_durante_importacion
+
+    config = settings.GRAFICOS_CONFIG
+    if not config["PRERENDER"]:
+        return
+
+    with _estado_lock:
+        if _importaciones_activas:
+            _cambios_durante_importacion = True
+            return
+
+        if _temporizador is not None:
+            _temporizador.cancel()
+        _temporizador = threading.Timer(
+            config["PRERENDER_ESPERA"], _ejecutar_programado
+        )
+        _temporizador.daemon = True
+        _temporizador.start()
+
+
+def cancelar_prerenderizado():
+    """Cancela el pre-renderizado pendiente, si lo hay"""
+    global _temporizador
+
+    with _estado_lock:
+        if _temporizador is not None:
+            _temporizador.cancel()
+            _temporizador = None
+
+
+@contextmanager
+def importacion_masiva():
+    """
+    Agrupa todos los cambios de un bloque en un único renderizado.
+
+    Al salir se invalida la caché de estadísticas y, si hubo cambios, se
+    renderiza de forma síncrona (lo que deja calculadas las estadísticas de
+    la nueva versión de los datos): los comandos de gestión terminan el
+    proceso enseguida y un hilo en segundo plano no llegaría a completar su
+    trabajo.
+
+    Example:
+        with importacion_masiva():
+            for fila in filas:
+                Recaudacion.objects.create(...)
+    """
+    global _importaciones_activas, _cambios_durante_importacion
+
+    with _estado_lock:
+        _importaciones_activas += 1
+
+    try:
+        yield
+    finally:
+        with _estado_lock:
+            _importaciones_activas -= 1
+            renderizar = (
+                _importaciones_activas == 0 and _cambios_durante_importacion
+            )
+            if renderizar:
+                _cambios_durante_importacion = False
+
+        incrementar_version()
+        if renderizar and settings.GRAFICOS_CONFIG["PRERENDER"]:
+            cancelar_prerenderizado()
+            try:
+                prerenderizar_dashboard()
+            except Exception:
+                logger.exception("Error pre-renderizando los gráficos del dashboard")
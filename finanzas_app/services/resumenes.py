@@ -0,0 +1,377 @@
+# finanzas_app/services/resumenes.py
+"""
+Mantenimiento de los resúmenes materializados de recaudaciones.
+
+``ResumenSemana``, ``ResumenMes``, ``ResumenDiaSemana``, ``CubetaDiaSemana``
+y ``ResumenGeneral`` guardan los totales ya agrupados. No se recalculan desde
+las recaudaciones: cada alta, edición o borrado de una ``Recaudacion``
+aplica solo su diferencia (delta) a los grupos que toca, así que el costo
+no depende del largo del historial.
+
+Las señales de ``Recaudacion`` llaman a ``ResumenService.aplicar``. Las
+operaciones que no disparan señales (``QuerySet.update``,
+``bulk_create``, cambios directos en la base de datos) dejan los
+resúmenes desactualizados; para esos casos está
+``manage.py reconstruir_resumenes``.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum, Value
+from django.db.models.functions import Greatest, Least
+
+from finanzas_app.dinero import a_centavos, a_decimal
+from finanzas_app.models.campos import CentavosField
+from finanzas_app.models.ingresos import Recaudacion
+from finanzas_app.models.resumenes import (
+    CubetaDiaSemana,
+    ResumenDiaSemana,
+    ResumenGeneral,
+    ResumenMes,
+    ResumenSemana,
+)
+from finanzas_app.services.distribucion import indice_cubeta
+from finanzas_app.services.estimacion import dia_tendencia
+
+CAMPOS_MOVIMIENTO = ("pk", "fecha", "numero_semana", "monto")
+
+
+class ResumenService:
+    @staticmethod
+    def capturar(instancia):
+        """
+        Estado guardado de una recaudación antes de modificarla.
+
+        Returns:
+            dict: ``pk``, ``fecha``, ``numero_semana`` y ``monto`` tal como
+                están en la base de datos, o None si todavía no existe
+        """
+        if instancia.pk is None:
+            return None
+        return (
+            Recaudacion.objects.filter(pk=instancia.pk)
+            .values(*CAMPOS_MOVIMIENTO)
+            .first()
+        )
+
+    @staticmethod
+    def movimiento(instancia):
+        """Estado actual de una instancia, con la forma de ``capturar``"""
+        estado = {campo: getattr(instancia, campo) for campo in CAMPOS_MOVIMIENTO}
+        # El monto puede venir como float o texto (p. ej. desde importar_sheets)
+        estado["monto"] = a_decimal(estado["monto"])
+        return estado
+
+    @classmethod
+    def aplicar(cls, anterior, actual):
+        """
+        Aplica a los resúmenes el cambio de una recaudación.
+
+        Args:
+            anterior (dict): Estado antes del cambio (None en un alta)
+            actual (dict): Estado después del cambio (None en un borrado)
+        """
+        if anterior == actual:
+            return
+
+        # Deltas netos por grupo: una edición dentro del mismo grupo es una
+        # sola actualización, no un borrado seguido de un alta
+        semanas, meses, dias, cubetas = {}, {}, {}, {}
+        for estado, signo in ((anterior, -1), (actual, 1)):
+            if estado is None:
+                continue
+            fecha = estado["fecha"]
+            monto = signo * estado["monto"]
+            for grupos, clave in (
+                (semanas, estado["numero_semana"]),
+                (meses, (fecha.year, fecha.month)),
+            ):
+                total, cantidad = grupos.get(clave, (0, 0))
+                grupos[clave] = (total + monto, cantidad + signo)
+
+            centavos = a_centavos(estado["monto"])
+            cls._acumular(
+                dias,
+                fecha.weekday(),
+                signo,
+                monto,
+                **ResumenService.sumas_tendencia(fecha, centavos),
+            )
+            cls._acumular(
+                cubetas,
+                (fecha.year, fecha.weekday(), indice_cubeta(centavos)),
+                signo,
+                monto,
+                cuadrados=centavos**2,
+            )
+
+        with transaction.atomic():
+            cls._aplicar_semanas(semanas, anterior, actual)
+            for (anno, mes), delta in meses.items():
+                cls._sumar(ResumenMes, {"anno": anno, "mes": mes}, *delta)
+            for dia, (total, cantidad, acumulados) in dias.items():
+                cls._sumar(
+                    ResumenDiaSemana, {"dia": dia}, total, cantidad, acumulados
+                )
+            for (anno, dia, indice), (total, cantidad, acumulados) in cubetas.items():
+                cls._sumar(
+                    CubetaDiaSemana,
+                    {"anno": anno, "dia": dia, "indice": indice},
+                    total,
+                    cantidad,
+                    acumulados,
+                )
+            cls._aplicar_general(anterior, actual)
+
+    @staticmethod
+    def _acumular(grupos, clave, signo, monto, **sumas):
+        """Suma a ``grupos[clave]`` (total, cantidad, otras sumas) un registro"""
+        total, cantidad, acumulados = grupos.get(clave, (0, 0, {}))
+        for campo, valor in sumas.items():
+            acumulados[campo] = acumulados.get(campo, 0) + signo * valor
+        grupos[clave] = (total + monto, cantidad + signo, acumulados)
+
+    @staticmethod
+    def sumas_tendencia(fecha, centavos):
+        """
+        Aporte de un registro a las sumas del modelo de estimación que
+        guarda ``ResumenDiaSemana`` (``t`` en días, montos en centavos)
+        """
+        t = dia_tendencia(fecha)
+        return {
+            "suma_t": t,
+            "suma_t2": t * t,
+            "suma_ty": t * centavos,
+            "cuadrados": centavos**2,
+        }
+
+    @staticmethod
+    def _sumar(modelo, clave, total, cantidad, acumulados=None, **extra):
+        """
+        Suma un delta a un grupo; lo crea si no existe y lo borra si queda vacío.
+
+        ``acumulados`` son otras columnas que se suman como ``total`` y
+        ``dias``; ``extra``, valores o expresiones que solo se actualizan.
+        """
+        acumulados = acumulados or {}
+        if not total and not cantidad and not any(acumulados.values()):
+            return
+        # El delta se envía en centavos, como la columna
+        delta = Value(total, output_field=CentavosField())
+        actualizadas = modelo.objects.filter(**clave).update(
+            total=F("total") + delta,
+            dias=F("dias") + cantidad,
+            **{campo: F(campo) + valor for campo, valor in acumulados.items()},
+            **extra,
+        )
+        if not actualizadas:
+            modelo.objects.create(**clave, total=total, dias=cantidad, **acumulados)
+        elif cantidad < 0:
+            modelo.objects.filter(**clave, dias=0).delete()
+
+    @classmethod
+    def _aplicar_semanas(cls, semanas, anterior, actual):
+        for semana, (total, cantidad) in semanas.items():
+            clave = {"numero_semana": semana}
+            if actual is not None and actual["numero_semana"] == semana:
+                fecha = actual["fecha"]
+                # La fila se crea vacía (``numero_semana`` es único: dos altas
+                # a la vez en una semana nueva no la duplican) y el delta se
+                # suma siempre con F()
+                ResumenSemana.objects.get_or_create(
+                    **clave,
+                    defaults={
+                        "total": 0,
+                        "dias": 0,
+                        "fecha_inicio": fecha,
+                        "fecha_fin": fecha,
+                    },
+                )
+                extra = {
+                    "fecha_inicio": Least(F("fecha_inicio"), fecha),
+                    "fecha_fin": Greatest(F("fecha_fin"), fecha),
+                }
+            else:
+                extra = {}
+            cls._sumar(ResumenSemana, clave, total, cantidad, **extra)
+
+        # Si salió una fecha de una semana que sigue existiendo, su rango
+        # puede haberse achicado
+        if anterior is not None:
+            semana = anterior["numero_semana"]
+            rango = Recaudacion.objects.filter(numero_semana=semana).aggregate(
+                inicio=Min("fecha"), fin=Max("fecha")
+            )
+            if rango["inicio"] is not None:
+                ResumenSemana.objects.filter(numero_semana=semana).update(
+                    fecha_inicio=rango["inicio"], fecha_fin=rango["fin"]
+                )
+
+    @staticmethod
+    def _aplicar_general(anterior, actual):
+        general, _ = ResumenGeneral.objects.select_for_update().get_or_create(pk=1)
+        if anterior is not None:
+            general.total -= anterior["monto"]
+            general.dias -= 1
+        if actual is not None:
+            general.total += actual["monto"]
+            general.dias += 1
+
+        # El mejor y el peor día solo se buscan en la tabla si el registro
+        # que lo era cambió o se borró; un alta se compara directamente
+        pk_anterior = anterior["pk"] if anterior is not None else None
+        for campo, orden in (("mejor_dia", "-monto"), ("peor_dia", "monto")):
+            id_actual = getattr(general, f"{campo}_id")
+            if id_actual is None or id_actual == pk_anterior:
+                extremo = (
+                    Recaudacion.objects.order_by(orden, "fecha", "id")
+                    .values_list("pk", flat=True)
+                    .first()
+                )
+                setattr(general, f"{campo}_id", extremo)
+            elif actual is not None:
+                candidato = getattr(general, campo)
+                if campo == "mejor_dia":
+                    supera = actual["monto"] > candidato.monto
+                else:
+                    supera = actual["monto"] < candidato.monto
+                empate = actual["monto"] == candidato.monto and (
+                    actual["fecha"],
+                    actual["pk"],
+                ) < (candidato.fecha, candidato.pk)
+                if supera or empate:
+                    setattr(general, f"{campo}_id", actual["pk"])
+        general.save()
+
+    @staticmethod
+    def reconstruir():
+        """
+        Recalcula todos los resúmenes desde las recaudaciones.
+
+        Returns:
+            dict: Cantidad de filas creadas por modelo
+        """
+        recaudaciones = Recaudacion.objects.order_by()
+        semanas = [
+            ResumenSemana(
+                numero_semana=fila["numero_semana"],
+                total=fila["total"],
+                dias=fila["dias"],
+                fecha_inicio=fila["inicio"],
+                fecha_fin=fila["fin"],
+            )
+            for fila in recaudaciones.values("numero_semana").annotate(
+                total=Sum("monto"),
+                dias=Count("id"),
+                inicio=Min("fecha"),
+                fin=Max("fecha"),
+            )
+        ]
+        meses = [
+            ResumenMes(
+                anno=fila["fecha__year"],
+                mes=fila["fecha__month"],
+                total=fila["total"],
+                dias=fila["dias"],
+            )
+            for fila in recaudaciones.values("fecha__year", "fecha__month").annotate(
+                total=Sum("monto"), dias=Count("id")
+            )
+        ]
+        dias = [
+            ResumenDiaSemana(dia=dia, total=total, dias=cantidad, **sumas)
+            for dia, (total, cantidad, sumas) in (
+                ResumenService.dias_semana(recaudaciones).items()
+            )
+        ]
+        cubetas = [
+            CubetaDiaSemana(
+                anno=anno,
+                dia=dia,
+                indice=indice,
+                total=total,
+                dias=cantidad,
+                cuadrados=cuadrados,
+            )
+            for (anno, dia, indice), (total, cantidad, cuadrados) in (
+                ResumenService.cubetas(recaudaciones).items()
+            )
+        ]
+        totales = recaudaciones.aggregate(total=Sum("monto"), dias=Count("id"))
+
+        with transaction.atomic():
+            for modelo in (
+                ResumenSemana,
+                ResumenMes,
+                ResumenDiaSemana,
+                CubetaDiaSemana,
+                ResumenGeneral,
+            ):
+                modelo.objects.all().delete()
+            ResumenSemana.objects.bulk_create(semanas)
+            ResumenMes.objects.bulk_create(meses)
+            ResumenDiaSemana.objects.bulk_create(dias)
+            CubetaDiaSemana.objects.bulk_create(cubetas)
+            ResumenGeneral.objects.create(
+                pk=1,
+                total=totales["total"] or 0,
+                dias=totales["dias"],
+                mejor_dia_id=recaudaciones.order_by("-monto", "fecha", "id")
+                .values_list("pk", flat=True)
+                .first(),
+                peor_dia_id=recaudaciones.order_by("monto", "fecha", "id")
+                .values_list("pk", flat=True)
+                .first(),
+            )
+
+        return {
+            "semanas": len(semanas),
+            "meses": len(meses),
+            "dias_semana": len(dias),
+            "cubetas": len(cubetas),
+        }
+
+    @staticmethod
+    def cubetas(recaudaciones):
+        """
+        Agrupa recaudaciones por año, día de la semana y cubeta de monto.
+
+        La cubeta es un logaritmo del monto que la base de datos no calcula
+        de forma portable, así que se agrupa en Python.
+
+        Args:
+            recaudaciones (QuerySet): Recaudaciones a agrupar
+
+        Returns:
+            dict: (año, día, cubeta) -> (total, cantidad, suma de cuadrados
+                en centavos²)
+        """
+        grupos = {}
+        for fecha, monto in recaudaciones.values_list("fecha", "monto").iterator():
+            centavos = a_centavos(monto)
+            clave = (fecha.year, fecha.weekday(), indice_cubeta(centavos))
+            total, cantidad, cuadrados = grupos.get(clave, (0, 0, 0))
+            grupos[clave] = (total + monto, cantidad + 1, cuadrados + centavos**2)
+        return grupos
+
+    @staticmethod
+    def dias_semana(recaudaciones):
+        """
+        Agrupa recaudaciones por día de la semana, con las sumas del modelo
+        de estimación (ver ``sumas_tendencia``).
+
+        Args:
+            recaudaciones (QuerySet): Recaudaciones a agrupar
+
+        Returns:
+            dict: día (0 = lunes) -> (total, cantidad, sumas)
+        """
+        grupos = {}
+        for fecha, monto in recaudaciones.values_list("fecha", "monto").iterator():
+            ResumenService._acumular(
+                grupos,
+                fecha.weekday(),
+                1,
+                monto,
+                **ResumenService.sumas_tendencia(fecha, a_centavos(monto)),
+            )
+        return grupos
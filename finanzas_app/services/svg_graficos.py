@@ -0,0 +1,309 @@
+# finanzas_app/services/svg_graficos.py
+"""
+Renderizador SVG directo para los gráficos simples del dashboard.
+
+Los gráficos de barras por día de la semana, el semanal y la línea mensual
+tienen pocos elementos (7-30 barras, etiquetas y una línea de promedio).
+Este módulo escribe el SVG a mano con la paleta y fuentes de
+``CONFIG_GRAFICOS``, sin pasar por Matplotlib ni por la codificación PNG:
+tarda menos de un milisegundo y ocupa unos pocos KB.
+
+Es opcional (``GRAFICOS_CONFIG["FORMATO"] = "svg"``). Los historiales
+completos y las series de más de ``MAX_PUNTOS`` puntos se siguen dibujando
+con Matplotlib.
+"""
+
+import math
+from html import escape
+
+from finanzas_app.services.motor_graficos import (
+    DIAS_FIN_SEMANA,
+    textos_grafico,
+    tipo_base,
+)
+
+# Fuentes parecidas a DejaVu Sans (la de Matplotlib) en el navegador
+FAMILIA_FUENTE = "'DejaVu Sans', 'Segoe UI', Verdana, sans-serif"
+
+
+def _numero(valor):
+    """Formatea una coordenada con un decimal como máximo"""
+    texto = f"{valor:.1f}"
+    return texto[:-2] if texto.endswith(".0") else texto
+
+
+def _marcas_eje(maximo, cantidad=5):
+    """
+    Calcula marcas "redondas" para el eje Y (1, 2, 2.5, 5 x 10^n).
+
+    Args:
+        maximo (float): Valor máximo a cubrir
+        cantidad (int): Número aproximado de marcas
+
+    Returns:
+        list: Valores de las marcas, desde 0
+    """
+    if maximo <= 0:
+        return [0, 1]
+
+    bruto = maximo / cantidad
+    magnitud = 10 ** math.floor(math.log10(bruto))
+    for factor in (1, 2, 2.5, 5, 10):
+        paso = factor * magnitud
+        if paso >= bruto:
+            break
+
+    marcas = []
+    valor = 0.0
+    while valor < maximo + paso:
+        marcas.append(valor)
+        valor += paso
+    return marcas
+
+
+class RenderizadorSVG:
+    """
+    Genera SVG compactos a partir de etiquetas y valores ya preparados.
+
+    Usa las mismas series que los generadores de Matplotlib
+    (``GeneradorGraficos.preparar_serie``), así que ambos backends muestran
+    los mismos datos.
+    """
+
+    TIPOS_SOPORTADOS = {"semanal", "mensual", "diario", "promedio_diario"}
+    MAX_PUNTOS = 30
+
+    ANCHO = 840
+    ALTO = 480
+
+    def __init__(self, config):
+        self.config = config
+
+    def soporta(self, tipo, cantidad):
+        """Indica si el gráfico se puede dibujar con el camino rápido"""
+        return tipo in self.TIPOS_SOPORTADOS and 0 < cantidad <= self.MAX_PUNTOS
+
+    def renderizar(self, tipo, etiquetas, valores, moneda=None):
+        """
+        Dibuja el gráfico como SVG.
+
+        Args:
+            tipo (str): Tipo de gráfico
+            etiquetas (list): Etiquetas del eje X
+            valores (list): Valores numéricos
+            moneda (str): Moneda de los valores (None = la de origen)
+
+        Returns:
+            bytes: Documento SVG en UTF-8
+        """
+        if not self.soporta(tipo, len(valores)):
+            raise ValueError(f"El renderizador SVG no soporta el gráfico: {tipo}")
+
+        valores = [float(v) for v in valores]
+        titulo, eje_x, eje_y = textos_grafico(tipo, moneda)
+        base = tipo_base(tipo)
+        rotar = base in ("semanal", "mensual")
+
+        # Área de dibujo
+        izquierda = 90
+        derecha = self.ANCHO - 20
+        arriba = 60
+        abajo = self.ALTO - (95 if rotar else 70)
+
+        marcas = _marcas_eje(max(valores))
+        tope = marcas[-1] or 1
+        escala_y = (abajo - arriba) / tope
+        paso_x = (derecha - izquierda) / len(valores)
+
+        def y(valor):
+            return abajo - valor * escala_y
+
+        def x(indice):
+            return izquierda + paso_x * (indice + 0.5)
+
+        partes = [self._cabecera(titulo)]
+        partes.append(self._eje_y(marcas, izquierda, derecha, y))
+
+        if base == "mensual":
+            partes.append(self._linea(valores, x, y, abajo))
+        else:
+            partes.append(self._barras(base, etiquetas, valores, x, y, paso_x))
+
+        partes.append(self._etiquetas_valor(valores, x, y, base, paso_x))
+        partes.append(self._eje_x(etiquetas, x, abajo, rotar))
+
+        if tipo == "semanal":
+            partes.append(self._promedio(valores, izquierda, derecha, y))
+
+        # Títulos de los ejes
+        fuente_ejes = self.config["fuentes"]["ejes"]
+        partes.append(
+            f'<text x="{_numero((izquierda + derecha) / 2)}" y="{self.ALTO - 10}" '
+            f'text-anchor="middle" font-size="{fuente_ejes["size"]}" '
+            f'font-weight="{fuente_ejes["weight"]}">{escape(eje_x)}</text>'
+            f'<text transform="translate(20 {_numero((arriba + abajo) / 2)}) '
+            f'rotate(-90)" text-anchor="middle" font-size="{fuente_ejes["size"]}" '
+            f'font-weight="{fuente_ejes["weight"]}">{escape(eje_y)}</text>'
+        )
+
+        partes.append("</svg>")
+        return "".join(partes).encode("utf-8")
+
+    # ------------------------------------------------------------------
+    # Elementos
+    # ------------------------------------------------------------------
+
+    def _cabecera(self, titulo):
+        colores = self.config["colores"]
+        fuente_titulo = self.config["fuentes"]["titulo"]
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="0 0 {self.ANCHO} {self.ALTO}" '
+            f'font-family="{FAMILIA_FUENTE}" fill="{colores["texto"]}">'
+            f'<rect width="100%" height="100%" fill="{colores["fondo"]}"/>'
+            f'<text x="{self.ANCHO / 2:.0f}" y="32" text-anchor="middle" '
+            f'font-size="{fuente_titulo["size"]}" '
+            f'font-weight="{fuente_titulo["weight"]}">{escape(titulo)}</text>'
+        )
+
+    def _eje_y(self, marcas, izquierda, derecha, y):
+        colores = self.config["colores"]
+        tamano = self.config["fuentes"]["etiquetas"]["size"]
+        partes = [
+            f'<g stroke="{colores["neutro"]}" stroke-opacity="0.3" '
+            f'stroke-dasharray="4 3">'
+        ]
+        for marca in marcas[1:]:
+            partes.append(
+                f'<line x1="{izquierda}" x2="{derecha}" '
+                f'y1="{_numero(y(marca))}" y2="{_numero(y(marca))}"/>'
+            )
+        partes.append(f'</g><g font-size="{tamano}" text-anchor="end">')
+        for marca in marcas:
+            partes.append(
+                f'<text x="{izquierda - 8}" y="{_numero(y(marca) + 4)}">'
+                f"{marca:,.0f}</text>"
+            )
+        partes.append(
+            f'</g><line x1="{izquierda}" x2="{derecha}" y1="{_numero(y(0))}" '
+            f'y2="{_numero(y(0))}" stroke="{colores["texto"]}" stroke-width="0.5"/>'
+        )
+        return "".join(partes)
+
+    def _barras(self, tipo, etiquetas, valores, x, y, paso_x):
+        colores = self.config["colores"]
+        barras = self.config["barras"]
+        ancho = paso_x * barras["ancho"]
+
+        partes = [
+            f'<g stroke="{barras["borde_color"]}" '
+            f'stroke-width="{barras["borde_ancho"]}" '
+            f'fill-opacity="{barras["transparencia"]}">'
+        ]
+        for i, valor in enumerate(valores):
+            if tipo == "semanal":
+                color = colores["principal"]
+            elif etiquetas[i] in DIAS_FIN_SEMANA:
+                color = colores["destacado"]
+            else:
+                color = colores["secundario"]
+            partes.append(
+                f'<rect x="{_numero(x(i) - ancho / 2)}" y="{_numero(y(valor))}" '
+                f'width="{_numero(ancho)}" height="{_numero(y(0) - y(valor))}" '
+                f'rx="2" fill="{color}"/>'
+            )
+        partes.append("</g>")
+        return "".join(partes)
+
+    def _linea(self, valores, x, y, abajo):
+        colores = self.config["colores"]
+        lineas = self.config["lineas"]
+        puntos = " ".join(
+            f"{_numero(x(i))},{_numero(y(v))}" for i, v in enumerate(valores)
+        )
+        area = (
+            f"{_numero(x(0))},{_numero(abajo)} {puntos} "
+            f"{_numero(x(len(valores) - 1))},{_numero(abajo)}"
+        )
+        marcadores = "".join(
+            f'<circle cx="{_numero(x(i))}" cy="{_numero(y(v))}" '
+            f'r="{lineas["marcador_tamano"] / 2}"/>'
+            for i, v in enumerate(valores)
+        )
+        return (
+            f'<polygon points="{area}" fill="{colores["principal"]}" '
+            f'fill-opacity="0.2"/>'
+            f'<polyline points="{puntos}" fill="none" '
+            f'stroke="{colores["principal"]}" stroke-width="{lineas["ancho"]}" '
+            f'stroke-linejoin="round"/>'
+            f'<g fill="{lineas["marcador_color"]}" stroke="{colores["principal"]}" '
+            f'stroke-width="{lineas["marcador_borde"]}">{marcadores}</g>'
+        )
+
+    def _etiquetas_valor(self, valores, x, y, tipo, paso_x):
+        fuente = self.config["fuentes"]["numeros"]
+        opciones = self.config["etiquetas_valor"]
+        tamano = fuente["size"] if tipo in ("semanal", "mensual") else 16
+        if len(valores) > 20:
+            tamano -= 2
+
+        # Igual que en Matplotlib: una de cada N si no caben (siempre la última)
+        paso = 1
+        if opciones["adelgazar"]:
+            texto_mas_largo = max(len(f"${v:,.0f}") for v in valores)
+            necesario = (
+                texto_mas_largo * tamano * 0.62 + 6 + opciones["separacion_minima"]
+            )
+            paso = max(1, math.ceil(necesario / paso_x))
+
+        partes = [
+            f'<g font-size="{tamano}" font-weight="{fuente["weight"]}" '
+            f'text-anchor="middle">'
+        ]
+        for i, valor in enumerate(valores):
+            if valor <= 0 or (len(valores) - 1 - i) % paso:
+                continue
+            texto = f"${valor:,.0f}"
+            ancho = len(texto) * tamano * 0.62 + 6
+            base = y(valor) - 6
+            partes.append(
+                f'<rect x="{_numero(x(i) - ancho / 2)}" '
+                f'y="{_numero(base - tamano - 2)}" width="{_numero(ancho)}" '
+                f'height="{tamano + 5}" rx="3" fill="#fff" fill-opacity="0.9" '
+                f'stroke="{self.config["colores"]["grid"]}"/>'
+                f'<text x="{_numero(x(i))}" y="{_numero(base)}">{texto}</text>'
+            )
+        partes.append("</g>")
+        return "".join(partes)
+
+    def _eje_x(self, etiquetas, x, abajo, rotar):
+        tamano = self.config["fuentes"]["etiquetas"]["size"]
+        if not rotar:
+            tamano += 2
+        partes = [f'<g font-size="{tamano}">']
+        for i, etiqueta in enumerate(etiquetas):
+            if rotar:
+                partes.append(
+                    f'<text text-anchor="end" transform="translate('
+                    f'{_numero(x(i))} {abajo + 14}) rotate(-45)">'
+                    f"{escape(etiqueta)}</text>"
+                )
+            else:
+                partes.append(
+                    f'<text x="{_numero(x(i))}" y="{abajo + 22}" '
+                    f'text-anchor="middle">{escape(etiqueta)}</text>'
+                )
+        partes.append("</g>")
+        return "".join(partes)
+
+    def _promedio(self, valores, izquierda, derecha, y):
+        colores = self.config["colores"]
+        tamano = self.config["fuentes"]["leyenda"]["size"]
+        promedio = sum(valores) / len(valores)
+        return (
+            f'<line x1="{izquierda}" x2="{derecha}" y1="{_numero(y(promedio))}" '
+            f'y2="{_numero(y(promedio))}" stroke="{colores["acento"]}" '
+            f'stroke-width="2" stroke-dasharray="8 4" stroke-opacity="0.7"/>'
+            f'<text x="{derecha}" y="52" text-anchor="end" font-size="{tamano}" '
+            f'fill="{colores["acento"]}">Promedio: ${promedio:,.2f}</text>'
+        )
@@ -9,6 +9,30 @@ from decimal import Decimal
 import datetime
 from collections import OrderedDict
 
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import ExtractWeekDay, TruncMonth
+
+from finanzas_app.dinero import desde_centavos
+from finanzas_app.models.ingresos import Recaudacion
+from finanzas_app.models.resumenes import (
+    ResumenDiaSemana,
+    ResumenGeneral,
+    ResumenSemana,
+)
+from finanzas_app.services.agregaciones import (
+    NOMBRES_DIAS,
+    NOMBRES_MESES,
+    promedio,
+    recaudaciones,
+)
+from finanzas_app.services.cache_estadisticas import cacheado
+from finanzas_app.services.estadisticas_service import EstadisticaService
+from finanzas_app.services.monedas import hay_conversion
+
+# Columnas de la tabla mensual
+COLUMNAS_MENSUALES = ("dias", "semanas")
+
 
 class ProcesadorTablaSemanal:
     """
@@ -22,17 +46,30 @@ class ProcesadorTablaSemanal:
     """
 
     @staticmethod
-    def crear_tabla_semanal(ingresos):
+    def crear_tabla_semanal(ingresos, moneda=None):
         """
         Crea una tabla organizada por semanas y días.
 
+        Los montos se leen una vez en una instantánea columnar y se pivotan
+        en una matriz densa semanas × 7 (``InstantaneaRecaudaciones.
+        pivote_semanal``); los totales por semana, por día y general son
+        sumas por eje de esa matriz, en centavos enteros.
+
         Args:
             ingresos (QuerySet): Todos los registros de ingresos
+            moneda (str): Moneda de los montos (None = la de origen); se
+                convierten con la tasa de cada día
 
         Returns:
             dict: Estructura de datos para la tabla
         """
-        if not ingresos.exists():
+        from finanzas_app.services.instantanea import (
+            InstantaneaRecaudaciones,
+            fecha_desde_dias,
+        )
+
+        instantanea = InstantaneaRecaudaciones(ingresos, moneda)
+        if not len(instantanea):
             return {
                 "tabla": {},
                 "semanas": [],
@@ -41,75 +78,55 @@ class ProcesadorTablaSemanal:
                 "totales_dias": {},
                 "total_general": Decimal("0.00"),
                 "promedio_diario": Decimal("0.00"),
+                "dias_registrados": 0,
             }
 
-        # Ordenar por fecha
-        ingresos_ordenados = ingresos.order_by("fecha")
-
-        # Obtener lista de días de la semana
-        dias_semana = [
-            "Lunes",
-            "Martes",
-            "Miércoles",
-            "Jueves",
-            "Viernes",
-            "Sábado",
-            "Domingo",
-        ]
-
-        # Inicializar estructura
+        semanas, celdas, registradas, inicios, fines = instantanea.pivote_semanal()
+        semanas = [int(semana) for semana in semanas]
+
         tabla = OrderedDict()
-        totales_semanas = {}
-        totales_dias = {dia: Decimal("0.00") for dia in dias_semana}
-        total_general = Decimal("0.00")
-
-        # Procesar cada registro
-        for ingreso in ingresos_ordenados:
-            semana = ingreso.numero_semana
-            dia = ingreso.dia_semana
-
-            # Inicializar semana si no existe
-            if semana not in tabla:
-                tabla[semana] = {
-                    "semana_numero": semana,
-                    "datos": {},
-                    "fecha_inicio": ingreso.fecha,
-                    "fecha_fin": ingreso.fecha,
-                }
-                totales_semanas[semana] = Decimal("0.00")
-
-            # Actualizar datos de la semana
-            tabla[semana]["datos"][dia] = ingreso.monto
-
-            # Actualizar totales
-            totales_semanas[semana] += ingreso.monto
-            totales_dias[dia] += ingreso.monto
-            total_general += ingreso.monto
-
-            # Actualizar rango de fechas
-            if ingreso.fecha < tabla[semana]["fecha_inicio"]:
-                tabla[semana]["fecha_inicio"] = ingreso.fecha
-            if ingreso.fecha > tabla[semana]["fecha_fin"]:
-                tabla[semana]["fecha_fin"] = ingreso.fecha
-
-        # Calcular promedio diario
-        dias_registrados = sum(
-            1
-            for semana in tabla.values()
-            for valor in semana["datos"].values()
-            if valor >= 0
+        for fila, semana in enumerate(semanas):
+            tabla[semana] = {
+                "semana_numero": semana,
+                "datos": {
+                    NOMBRES_DIAS[columna]: desde_centavos(celdas[fila, columna])
+                    for columna in registradas[fila].nonzero()[0]
+                },
+                "fecha_inicio": fecha_desde_dias(inicios[fila]),
+                "fecha_fin": fecha_desde_dias(fines[fila]),
+            }
+
+        # Totales por eje de la matriz
+        totales_semanas = dict(
+            zip(semanas, map(desde_centavos, celdas.sum(axis=1)))
+        )
+        totales_dias = dict(
+            zip(NOMBRES_DIAS, map(desde_centavos, celdas.sum(axis=0)))
         )
-        promedio_diario = (
-            total_general / dias_registrados
-            if dias_registrados > 0
-            else Decimal("0.00")
+        total_general = desde_centavos(celdas.sum())
+        dias_registrados = int(registradas.sum())
+        promedio_diario = total_general / dias_registrados
+
+        totales_dias_con_porcentaje, totales_semanas_con_porcentaje = (
+            ProcesadorTablaSemanal._con_porcentajes(
+                totales_dias, totales_semanas, total_general
+            )
         )
 
-        # Ordenar semanas
-        semanas_ordenadas = sorted(tabla.keys())
-        print(f"Semanas ordenadas: {semanas_ordenadas}")
+        return {
+            "tabla": tabla,
+            "semanas": semanas,
+            "dias": list(NOMBRES_DIAS),
+            "totales_semanas": totales_semanas_con_porcentaje,
+            "totales_dias": totales_dias_con_porcentaje,
+            "total_general": total_general,
+            "promedio_diario": promedio_diario,
+            "dias_registrados": dias_registrados,
+        }
 
-        # Calcular totales por día con porcentaje
+    @staticmethod
+    def _con_porcentajes(totales_dias, totales_semanas, total_general):
+        """Agrega a los totales por día y por semana su porcentaje del total"""
         totales_dias_con_porcentaje = {}
         for dia, total in totales_dias.items():
             porcentaje = (total / total_general * 100) if total_general > 0 else 0
@@ -118,7 +135,6 @@ class ProcesadorTablaSemanal:
                 "porcentaje": round(porcentaje, 1),
             }
 
-        # Calcular totales por semana con porcentaje
         totales_semanas_con_porcentaje = {}
         for semana, total in totales_semanas.items():
             porcentaje = (total / total_general * 100) if total_general > 0 else 0
@@ -128,51 +144,382 @@ class ProcesadorTablaSemanal:
                 "porcentaje": round(porcentaje, 1),
             }
 
+        return totales_dias_con_porcentaje, totales_semanas_con_porcentaje
+
+    @staticmethod
+    @cacheado("tabla_semanal")
+    def crear_tabla_semanal_resumida(desde=None, hasta=None, moneda=None):
+        """
+        Crea la misma tabla que ``crear_tabla_semanal`` con todos los
+        registros, tomando los totales de los resúmenes materializados.
+
+        Solo las celdas (un monto por día) se leen de las recaudaciones, como
+        tuplas; los totales por semana, por día y general ya están
+        calculados.
+
+        Con una ventana ``desde``/``hasta`` los resúmenes (de todo el
+        historial) no sirven: la tabla se arma solo con las recaudaciones de
+        la ventana. Tampoco en otra moneda, porque los totales resumidos
+        están en la moneda de origen.
+
+        Args:
+            desde (date): Primera fecha incluida (None = sin límite)
+            hasta (date): Última fecha incluida (None = sin límite)
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            dict: Estructura de datos para la tabla
+        """
+        if desde is not None or hasta is not None or hay_conversion(moneda):
+            return ProcesadorTablaSemanal.crear_tabla_semanal(
+                recaudaciones(desde, hasta), moneda
+            )
+
+        general = ResumenGeneral.objects.filter(pk=1).first()
+        if general is None or not general.dias:
+            return ProcesadorTablaSemanal.crear_tabla_semanal(
+                Recaudacion.objects.none()
+            )
+
+        tabla = OrderedDict()
+        totales_semanas = {}
+        for semana in ResumenSemana.objects.order_by("numero_semana"):
+            tabla[semana.numero_semana] = {
+                "semana_numero": semana.numero_semana,
+                "datos": {},
+                "fecha_inicio": semana.fecha_inicio,
+                "fecha_fin": semana.fecha_fin,
+            }
+            totales_semanas[semana.numero_semana] = semana.total
+
+        celdas = Recaudacion.objects.order_by("fecha").values_list(
+            "numero_semana", "fecha", "monto"
+        )
+        for semana, fecha, monto in celdas:
+            tabla[semana]["datos"][NOMBRES_DIAS[fecha.weekday()]] = monto
+
+        totales_dias = {dia: Decimal("0.00") for dia in NOMBRES_DIAS}
+        for resumen in ResumenDiaSemana.objects.all():
+            totales_dias[NOMBRES_DIAS[resumen.dia]] = resumen.total
+
+        totales_dias_con_porcentaje, totales_semanas_con_porcentaje = (
+            ProcesadorTablaSemanal._con_porcentajes(
+                totales_dias, totales_semanas, general.total
+            )
+        )
+
         return {
             "tabla": tabla,
-            "semanas": semanas_ordenadas,
-            "dias": dias_semana,
+            "semanas": list(tabla.keys()),
+            "dias": list(NOMBRES_DIAS),
             "totales_semanas": totales_semanas_con_porcentaje,
             "totales_dias": totales_dias_con_porcentaje,
-            "total_general": total_general,
-            "promedio_diario": promedio_diario,
-            "dias_registrados": dias_registrados,
+            "total_general": general.total,
+            "promedio_diario": general.total / general.dias,
+            "dias_registrados": general.dias,
         }
 
     @staticmethod
-    def crear_tabla_mensual(ingresos):
+    @cacheado("pagina_tabla_semanal")
+    def crear_pagina_tabla_semanal(
+        semana=None, por_pagina=None, desde=None, hasta=None, moneda=None
+    ):
         """
-        Crea una tabla organizada por meses y semanas.
+        Crea la tabla semanal de una página de semanas.
+
+        La página son las ``por_pagina`` semanas registradas hasta la semana
+        ``semana`` inclusive (paginación por clave sobre el índice de
+        ``numero_semana``: no se cuentan ni se saltan filas). Solo se leen
+        las recaudaciones de esas semanas; los totales por día y el total
+        general salen de ``EstadisticaService`` (agregados y cacheados), así
+        que el costo no depende del largo del historial.
+
+        Los porcentajes de cada semana son sobre el total del periodo, no
+        sobre el de la página.
 
         Args:
-            ingresos (QuerySet): Todos los registros de ingresos
+            semana (int): Última semana de la página (None = la más reciente)
+            por_pagina (int): Semanas por página (None = la configurada)
+            desde (date): Primera fecha incluida (None = sin límite)
+            hasta (date): Última fecha incluida (None = sin límite)
+            moneda (str): Moneda de los montos (None = la de origen)
+
+        Returns:
+            dict: La estructura de ``crear_tabla_semanal`` con las semanas
+                de la página y los totales del periodo, más "pagina" (semana
+                pedida, tamaño, semanas "anterior" y "siguiente" para los
+                enlaces, y "primera", "ultima" y "cantidad_semanas" del
+                periodo)
+        """
+        por_pagina = por_pagina or settings.TABLA_CONFIG["SEMANAS_POR_PAGINA"]
+        consulta = recaudaciones(desde, hasta)
+
+        resumen_semanas = consulta.aggregate(
+            primera=Min("numero_semana"),
+            ultima=Max("numero_semana"),
+            cantidad=Count("numero_semana", distinct=True),
+        )
+        pagina = {
+            "semana": semana,
+            "por_pagina": por_pagina,
+            "inicio": None,
+            "anterior": None,
+            "siguiente": None,
+            "primera": resumen_semanas["primera"],
+            "ultima": resumen_semanas["ultima"],
+            "cantidad_semanas": resumen_semanas["cantidad"],
+        }
+
+        semanas_consulta = consulta.values_list("numero_semana", flat=True).distinct()
+        semanas = semanas_consulta.order_by("-numero_semana")
+        if semana is not None:
+            semanas = semanas.filter(numero_semana__lte=semana)
+        semanas = sorted(semanas[:por_pagina])
+
+        if not semanas:
+            datos = ProcesadorTablaSemanal.crear_tabla_semanal(
+                Recaudacion.objects.none()
+            )
+            datos["pagina"] = pagina
+            return datos
+
+        if semanas[0] > pagina["primera"]:
+            pagina["anterior"] = semanas[0] - 1
+            primeras = semanas_consulta.order_by("numero_semana")[:por_pagina]
+            pagina["inicio"] = list(primeras)[-1]
+        if semanas[-1] < pagina["ultima"]:
+            siguientes = semanas_consulta.filter(
+                numero_semana__gt=semanas[-1]
+            ).order_by("numero_semana")[:por_pagina]
+            pagina["siguiente"] = list(siguientes)[-1]
+
+        datos = ProcesadorTablaSemanal.crear_tabla_semanal(
+            consulta.filter(numero_semana__in=semanas), moneda
+        )
+
+        # Totales del periodo completo
+        estadisticas = EstadisticaService.obtener_estadisticas(
+            desde=desde, hasta=hasta, moneda=moneda
+        )
+        por_dia_semana = EstadisticaService.obtener_por_dia_semana(
+            desde=desde, hasta=hasta, moneda=moneda
+        )
+        total_general = estadisticas["total_recaudado"]
+        totales_dias, totales_semanas = ProcesadorTablaSemanal._con_porcentajes(
+            {dia: por_dia_semana[dia]["total"] for dia in NOMBRES_DIAS},
+            {
+                numero: totales["total"]
+                for numero, totales in datos["totales_semanas"].items()
+            },
+            total_general,
+        )
+
+        datos.update(
+            {
+                "totales_semanas": totales_semanas,
+                "totales_dias": totales_dias,
+                "total_general": total_general,
+                "promedio_diario": estadisticas["promedio_diario"],
+                "dias_registrados": estadisticas["dias_registrados"],
+                "pagina": pagina,
+            }
+        )
+        return datos
+
+    @staticmethod
+    @cacheado("tabla_mensual")
+    def crear_tabla_mensual(columnas="dias", desde=None, hasta=None, moneda=None):
+        """
+        Crea una tabla organizada por meses (filas) y días de la semana o
+        semanas (columnas).
+
+        Los totales de cada celda salen de una sola consulta agrupada
+        (``TruncMonth`` y ``ExtractWeekDay`` o ``numero_semana``): se recibe
+        una fila por celda, no una por recaudación. En otra moneda se agrupa
+        la instantánea de NumPy con los montos convertidos día por día.
+
+        Con ``columnas="semanas"`` la columna es la posición de la semana
+        dentro del mes (1ª, 2ª, ...); una semana que cruza dos meses aparece
+        en ambos con la parte de cada uno.
+
+        Args:
+            columnas (str): "dias" (Lunes a Domingo) o "semanas"
+            desde (date): Primera fecha incluida (None = sin límite)
+            hasta (date): Última fecha incluida (None = sin límite)
+            moneda (str): Moneda de los montos (None = la de origen)
 
         Returns:
             dict: Estructura de datos para la tabla mensual
+
+        Raises:
+            ValueError: Si ``columnas`` no es "dias" ni "semanas"
         """
-        if not ingresos.exists():
-            return {"tabla": {}, "meses": [], "semanas": []}
+        if columnas not in COLUMNAS_MENSUALES:
+            raise ValueError(f"Columnas desconocidas: {columnas}")
+
+        if hay_conversion(moneda):
+            celdas = _celdas_mensuales_numpy(columnas, desde, hasta, moneda)
+        else:
+            celdas = _celdas_mensuales_sql(columnas, desde, hasta)
 
-        # Agrupar por mes y semana
-        tabla = {}
+        tabla = OrderedDict()
+        for anno, mes, clave, total, dias in celdas:
+            fila = tabla.setdefault(
+                f"{anno}-{mes:02d}",
+                {
+                    "año": anno,
+                    "mes": mes,
+                    "mes_nombre": NOMBRES_MESES[mes - 1],
+                    "datos": {},
+                    "semanas": {},
+                    "total": Decimal("0.00"),
+                    "dias": 0,
+                },
+            )
+            if columnas == "dias":
+                columna = NOMBRES_DIAS[clave]
+            else:
+                # Las semanas del mes llegan en orden
+                columna = len(fila["datos"]) + 1
+                fila["semanas"][columna] = clave
+            fila["datos"][columna] = total
+            fila["total"] += total
+            fila["dias"] += dias
+
+        if columnas == "dias":
+            encabezados = list(NOMBRES_DIAS)
+        else:
+            encabezados = list(
+                range(1, max((len(f["datos"]) for f in tabla.values()), default=0) + 1)
+            )
+
+        totales_columnas = {columna: Decimal("0.00") for columna in encabezados}
+        for fila in tabla.values():
+            for columna, total in fila["datos"].items():
+                totales_columnas[columna] += total
+            fila["promedio"] = promedio(fila["total"], fila["dias"])
+        total_general = sum(
+            (fila["total"] for fila in tabla.values()), Decimal("0.00")
+        )
+
+        return {
+            "tabla": tabla,
+            "meses": list(tabla.keys()),
+            "columnas": encabezados,
+            "tipo_columnas": columnas,
+            "totales_columnas": {
+                columna: {
+                    "total": total,
+                    "porcentaje": round(
+                        total / total_general * 100 if total_general > 0 else 0, 1
+                    ),
+                }
+                for columna, total in totales_columnas.items()
+            },
+            "total_general": total_general,
+        }
+
+
+def _celdas_mensuales_sql(columnas, desde=None, hasta=None):
+    """
+    Celdas de la tabla mensual agrupadas en la base de datos.
+
+    Returns:
+        list: ``(año, mes, clave, total, dias)`` en orden de mes y clave; la
+            clave es el día de la semana (0 = lunes) o el ``numero_semana``
+    """
+    if columnas == "dias":
+        columna = ExtractWeekDay("fecha")
+    else:
+        columna = F("numero_semana")
+    filas = (
+        recaudaciones(desde, hasta)
+        .annotate(mes=TruncMonth("fecha"), columna=columna)
+        .values("mes", "columna")
+        .annotate(total=Sum("monto"), dias=Count("id"), inicio=Min("fecha"))
+        .order_by("mes", "inicio")
+    )
+    celdas = []
+    for fila in filas:
+        clave = fila["columna"]
+        if columnas == "dias":
+            # ExtractWeekDay: 1 = domingo ... 7 = sábado
+            clave = (clave + 5) % 7
+        celdas.append(
+            (fila["mes"].year, fila["mes"].month, clave, fila["total"], fila["dias"])
+        )
+    if columnas == "dias":
+        celdas.sort()
+    return celdas
 
-        for ingreso in ingresos:
-            mes_key = f"{ingreso.año}-{ingreso.mes:02d}"
-            semana_key = ingreso.numero_semana
 
-            if mes_key not in tabla:
-                tabla[mes_key] = {}
+def _celdas_mensuales_numpy(columnas, desde=None, hasta=None, moneda=None):
+    """``_celdas_mensuales_sql`` sobre la instantánea, en otra moneda"""
+    from finanzas_app.services.instantanea import InstantaneaRecaudaciones
+
+    instantanea = InstantaneaRecaudaciones(recaudaciones(desde, hasta), moneda)
+    if not len(instantanea):
+        return []
+    if columnas == "dias":
+        claves_columna, base = instantanea.dias_semana, 7
+    else:
+        claves_columna = instantanea.semanas
+        base = int(claves_columna.max()) + 1
+    claves, totales, dias = instantanea.agrupar(instantanea.meses * base + claves_columna)
+
+    celdas = []
+    for clave, total, n in zip(claves, totales, dias):
+        indice_mes, columna = divmod(int(clave), base)
+        celdas.append(
+            (
+                1970 + indice_mes // 12,
+                indice_mes % 12 + 1,
+                columna,
+                desde_centavos(total),
+                int(n),
+            )
+        )
+    # Los grupos llegan en orden cronológico de su primer registro
+    if columnas == "dias":
+        celdas.sort()
+    return celdas
 
-            if semana_key not in tabla[mes_key]:
-                tabla[mes_key][semana_key] = Decimal("0.00")
 
-            tabla[mes_key][semana_key] += ingreso.monto
+def pagina_desde_parametros(parametros):
+    """
+    Lee la página de la tabla semanal pedida en los parámetros de una petición.
+
+    Args:
+        parametros (QueryDict | dict): Normalmente ``request.GET``; usa
+            ``semana`` (última semana de la página) y ``por_pagina``
+
+    Returns:
+        tuple: ``(semana, por_pagina)``; None donde no se pidió nada
+
+    Raises:
+        ValueError: Si un parámetro no es válido
+    """
+    semana = parametros.get("semana") or None
+    por_pagina = parametros.get("por_pagina") or None
+
+    if semana is not None:
+        try:
+            semana = int(semana)
+        except ValueError:
+            raise ValueError("La semana debe ser un número")
+        if semana < 1:
+            raise ValueError("La semana debe ser mayor que cero")
 
-        # Obtener lista de meses y semanas únicas
-        meses = sorted(tabla.keys())
-        todas_semanas = set()
-        for semanas in tabla.values():
-            todas_semanas.update(semanas.keys())
-        semanas_unicas = sorted(todas_semanas)
+    if por_pagina is not None:
+        tamanos = settings.TABLA_CONFIG["TAMANOS_PAGINA"]
+        try:
+            por_pagina = int(por_pagina)
+        except ValueError:
+            raise ValueError("La cantidad de semanas por página debe ser un número")
+        if por_pagina not in tamanos:
+            raise ValueError(
+                "La cantidad de semanas por página debe ser "
+                + ", ".join(str(tamano) for tamano in tamanos)
+            )
 
-        return {"tabla": tabla, "meses": meses, "semanas": semanas_unicas}
+    return semana, por_pagina
@@ -0,0 +1,75 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from finanzas_app.models.deuda import PagoDeuda
+from finanzas_app.models.ingresos import Recaudacion
+from finanzas_app.models.monedas import TasaCambio
+from finanzas_app.services.cache_estadisticas import incrementar_version
+from finanzas_app.services.prerender_graficos import programar_prerenderizado
+from finanzas_app.services.resumenes import ResumenService
+
+
+@receiver(pre_save, sender=Recaudacion, dispatch_uid="resumen_recaudacion_anterior")
+def recaudacion_por_guardar(sender, instance, raw=False, **kwargs):
+    """Guarda el estado anterior para aplicar solo la diferencia"""
+    if not raw:
+        instance._resumen_anterior = ResumenService.capturar(instance)
+        instance._semana_anterior = (
+            instance._resumen_anterior["numero_semana"]
+            if instance._resumen_anterior
+            else None
+        )
+
+
+@receiver(post_save, sender=Recaudacion, dispatch_uid="resumen_recaudacion_guardada")
+def recaudacion_guardada(sender, instance, raw=False, **kwargs):
+    """Actualiza los resúmenes materializados con el alta o la edición"""
+    if not raw:
+        anterior = getattr(instance, "_resumen_anterior", None)
+        ResumenService.aplicar(anterior, ResumenService.movimiento(instance))
+        instance._resumen_anterior = ResumenService.movimiento(instance)
+
+
+@receiver(post_delete, sender=Recaudacion, dispatch_uid="resumen_recaudacion_borrada")
+def recaudacion_borrada(sender, instance, **kwargs):
+    """Descuenta de los resúmenes materializados la recaudación borrada"""
+    ResumenService.aplicar(ResumenService.movimiento(instance), None)
+
+
+@receiver(post_save, sender=Recaudacion, dispatch_uid="prerender_recaudacion_guardada")
+@receiver(post_delete, sender=Recaudacion, dispatch_uid="prerender_recaudacion_borrada")
+def recaudacion_modificada(sender, instance, raw=False, **kwargs):
+    """
+    Invalida las estadísticas en caché (y las filas de la tabla semanal de
+    las semanas afectadas) y vuelve a generar los gráficos del dashboard
+    cuando cambian los datos
+    """
+    semanas = None
+    if not raw:
+        semanas = {instance.numero_semana, getattr(instance, "_semana_anterior", None)}
+        semanas.discard(None)
+    # Después del commit, para que quien recalcule (y el hilo de
+    # renderizado) vea los cambios
+    transaction.on_commit(partial(incrementar_version, semanas))
+    transaction.on_commit(programar_prerenderizado)
+
+
+@receiver(post_save, sender=PagoDeuda, dispatch_uid="version_pago_guardado")
+@receiver(post_delete, sender=PagoDeuda, dispatch_uid="version_pago_borrado")
+def pago_modificado(sender, **kwargs):
+    """Invalida el libro de la deuda en caché cuando cambian los pagos"""
+    # Los pagos no cambian ninguna fila de la tabla semanal
+    transaction.on_commit(partial(incrementar_version, semanas=()))
+
+
+@receiver(post_save, sender=TasaCambio, dispatch_uid="version_tasa_guardada")
+@receiver(post_delete, sender=TasaCambio, dispatch_uid="version_tasa_borrada")
+def tasa_modificada(sender, **kwargs):
+    """
+    Invalida la serie de tasas en caché y, con ella, las estadísticas
+    convertidas a otra moneda
+    """
+    transaction.on_commit(incrementar_version)
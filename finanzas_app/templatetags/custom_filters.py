@@ -1,5 +1,7 @@
 from django import template
 
+from finanzas_app.dinero import formatear_moneda
+
 register = template.Library()
 
 
@@ -7,3 +9,16 @@ register = template.Library()
 def dict_key(dictionary, key):
     """Obtiene un valor de un diccionario usando una clave variable"""
     return dictionary.get(key)
+
+
+@register.filter
+def moneda(valor, simbolo="$"):
+    """
+    Formatea un monto como "$12,345.67" directamente desde el ``Decimal``.
+
+    Uso: ``{{ registro.monto|moneda }}`` o ``{{ total|moneda:"" }}``
+    """
+    try:
+        return formatear_moneda(valor, simbolo=simbolo)
+    except ValueError:
+        return ""
@@ -1,3 +1,814 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import F, Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from finanzas_app.dinero import a_centavos, a_decimal, desde_centavos
+from finanzas_app.models.campos import CentavosField
+from finanzas_app.models.ingresos import Recaudacion, inicio_semana, numero_semana
+from finanzas_app.models.monedas import TasaCambio
+from finanzas_app.models.resumenes import (
+    CubetaDiaSemana,
+    ResumenDiaSemana,
+    ResumenGeneral,
+    ResumenMes,
+    ResumenSemana,
+)
+from finanzas_app.services.agregaciones import (
+    BACKENDS,
+    NOMBRES_DIAS,
+    obtener_agregacion,
+)
+from finanzas_app.services.cache_estadisticas import versiones_semanas
+from finanzas_app.services.deuda import DeudaService, LibroDeuda
+from finanzas_app.services.estadisticas_service import EstadisticaService
+from finanzas_app.services.estimacion import EstimacionService, dia_tendencia
+from finanzas_app.services.monedas import ConversorMoneda
+from finanzas_app.services.muestreo import lttb, minmax, reducir_serie
+from finanzas_app.services.periodos import periodo_desde_parametros
+from finanzas_app.services.resumenes import ResumenService
+from finanzas_app.services.tablas import (
+    ProcesadorTablaSemanal,
+    _celdas_mensuales_numpy,
+    _celdas_mensuales_sql,
+    pagina_desde_parametros,
+)
+from finanzas_app.services.dashboard_service import CONFIG_GRAFICOS, GeneradorGraficos
+from finanzas_app.services.motor_graficos import MotorGraficos, textos_grafico
+from finanzas_app.services.svg_graficos import RenderizadorSVG, _marcas_eje
+from finanzas_app.views.tabla_views import _fragmentos
+
+DIAS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+
+
+class MotorGraficosTests(SimpleTestCase):
+    """El mismo gráfico da los mismos bytes en cada renderizado"""
+
+    def renderizar_dos_veces(self, tipo, etiquetas, valores):
+        # Una sola plantilla: el segundo renderizado la reutiliza
+        motor = MotorGraficos(CONFIG_GRAFICOS, max_plantillas=1)
+        primera = motor.renderizar(tipo, etiquetas, valores)
+        segunda = motor.renderizar(tipo, etiquetas, valores)
+        return primera, segunda
+
+    def test_promedio_diario_determinista(self):
+        valores = [123456.78, 98765.43, 110000, 87654.32, 150000, 210000, 190000]
+        primera, segunda = self.renderizar_dos_veces("promedio_diario", DIAS, valores)
+        self.assertEqual(primera, segunda)
+
+    def test_semanal_determinista(self):
+        semanas = [f"Sem {n}" for n in range(1, 53)]
+        valores = [50000 + 1000 * n for n in range(52)]
+        primera, segunda = self.renderizar_dos_veces("semanal", semanas, valores)
+        self.assertEqual(primera, segunda)
+
+    def test_plantilla_reutilizada_tras_otros_datos(self):
+        motor = MotorGraficos(CONFIG_GRAFICOS, max_plantillas=1)
+        valores = [123456.78, 98765.43, 110000, 87654.32, 150000, 210000, 190000]
+        primera = motor.renderizar("promedio_diario", DIAS, valores)
+        motor.renderizar("promedio_diario", DIAS, [v * 10 for v in valores])
+        self.assertEqual(motor.renderizar("promedio_diario", DIAS, valores), primera)
+
+    def test_titulos_en_la_moneda_mostrada(self):
+        self.assertEqual(textos_grafico("semanal")[2], "INGRESOS (CUP)")
+        self.assertEqual(textos_grafico("semanal", "USD")[2], "INGRESOS (USD)")
+        self.assertEqual(textos_grafico("diario", "USD")[2], "TOTAL DE INGRESOS (USD)")
+
+    def test_plantillas_por_moneda(self):
+        motor = MotorGraficos(CONFIG_GRAFICOS, max_plantillas=1)
+        valores = [123456.78, 98765.43, 110000, 87654.32, 150000, 210000, 190000]
+        cup = motor.renderizar("diario", DIAS, valores)
+        usd = motor.renderizar("diario", DIAS, valores, "USD")
+        self.assertNotEqual(cup, usd)
+        self.assertEqual(motor.renderizar("diario", DIAS, valores, "CUP"), cup)
+
+
+class RenderizadorSVGTests(SimpleTestCase):
+    """El camino SVG solo cubre los gráficos simples"""
+
+    SVG = "{http://www.w3.org/2000/svg}"
+
+    def setUp(self):
+        self.renderizador = RenderizadorSVG(CONFIG_GRAFICOS)
+
+    def test_soporta(self):
+        self.assertTrue(self.renderizador.soporta("diario", 7))
+        self.assertTrue(self.renderizador.soporta("semanal", 30))
+        self.assertFalse(self.renderizador.soporta("semanal", 31))
+        self.assertFalse(self.renderizador.soporta("semanal_historial", 10))
+        self.assertFalse(self.renderizador.soporta("mensual", 0))
+
+    def test_no_soportado(self):
+        with self.assertRaises(ValueError):
+            self.renderizador.renderizar("mensual_historial", ["Ene"], [1])
+
+    def test_barras_y_textos(self):
+        valores = [9500, 12000, 0, 18750.5, 21000, 15000, 11000.25]
+        svg = self.renderizador.renderizar("diario", DIAS, valores, "USD")
+        raiz = ElementTree.fromstring(svg)
+        textos = [t.text for t in raiz.iter(self.SVG + "text")]
+        self.assertIn("📈 INGRESOS POR DÍA", textos)
+        self.assertIn("TOTAL DE INGRESOS (USD)", textos)
+        for dia in DIAS:
+            self.assertIn(dia, textos)
+        # Una barra por día, el fin de semana destacado
+        colores = CONFIG_GRAFICOS["colores"]
+        rellenos = [r.get("fill") for r in raiz.iter(self.SVG + "rect")]
+        self.assertEqual(rellenos.count(colores["secundario"]), 5)
+        self.assertEqual(rellenos.count(colores["destacado"]), 2)
+
+    def test_mensual_es_una_linea(self):
+        svg = self.renderizador.renderizar("mensual", ["Ene", "Feb", "Mar"], [1, 2, 3])
+        raiz = ElementTree.fromstring(svg)
+        self.assertEqual(len(list(raiz.iter(self.SVG + "polyline"))), 1)
+        self.assertEqual(len(list(raiz.iter(self.SVG + "circle"))), 3)
+
+    def test_marcas_eje(self):
+        self.assertEqual(_marcas_eje(0), [0, 1])
+        marcas = _marcas_eje(21000)
+        self.assertEqual(marcas[0], 0)
+        self.assertGreaterEqual(marcas[-1], 21000)
+        self.assertEqual(marcas[1], 5000)
+
+    def test_formato_por_defecto_png(self):
+        nombres = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
+        datos = {
+            dia: {"total": 100, "promedio": 10} for dia in nombres + ["Domingo"]
+        }
+        self.assertEqual(GeneradorGraficos._formato_salida("diario", datos), "png")
+        config = {**settings.GRAFICOS_CONFIG, "FORMATO": "svg"}
+        with self.settings(GRAFICOS_CONFIG=config):
+            self.assertEqual(GeneradorGraficos._formato_salida("diario", datos), "svg")
+
+
+class MuestreoTests(SimpleTestCase):
+    """Las series reducidas conservan extremos, picos y los últimos puntos"""
+
+    def setUp(self):
+        self.valores = [100 + i % 7 for i in range(200)]
+        self.valores[57] = 5000
+        self.valores[120] = 0
+        self.etiquetas = [f"Sem {n}" for n in range(1, 201)]
+
+    def test_lttb(self):
+        indices = list(lttb(self.valores, 20))
+        self.assertEqual(len(indices), 20)
+        self.assertEqual((indices[0], indices[-1]), (0, 199))
+        self.assertEqual(indices, sorted(set(indices)))
+        self.assertIn(57, indices)
+        self.assertIn(120, indices)
+
+    def test_lttb_umbrales_pequenos(self):
+        self.assertEqual(list(lttb(self.valores, 2)), [0, 199])
+        self.assertEqual(list(lttb(self.valores[:5], 10)), [0, 1, 2, 3, 4])
+
+    def test_minmax(self):
+        indices = list(minmax(self.valores, 20))
+        self.assertLessEqual(len(indices), 20)
+        self.assertEqual(indices, sorted(set(indices)))
+        self.assertIn(57, indices)
+        self.assertIn(120, indices)
+
+    def test_reducir_conserva_los_recientes(self):
+        for metodo in ("lttb", "minmax"):
+            with self.subTest(metodo=metodo):
+                etiquetas, valores = reducir_serie(
+                    self.etiquetas, self.valores, 30, recientes=8, metodo=metodo
+                )
+                self.assertLessEqual(len(valores), 30)
+                self.assertEqual(etiquetas[-8:], self.etiquetas[-8:])
+                self.assertEqual(valores[-8:], self.valores[-8:])
+                self.assertIn(5000, valores)
+                posiciones = [self.etiquetas.index(e) for e in etiquetas]
+                self.assertEqual(posiciones, sorted(set(posiciones)))
+
+    def test_reducir_serie_corta_sin_cambios(self):
+        etiquetas, valores = reducir_serie(self.etiquetas[:10], self.valores[:10], 30)
+        self.assertEqual(etiquetas, self.etiquetas[:10])
+        self.assertEqual(valores, self.valores[:10])
+
+    def test_recientes_no_superan_el_maximo(self):
+        etiquetas, valores = reducir_serie(self.etiquetas, self.valores, 10, 50)
+        self.assertEqual(len(valores), 10)
+        self.assertEqual(etiquetas[-9:], self.etiquetas[-9:])
+
+    def test_metodo_desconocido(self):
+        with self.assertRaises(ValueError):
+            reducir_serie(self.etiquetas, self.valores, 30, metodo="promedio")
+
+
+@override_settings(RECORDING_START_DATE="2025-5-26")
+class NumeroSemanaTests(SimpleTestCase):
+    def test_primera_semana(self):
+        self.assertEqual(numero_semana(datetime.date(2025, 5, 26)), 1)
+        self.assertEqual(numero_semana(datetime.date(2025, 6, 1)), 1)
+        self.assertEqual(numero_semana(datetime.date(2025, 6, 2)), 2)
+
+    def test_consecutiva_al_cambiar_de_anno(self):
+        domingo = datetime.date(2025, 12, 28)
+        lunes = datetime.date(2025, 12, 29)
+        siguiente = datetime.date(2026, 1, 5)
+        self.assertEqual(numero_semana(lunes), numero_semana(domingo) + 1)
+        self.assertEqual(numero_semana(siguiente), numero_semana(lunes) + 1)
+
+    def test_inicio_semana_es_la_inversa(self):
+        fecha = datetime.date(2025, 5, 26)
+        while fecha < datetime.date(2027, 1, 1):
+            lunes = fecha - datetime.timedelta(days=fecha.weekday())
+            self.assertEqual(inicio_semana(numero_semana(fecha)), lunes)
+            fecha += datetime.timedelta(days=3)
+
+
+class DineroTests(SimpleTestCase):
+    """Conversión entre pesos (``Decimal``) y enteros de centavos"""
+
+    def test_redondeo_al_centavo(self):
+        self.assertEqual(a_decimal("1.005"), Decimal("1.01"))
+        self.assertEqual(a_decimal(1.1), Decimal("1.10"))
+        self.assertEqual(a_centavos(Decimal("12.345")), 1235)
+        self.assertEqual(a_centavos(Decimal("-0.015")), -2)
+
+    def test_ida_y_vuelta(self):
+        for centavos in (0, 1, 99, 1234, -250, 10**15):
+            with self.subTest(centavos=centavos):
+                self.assertEqual(a_centavos(desde_centavos(centavos)), centavos)
+        self.assertEqual(desde_centavos(1234), Decimal("12.34"))
+
+    def test_no_numericos(self):
+        for valor in ("abc", None, ""):
+            with self.subTest(valor=valor):
+                with self.assertRaises(ValueError):
+                    a_decimal(valor)
+
+    def test_campo(self):
+        campo = CentavosField()
+        self.assertEqual(campo.get_prep_value(Decimal("12.345")), 1235)
+        self.assertEqual(campo.get_prep_value("7"), 700)
+        self.assertIsNone(campo.get_prep_value(None))
+        expresion = F("monto") + 1
+        self.assertIs(campo.get_prep_value(expresion), expresion)
+        self.assertEqual(campo.from_db_value(1234, None, None), Decimal("12.34"))
+        self.assertEqual(campo.to_python("3.5"), Decimal("3.50"))
+        with self.assertRaises(ValidationError):
+            campo.to_python("abc")
+
+
+@override_settings(**PRUEBAS)
+class CentavosFieldTests(TestCase):
+    """El monto se guarda como entero de centavos y se lee como ``Decimal``"""
+
+    def test_guardar_y_leer(self):
+        registro = Recaudacion.objects.create(
+            fecha=datetime.date(2025, 12, 1), monto=Decimal("12.345")
+        )
+        registro.refresh_from_db()
+        self.assertEqual(registro.monto, Decimal("12.35"))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT monto FROM {Recaudacion._meta.db_table} WHERE id = %s",
+                [registro.pk],
+            )
+            self.assertEqual(cursor.fetchone()[0], 1235)
+
+    def test_filtros_y_sumas_en_pesos(self):
+        for monto in ("0.10", "0.20", "100.01"):
+            Recaudacion.objects.create(
+                fecha=datetime.date(2025, 12, 1), monto=Decimal(monto)
+            )
+        self.assertEqual(Recaudacion.objects.filter(monto__gt=100).count(), 1)
+        total = Recaudacion.objects.aggregate(total=Sum("monto"))["total"]
+        self.assertEqual(total, Decimal("100.31"))
+
+
+class LibroDeudaTests(SimpleTestCase):
+    """Saldos por sumas acumuladas y semana saldada por búsqueda binaria"""
+
+    def setUp(self):
+        pagos = {8: "50", 9: "30", 10: "20", 12: "250", 14: "100"}
+        self.libro = LibroDeuda(
+            10, 14, Decimal("100.00"), {s: Decimal(m) for s, m in pagos.items()}
+        )
+
+    def test_pagos_anteriores_en_la_primera_semana(self):
+        self.assertEqual(self.libro.semanas, [10, 11, 12, 13, 14])
+        self.assertEqual(self.libro.pagos, [100, 0, 250, 0, 100])
+
+    def test_sumas_acumuladas(self):
+        self.assertEqual(self.libro.devengado, [100, 200, 300, 400, 500])
+        self.assertEqual(self.libro.pagado, [100, 100, 350, 350, 450])
+        self.assertEqual(self.libro.devengado_total, 500)
+        self.assertEqual(self.libro.pagado_total, 450)
+        self.assertEqual(self.libro.saldo_total, 50)
+
+    def test_saldo(self):
+        saldos = {9: 0, 10: 0, 11: 100, 12: -50, 13: 50, 14: 50, 16: 250}
+        for semana, saldo in saldos.items():
+            with self.subTest(semana=semana):
+                self.assertEqual(self.libro.saldo(semana), saldo)
+
+    def test_semana_saldada(self):
+        self.assertIsNone(self.libro.semana_saldada())
+        self.assertEqual(self.libro.semana_saldada(5), 10)
+        self.assertEqual(self.libro.semana_saldada(10), 10)
+        self.assertEqual(self.libro.semana_saldada(11), 12)
+        self.assertEqual(self.libro.semana_saldada(12), 12)
+        self.assertEqual(self.libro.semana_saldada(13), 14)
+
+    def test_semanas_cubiertas(self):
+        self.assertEqual(self.libro.semanas_cubiertas(), 4)
+        adelantado = LibroDeuda(1, 2, Decimal("100.00"), {1: Decimal("500")})
+        self.assertEqual(adelantado.semanas_cubiertas(), 5)
+
+    def test_vacio(self):
+        libro = LibroDeuda(5, 4, Decimal("100.00"), {3: Decimal("10")})
+        self.assertEqual(len(libro), 0)
+        self.assertEqual(libro.saldo_total, 0)
+        self.assertIsNone(libro.semana_saldada())
+
+
+# Sin hilos de pre-renderizado ni caché en archivos durante las pruebas
+PRUEBAS = {
+    "RECORDING_START_DATE": "2025-5-26",
+    "GRAFICOS_CONFIG": {**settings.GRAFICOS_CONFIG, "PRERENDER": False},
+    "CACHES": {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "estadisticas": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pruebas-estadisticas",
+        },
+    },
+}
+
+
+def crear_recaudaciones():
+    """Unas semanas a ambos lados del cambio de año, con días repetidos"""
+    montos = [9500, 12000, 0, 18750.5, 21000, 15000, 11000.25]
+    fecha = datetime.date(2025, 12, 1)
+    registros = []
+    for n in range(45):
+        if n % 9 == 4:
+            fecha += datetime.timedelta(days=1)
+            continue
+        registros.append(
+            Recaudacion.objects.create(fecha=fecha, monto=Decimal(str(montos[n % 7])))
+        )
+        fecha += datetime.timedelta(days=1)
+    return registros
+
+
+def resumenes():
+    """Contenido de todos los resúmenes materializados, comparable"""
+    return {
+        "semanas": list(
+            ResumenSemana.objects.filter(dias__gt=0)
+            .order_by("numero_semana")
+            .values_list("numero_semana", "total", "dias", "fecha_inicio", "fecha_fin")
+        ),
+        "meses": list(
+            ResumenMes.objects.filter(dias__gt=0)
+            .order_by("anno", "mes")
+            .values_list("anno", "mes", "total", "dias")
+        ),
+        "dias": list(
+            ResumenDiaSemana.objects.filter(dias__gt=0)
+            .order_by("dia")
+            .values_list(
+                "dia", "total", "dias", "suma_t", "suma_t2", "suma_ty", "cuadrados"
+            )
+        ),
+        "cubetas": list(
+            CubetaDiaSemana.objects.filter(dias__gt=0)
+            .order_by("anno", "dia", "indice")
+            .values_list("anno", "dia", "indice", "total", "dias", "cuadrados")
+        ),
+        "general": list(
+            ResumenGeneral.objects.values_list(
+                "total", "dias", "mejor_dia_id", "peor_dia_id"
+            )
+        ),
+    }
+
+
+@override_settings(**PRUEBAS)
+class ResumenesTests(TestCase):
+    """Los resúmenes mantenidos por delta coinciden con reconstruirlos"""
+
+    def assertIgualAReconstruir(self):
+        por_delta = resumenes()
+        ResumenService.reconstruir()
+        self.assertEqual(por_delta, resumenes())
+
+    def test_altas(self):
+        crear_recaudaciones()
+        self.assertIgualAReconstruir()
+
+    def test_edicion_del_monto(self):
+        registros = crear_recaudaciones()
+        registros[3].monto = Decimal("99999.99")
+        registros[3].save()
+        registros[10].monto = Decimal("0")
+        registros[10].save()
+        self.assertIgualAReconstruir()
+
+    def test_cambio_de_fecha_a_otra_semana_y_mes(self):
+        registros = crear_recaudaciones()
+        registro = registros[-1]
+        registro.fecha = datetime.date(2025, 11, 20)
+        registro.save()
+        self.assertIgualAReconstruir()
+
+    def test_borrado(self):
+        registros = crear_recaudaciones()
+        # El primero de una semana, el mejor día y el último registro
+        registros[0].delete()
+        max(registros[1:], key=lambda r: r.monto).delete()
+        registros[-1].delete()
+        self.assertIgualAReconstruir()
+
+    def test_borrar_todo(self):
+        for registro in crear_recaudaciones():
+            registro.delete()
+        self.assertIgualAReconstruir()
+
+
+@override_settings(**PRUEBAS)
+class BackendsTests(TestCase):
+    """Todos los backends de agregación dan el mismo resultado"""
+
+    VENTANAS = [
+        (None, None),
+        (datetime.date(2025, 12, 10), None),
+        (None, datetime.date(2025, 12, 31)),
+        (datetime.date(2025, 12, 22), datetime.date(2026, 1, 4)),
+    ]
+
+    def setUp(self):
+        crear_recaudaciones()
+
+    def resumen(self, backend, desde, hasta):
+        config = {**settings.ESTADISTICAS_CONFIG, "BACKEND": backend, "CACHE": False}
+        with self.settings(ESTADISTICAS_CONFIG=config):
+            return obtener_agregacion().resumen(ultimos=5, desde=desde, hasta=hasta)
+
+    def test_mismo_resultado(self):
+        for desde, hasta in self.VENTANAS:
+            esperado = self.resumen("python", desde, hasta)
+            for backend in BACKENDS:
+                with self.subTest(backend=backend, desde=desde, hasta=hasta):
+                    self.assertEqual(self.resumen(backend, desde, hasta), esperado)
+
+
+@override_settings(
+    **PRUEBAS,
+    ESTADISTICAS_CONFIG={**settings.ESTADISTICAS_CONFIG, "CACHE": False},
+)
+class PaginacionTablaSemanalTests(TestCase):
+    """Páginas por clave sobre ``numero_semana`` (semanas 28 a 34)"""
+
+    def setUp(self):
+        crear_recaudaciones()
+
+    def pagina(self, semana=None):
+        datos = ProcesadorTablaSemanal.crear_pagina_tabla_semanal(semana, 3)
+        pagina = datos["pagina"]
+        claves = ("inicio", "anterior", "siguiente")
+        return datos["semanas"], {clave: pagina[clave] for clave in claves}
+
+    def test_ultima_pagina(self):
+        semanas, enlaces = self.pagina()
+        self.assertEqual(semanas, [32, 33, 34])
+        self.assertEqual(enlaces, {"inicio": 30, "anterior": 31, "siguiente": None})
+
+    def test_pagina_intermedia(self):
+        semanas, enlaces = self.pagina(31)
+        self.assertEqual(semanas, [29, 30, 31])
+        self.assertEqual(enlaces, {"inicio": 30, "anterior": 28, "siguiente": 34})
+
+    def test_primera_pagina(self):
+        semanas, enlaces = self.pagina(30)
+        self.assertEqual(semanas, [28, 29, 30])
+        self.assertEqual(enlaces, {"inicio": None, "anterior": None, "siguiente": 33})
+
+    def test_semana_antes_de_la_primera(self):
+        semanas, enlaces = self.pagina(20)
+        self.assertEqual(semanas, [])
+        self.assertEqual(enlaces, {"inicio": None, "anterior": None, "siguiente": None})
+
+    def test_semana_sin_registros_usa_la_anterior(self):
+        datos = ProcesadorTablaSemanal.crear_pagina_tabla_semanal(40, 3)
+        self.assertEqual(datos["semanas"], [32, 33, 34])
+        self.assertEqual(datos["pagina"]["primera"], 28)
+        self.assertEqual(datos["pagina"]["ultima"], 34)
+        self.assertEqual(datos["pagina"]["cantidad_semanas"], 7)
+
+
+@override_settings(
+    **PRUEBAS,
+    ESTADISTICAS_CONFIG={**settings.ESTADISTICAS_CONFIG, "CACHE": False},
+)
+class TablaMensualTests(TestCase):
+    """Celdas de meses por día de la semana o por semana del mes"""
+
+    def setUp(self):
+        self.registros = crear_recaudaciones()
+
+    def test_dias_de_la_semana(self):
+        tabla = ProcesadorTablaSemanal.crear_tabla_mensual("dias")["tabla"]
+        self.assertEqual(list(tabla), ["2025-12", "2026-01"])
+        for clave, fila in tabla.items():
+            esperado = {}
+            for registro in self.registros:
+                if f"{registro.fecha:%Y-%m}" == clave:
+                    dia = NOMBRES_DIAS[registro.fecha.weekday()]
+                    esperado[dia] = esperado.get(dia, 0) + registro.monto
+            with self.subTest(mes=clave):
+                self.assertEqual(fila["datos"], esperado)
+
+    def test_semanas_del_mes(self):
+        datos = ProcesadorTablaSemanal.crear_tabla_mensual("semanas")
+        tabla = datos["tabla"]
+        # La semana 32 (29/12 - 04/01) está en los dos meses
+        diciembre = {1: 28, 2: 29, 3: 30, 4: 31, 5: 32}
+        self.assertEqual(tabla["2025-12"]["semanas"], diciembre)
+        self.assertEqual(tabla["2026-01"]["semanas"], {1: 32, 2: 33, 3: 34})
+        self.assertEqual(datos["columnas"], [1, 2, 3, 4, 5])
+        self.assertEqual(datos["total_general"], sum(r.monto for r in self.registros))
+
+    def test_sql_y_numpy_coinciden(self):
+        for columnas in ("dias", "semanas"):
+            with self.subTest(columnas=columnas):
+                self.assertEqual(
+                    _celdas_mensuales_sql(columnas),
+                    _celdas_mensuales_numpy(columnas),
+                )
+
+    def test_columnas_desconocidas(self):
+        with self.assertRaises(ValueError):
+            ProcesadorTablaSemanal.crear_tabla_mensual("meses")
+
+
+class PaginaDesdeParametrosTests(SimpleTestCase):
+    def test_sin_parametros(self):
+        self.assertEqual(pagina_desde_parametros({}), (None, None))
+        self.assertEqual(
+            pagina_desde_parametros({"semana": "", "por_pagina": ""}), (None, None)
+        )
+
+    def test_validos(self):
+        tamano = settings.TABLA_CONFIG["TAMANOS_PAGINA"][0]
+        parametros = {"semana": "12", "por_pagina": str(tamano)}
+        self.assertEqual(pagina_desde_parametros(parametros), (12, tamano))
+
+    def test_invalidos(self):
+        for parametros in (
+            {"semana": "abc"},
+            {"semana": "0"},
+            {"por_pagina": "x"},
+            {"por_pagina": "7"},
+        ):
+            with self.subTest(parametros=parametros):
+                with self.assertRaises(ValueError):
+                    pagina_desde_parametros(parametros)
+
+
+@override_settings(**PRUEBAS)
+class VersionesSemanasTests(TestCase):
+    """Guardar una recaudación invalida solo las filas de su semana"""
+
+    def setUp(self):
+        self.registros = crear_recaudaciones()
+        self.semanas = sorted({r.numero_semana for r in self.registros})
+
+    def guardar(self, registro):
+        antes = versiones_semanas(self.semanas)
+        with self.captureOnCommitCallbacks(execute=True):
+            registro.save()
+        despues = versiones_semanas(self.semanas)
+        return {s for s in self.semanas if antes[s] != despues[s]}
+
+    def test_solo_su_semana(self):
+        registro = self.registros[8]
+        registro.monto = Decimal("12345.67")
+        self.assertEqual(self.guardar(registro), {registro.numero_semana})
+
+    def test_cambio_de_semana(self):
+        registro = self.registros[8]
+        anterior = registro.numero_semana
+        registro.fecha += datetime.timedelta(weeks=2)
+        self.assertEqual(self.guardar(registro), {anterior, anterior + 2})
+
+    def test_borrado(self):
+        registro = self.registros[20]
+        antes = versiones_semanas(self.semanas)
+        with self.captureOnCommitCallbacks(execute=True):
+            registro.delete()
+        despues = versiones_semanas(self.semanas)
+        cambiadas = {s for s in self.semanas if antes[s] != despues[s]}
+        self.assertEqual(cambiadas, {registro.numero_semana})
+
+
+@override_settings(
+    **PRUEBAS,
+    ESTADISTICAS_CONFIG={**settings.ESTADISTICAS_CONFIG, "CACHE": False},
+)
+class EstimacionTests(TestCase):
+    """El ajuste recupera un nivel por día de la semana y la tendencia"""
+
+    # Centavos por día de la semana (el domingo no se trabaja) y pendiente
+    NIVELES = {0: 1000000, 1: 1200000, 2: 900000, 3: 1100000, 4: 1500000, 5: 2000000}
+    PENDIENTE = 50
+
+    def centavos(self, fecha):
+        return self.NIVELES[fecha.weekday()] + self.PENDIENTE * dia_tendencia(fecha)
+
+    def crear_serie(self, desde, hasta):
+        fecha = desde
+        while fecha <= hasta:
+            if fecha.weekday() in self.NIVELES:
+                Recaudacion.objects.create(
+                    fecha=fecha, monto=desde_centavos(self.centavos(fecha))
+                )
+            fecha += datetime.timedelta(days=1)
+
+    def test_coeficientes(self):
+        self.crear_serie(datetime.date(2025, 12, 1), datetime.date(2026, 1, 24))
+        modelo = EstimacionService.ajustar()
+
+        self.assertEqual(modelo["dias_semana"], [0, 1, 2, 3, 4, 5])
+        self.assertEqual(modelo["frecuencias"], [1.0] * 6 + [0.0])
+        self.assertEqual(modelo["dias"], 48)
+        # y = β[día] + γ·(t - centro)
+        self.assertAlmostEqual(modelo["coeficientes"][-1], self.PENDIENTE, places=6)
+        for i, dia in enumerate(modelo["dias_semana"]):
+            esperado = self.NIVELES[dia] + self.PENDIENTE * modelo["centro"]
+            self.assertAlmostEqual(modelo["coeficientes"][i], esperado, places=2)
+        self.assertLess(modelo["varianza"], 1)
+
+    def test_proyeccion(self):
+        self.crear_serie(datetime.date(2025, 12, 1), datetime.date(2026, 1, 24))
+        modelo = EstimacionService.ajustar()
+        self.assertEqual(modelo["ultima"], datetime.date(2026, 1, 24))
+
+        inicio = datetime.date(2026, 1, 26)
+        fin = datetime.date(2026, 2, 1)
+        esperado = sum(
+            self.centavos(inicio + datetime.timedelta(days=n)) for n in range(6)
+        )
+        total, varianza = EstimacionService.proyectar(modelo, inicio, fin)
+        self.assertAlmostEqual(total, esperado, delta=1)
+        self.assertLess(varianza, 100)
+        self.assertEqual(EstimacionService.proyectar(modelo, fin, inicio), (0.0, 0.0))
+
+    def test_pocos_datos(self):
+        # Tres registros y cuatro parámetros (tres niveles y la pendiente)
+        self.crear_serie(datetime.date(2025, 12, 1), datetime.date(2025, 12, 3))
+        self.assertIsNone(EstimacionService.ajustar())
+
+        estimacion = EstimacionService.obtener_estimacion()
+        self.assertIsNone(estimacion["modelo"])
+        self.assertEqual(estimacion["semanas"], [])
+        self.assertEqual(estimacion["meses"], [])
+
+
+@override_settings(
+    **PRUEBAS,
+    ESTADISTICAS_CONFIG={**settings.ESTADISTICAS_CONFIG, "CACHE": False},
+)
+class ConversorMonedaTests(TestCase):
+    """Tasa de cada día buscada con ``searchsorted`` en la serie de tasas"""
+
+    def crear_tasas(self):
+        for fecha, tasa in (
+            (datetime.date(2025, 12, 1), "400"),
+            (datetime.date(2025, 12, 15), "450"),
+            (datetime.date(2026, 1, 1), "500"),
+        ):
+            TasaCambio.objects.create(moneda="USD", fecha=fecha, tasa=Decimal(tasa))
+
+    def convertir_cien(self, *fechas):
+        montos = [Decimal("100.00")] * len(fechas)
+        return ConversorMoneda.convertir("USD", fechas, montos)
+
+    def test_tasa_de_cada_dia(self):
+        self.crear_tasas()
+        fechas = {
+            # Antes de la primera tasa se usa la primera
+            datetime.date(2025, 11, 20): "0.25",
+            datetime.date(2025, 12, 1): "0.25",
+            datetime.date(2025, 12, 14): "0.25",
+            # El mismo día del cambio ya rige la tasa nueva
+            datetime.date(2025, 12, 15): "0.22",
+            datetime.date(2025, 12, 31): "0.22",
+            datetime.date(2026, 1, 1): "0.20",
+            # Después de la última, la última
+            datetime.date(2026, 3, 1): "0.20",
+        }
+        convertidos = self.convertir_cien(*fechas)
+        self.assertEqual(convertidos, [Decimal(m) for m in fechas.values()])
+        self.assertEqual(ConversorMoneda.tasa_actual("USD"), Decimal("500"))
+
+    def test_redondeo_al_centavo(self):
+        self.crear_tasas()
+        fecha = datetime.date(2025, 12, 1)
+        convertidos = ConversorMoneda.convertir(
+            "USD", [fecha] * 3, [Decimal("2.00"), Decimal("1.99"), Decimal("1001")]
+        )
+        esperados = [Decimal("0.01"), Decimal("0.00"), Decimal("2.50")]
+        self.assertEqual(convertidos, esperados)
+
+    def test_sin_tasas_usa_la_de_respaldo(self):
+        respaldo = Decimal(str(settings.MONEDAS_CONFIG["TASAS_RESPALDO"]["USD"]))
+        self.assertEqual(ConversorMoneda.tasa_actual("USD"), respaldo)
+        self.assertEqual(
+            self.convertir_cien(datetime.date(2025, 12, 1)),
+            [(Decimal("100") / respaldo).quantize(Decimal("0.01"))],
+        )
+
+    def test_moneda_de_origen_sin_conversion(self):
+        self.assertEqual(ConversorMoneda.tasa_actual(None), Decimal("1"))
+        montos = [Decimal("12.34")]
+        fechas = [datetime.date(2025, 12, 1)]
+        self.assertEqual(ConversorMoneda.convertir(None, fechas, montos), montos)
+
+    def test_deuda_con_la_tasa_cargada(self):
+        # La tasa ya no sale de DEUDA_CONFIG sino de TasaCambio
+        self.assertNotIn("TASA_CAMBIO_CUP_A_USD", settings.DEUDA_CONFIG)
+        self.crear_tasas()
+        Recaudacion.objects.create(
+            fecha=inicio_semana(settings.DEUDA_CONFIG["SEMANA_INICIO"] + 2),
+            monto=Decimal("1000"),
+        )
+
+        deuda = EstadisticaService.obtener_deuda_semanal()
+        self.assertEqual(deuda["tasa_cambio"], Decimal("500"))
+        self.assertEqual(
+            deuda["deuda_total_usd"], deuda["deuda_total_cup"] / Decimal("500")
+        )
+
+    def test_deuda_en_cache_sin_el_libro(self):
+        Recaudacion.objects.create(
+            fecha=inicio_semana(settings.DEUDA_CONFIG["SEMANA_INICIO"] + 2),
+            monto=Decimal("1000"),
+        )
+        config = {**settings.ESTADISTICAS_CONFIG, "CACHE": True}
+        with self.settings(ESTADISTICAS_CONFIG=config):
+            caches[config["CACHE_ALIAS"]].clear()
+            deuda = EstadisticaService.obtener_deuda_semanal()
+            self.assertEqual(EstadisticaService.obtener_deuda_semanal(), deuda)
+
+        # Solo datos simples; el libro se vuelve a armar si hace falta
+        self.assertNotIn("libro", deuda)
+        libro = DeudaService.libro()
+        self.assertEqual(deuda["deuda_total_cup"], libro.saldo_total)
+        self.assertEqual(deuda["detalle_por_semana"][-1]["saldo"], libro.saldo_total)
+
+
+@override_settings(**PRUEBAS)
+class FragmentosTablaSemanalTests(TestCase):
+    """Las filas de la tabla semanal se sirven de la caché por semana"""
+
+    def setUp(self):
+        caches[settings.ESTADISTICAS_CONFIG["CACHE_ALIAS"]].clear()
+        self.registros = crear_recaudaciones()
+        self.semanas = sorted({r.numero_semana for r in self.registros})
+        self.url = reverse("finanzas_app:listado_tabla")
+
+    def claves_filas(self):
+        """Clave de caché de cada fila, como la arma ``tabla_semanal.html``"""
+        fragmentos = _fragmentos(self.semanas, periodo_desde_parametros({}))
+        return {
+            semana: make_template_fragment_key(
+                "tabla_semana",
+                [semana, fragmentos["versiones"][semana], fragmentos["clave"]],
+            )
+            for semana in self.semanas
+        }
+
+    def test_fila_servida_desde_la_cache(self):
+        self.client.get(self.url)
+        clave = self.claves_filas()[self.semanas[-1]]
+        cache = caches[settings.ESTADISTICAS_CONFIG["CACHE_ALIAS"]]
+        self.assertIsNotNone(cache.get(clave))
+
+        cache.set(clave, "<td>fila-en-cache</td>")
+        self.assertContains(self.client.get(self.url), "fila-en-cache")
+
+    def test_editar_cambia_solo_la_clave_de_su_semana(self):
+        antes = self.claves_filas()
+        registro = self.registros[8]
+        registro.monto = Decimal("12345.67")
+        with self.captureOnCommitCallbacks(execute=True):
+            registro.save()
+        despues = self.claves_filas()
+
+        cambiadas = {s for s in self.semanas if antes[s] != despues[s]}
+        self.assertEqual(cambiadas, {registro.numero_semana})
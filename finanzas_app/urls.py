@@ -1,10 +1,21 @@
 from django.urls import path
-from .views import dashboard_views, tabla_views, deuda_views
+from .views import dashboard_views, tabla_views, deuda_views, grafico_views
 
 app_name = "finanzas_app"
 
 urlpatterns = [
     path("", dashboard_views.index, name="dashboard"),
     path("listado/", tabla_views.tabla_semanal, name="listado_tabla"),
+    path("mensual/", tabla_views.tabla_mensual, name="tabla_mensual"),
     path("deuda-semanal/", deuda_views.deuda_semanal, name="deuda_semanal"),
+    path(
+        "graficos/<slug:clave>.<slug:extension>",
+        grafico_views.grafico,
+        name="grafico",
+    ),
+    path(
+        "api/graficos/<slug:tipo>/",
+        grafico_views.datos_grafico,
+        name="datos_grafico",
+    ),
 ]
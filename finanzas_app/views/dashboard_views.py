@@ -2,38 +2,65 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse
 from django.db.models import Sum, Avg, Count
 from django.contrib import messages
+from django.conf import settings
 from django.utils import timezone
 import json
 import datetime
-import matplotlib
 
-from finanzas_app.models.ingresos import Recaudacion
 from finanzas_app.services.dashboard_service import GeneradorGraficos
 from finanzas_app.services.estadisticas_service import EstadisticaService
-
-
-import io
-import base64
-import pandas as pd
+from finanzas_app.services.estimacion import EstimacionService
+from finanzas_app.services.periodos import Periodo, periodo_desde_parametros
 
 
 def index(request):
     """Página principal con el dashboard"""
-    # Obtener estadísticas
-    estadisticas = EstadisticaService.obtener_estadisticas()
-    por_semana = EstadisticaService.obtener_por_semana()
-    por_mes = EstadisticaService.obtener_por_mes()
-    por_dia_semana = EstadisticaService.obtener_por_dia_semana()
-
-    # Últimos registros
-    ultimos_registros = Recaudacion.objects.all().order_by("-fecha")[:10]
-
-    # Generar gráficos
-    grafico_semana = GeneradorGraficos.crear_grafico_semanal(list(por_semana.values()))
-    grafico_mes = GeneradorGraficos.crear_grafico_mensual(list(por_mes.values()))
-    grafico_dia_semana = GeneradorGraficos.crear_grafico_diario(por_dia_semana)
-    grafico_promedio_dia_semana = GeneradorGraficos.crear_grafico_promedio_diario(
-        por_dia_semana
+    # Ventana de fechas opcional (?periodo=..., ?desde=...&hasta=...) y
+    # moneda (?moneda=USD, con la tasa de cada día)
+    try:
+        periodo = periodo_desde_parametros(request.GET)
+    except ValueError as error:
+        messages.warning(request, f"{error}. Se muestra todo el historial.")
+        periodo = Periodo()
+
+    # Estadísticas, agrupaciones y últimos registros en una sola consulta
+    resumen = EstadisticaService.obtener_resumen_dashboard(
+        ultimos=10, moneda=periodo.moneda, **periodo.filtros
+    )
+    estadisticas = resumen["estadisticas"]
+    por_semana = resumen["por_semana"]
+    por_mes = resumen["por_mes"]
+    por_dia_semana = resumen["por_dia_semana"]
+    ultimos_registros = resumen["ultimos_registros"]
+
+    # Dispersión y percentiles por día de la semana; medias móviles
+    distribucion = EstadisticaService.obtener_distribucion_dia_semana(
+        moneda=periodo.moneda, **periodo.filtros
+    )
+    moviles = EstadisticaService.obtener_moviles(
+        moneda=periodo.moneda, **periodo.filtros
+    )
+
+    # Proyección de las próximas semanas y meses (con todo el historial)
+    estimacion = EstimacionService.obtener_estimacion(periodo.moneda)
+
+    # En modo cliente el navegador pide las series y dibuja con Chart.js
+    modo = request.GET.get("modo", settings.GRAFICOS_CONFIG["MODO"])
+    modo_cliente = modo == "cliente"
+
+    # Semanal y mensual: últimos periodos o todo el historial reducido
+    historial = request.GET.get(
+        "historial", settings.GRAFICOS_CONFIG["HISTORIAL"]["MODO"]
+    )
+    historial_completo = historial == "completo"
+
+    # Gráficos servidos por URL desde la caché
+    graficos = (
+        {}
+        if modo_cliente
+        else GeneradorGraficos.obtener_graficos_dashboard(
+            por_semana, por_mes, por_dia_semana, historial_completo, periodo.moneda
+        )
     )
 
     context = {
@@ -42,10 +69,17 @@ def index(request):
         "por_mes": por_mes,
         "por_dia_semana": por_dia_semana,
         "ultimos_registros": ultimos_registros,
-        "grafico_semana": grafico_semana,
-        "grafico_mes": grafico_mes,
-        "grafico_dia_semana": grafico_dia_semana,
-        "grafico_promedio_dia_semana": grafico_promedio_dia_semana,
+        "distribucion": distribucion,
+        "moviles": moviles["actual"],
+        "estimacion": estimacion,
+        "periodo": periodo,
+        "modo_cliente": modo_cliente,
+        "historial_completo": historial_completo,
+        "tipo_grafico_semana": (
+            "semanal_historial" if historial_completo else "semanal"
+        ),
+        "tipo_grafico_mes": "mensual_historial" if historial_completo else "mensual",
+        **graficos,
     }
 
     return render(request, "finanzas_app/dashboard.html", context)
@@ -0,0 +1,80 @@
+"""
+Vistas para servir las imágenes de gráficos desde la caché y las series
+agregadas que usa el modo de gráficos en el navegador (Chart.js).
+"""
+
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import etag, require_safe
+
+from finanzas_app.services.cache_graficos import (
+    TIPOS_CONTENIDO,
+    calcular_huella,
+    obtener_cache,
+)
+from finanzas_app.services.dashboard_service import CONFIG_GRAFICOS, GeneradorGraficos
+from finanzas_app.services.estadisticas_service import EstadisticaService
+from finanzas_app.services.monedas import moneda_origen
+from finanzas_app.services.motor_graficos import TEXTOS_GRAFICOS, tipo_base
+from finanzas_app.services.periodos import periodo_desde_parametros
+
+
+@require_safe
+@etag(lambda request, clave, extension: f"{clave}.{extension}")
+def grafico(request, clave, extension):
+    """
+    Sirve un gráfico ya renderizado.
+
+    La URL incluye la huella del contenido, por lo que la respuesta nunca
+    cambia y se puede marcar como inmutable.
+    """
+    if extension not in TIPOS_CONTENIDO:
+        raise Http404("Formato no soportado")
+
+    contenido = obtener_cache().obtener(clave, extension)
+    if contenido is None:
+        raise Http404("Gráfico no encontrado")
+
+    response = HttpResponse(contenido, content_type=TIPOS_CONTENIDO[extension])
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+@require_safe
+def datos_grafico(request, tipo):
+    """
+    Devuelve en JSON la serie agregada de un gráfico del dashboard.
+
+    El navegador la dibuja con Chart.js, así que Matplotlib no interviene.
+    La respuesta lleva un ETag con la huella de los datos para que las
+    recargas sin cambios se resuelvan con un 304.
+
+    Acepta la misma ventana de fechas que el dashboard (``?periodo=...`` o
+    ``?desde=...&hasta=...``) y la moneda (``?moneda=USD``).
+    """
+    if tipo not in TEXTOS_GRAFICOS:
+        raise Http404("Tipo de gráfico desconocido")
+    try:
+        periodo = periodo_desde_parametros(request.GET)
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    filtros = {"moneda": periodo.moneda, **periodo.filtros}
+
+    base = tipo_base(tipo)
+    if base == "semanal":
+        datos = list(EstadisticaService.obtener_por_semana(**filtros).values())
+    elif base == "mensual":
+        datos = list(EstadisticaService.obtener_por_mes(**filtros).values())
+    else:
+        datos = EstadisticaService.obtener_por_dia_semana(**filtros)
+
+    serie = GeneradorGraficos.serie_json(tipo, datos, periodo.moneda)
+    serie["moneda"] = periodo.moneda or moneda_origen()
+    etiqueta_etag = f'"{calcular_huella(tipo, serie, CONFIG_GRAFICOS)}"'
+
+    response = get_conditional_response(request, etag=etiqueta_etag)
+    if response is None:
+        response = JsonResponse(serie)
+    response["ETag"] = etiqueta_etag
+    response["Cache-Control"] = "no-cache"
+    return response
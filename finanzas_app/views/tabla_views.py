@@ -5,10 +5,21 @@ Vista para mostrar la tabla semanal de recaudaciones.
 
 
 import datetime
+from django.conf import settings
+from django.contrib import messages
 from django.shortcuts import render
 from finanzas_app.models.ingresos import Recaudacion
+from finanzas_app.services.cache_estadisticas import (
+    version_fragmentos,
+    versiones_semanas,
+)
 from finanzas_app.services.estadisticas_service import EstadisticaService
-from finanzas_app.services.tablas import ProcesadorTablaSemanal
+from finanzas_app.services.periodos import Periodo, periodo_desde_parametros
+from finanzas_app.services.tablas import (
+    COLUMNAS_MENSUALES,
+    ProcesadorTablaSemanal,
+    pagina_desde_parametros,
+)
 
 
 def tabla_semanal(request):
@@ -21,31 +32,113 @@ def tabla_semanal(request):
     - Última columna: Total semanal
     - Última fila: Total por día
     - Última celda: Total general
-    """
-    # Obtener todos los ingresos
-    ingresos = Recaudacion.objects.all()
 
-    # Procesar datos para la tabla
-    datos_tabla = ProcesadorTablaSemanal.crear_tabla_semanal(ingresos)
+    Acepta la misma ventana de fechas que el dashboard (``?periodo=...`` o
+    ``?desde=...&hasta=...``) y la moneda (``?moneda=USD``).
 
-    # Obtener estadísticas adicionales
-    estadisticas = EstadisticaService.obtener_estadisticas()
+    Las semanas se muestran por páginas: ``?semana=N`` muestra la página
+    que termina en la semana N (por defecto, la más reciente) y
+    ``?por_pagina=M`` elige cuántas semanas tiene. Los totales son los de
+    todo el periodo.
 
-    # Obtener últimas semanas para filtro
-    ultimas_semanas = (
-        list(datos_tabla["semanas"][-10:]) if datos_tabla["semanas"] else []
+    Cada fila se guarda renderizada en la caché con la versión de los datos
+    de su semana (ver ``services/cache_estadisticas.py``): solo se vuelven a
+    renderizar las semanas que cambiaron.
+    """
+    try:
+        periodo = periodo_desde_parametros(request.GET)
+    except ValueError as error:
+        messages.warning(request, f"{error}. Se muestra todo el historial.")
+        periodo = Periodo()
+
+    try:
+        semana, por_pagina = pagina_desde_parametros(request.GET)
+    except ValueError as error:
+        messages.warning(request, f"{error}. Se muestran las últimas semanas.")
+        semana, por_pagina = None, None
+
+    # Procesar datos para la tabla (solo las semanas de la página)
+    datos_tabla = ProcesadorTablaSemanal.crear_pagina_tabla_semanal(
+        semana=semana, por_pagina=por_pagina, moneda=periodo.moneda, **periodo.filtros
+    )
+
+    # Obtener estadísticas adicionales
+    estadisticas = EstadisticaService.obtener_estadisticas(
+        moneda=periodo.moneda, **periodo.filtros
     )
 
     contexto = {
         "datos_tabla": datos_tabla,
         "estadisticas": estadisticas,
-        "ultimas_semanas": ultimas_semanas,
+        "fragmentos": _fragmentos(datos_tabla["semanas"], periodo),
+        "pagina": datos_tabla["pagina"],
+        "tamanos_pagina": settings.TABLA_CONFIG["TAMANOS_PAGINA"],
+        "por_pagina": por_pagina,
+        "periodo": periodo,
         "hoy": datetime.datetime.today(),
     }
 
     return render(request, "finanzas_app/tabla_semanal.html", contexto)
 
 
+def _fragmentos(semanas, periodo):
+    """
+    Parámetros de la caché de filas de la tabla semanal.
+
+    La clave de cada fila es su semana con la versión de esa semana, más
+    la ventana, la moneda y la versión común de los fragmentos.
+    """
+    timeout = settings.TABLA_CONFIG["FRAGMENTOS_TIMEOUT"]
+    if not settings.ESTADISTICAS_CONFIG["CACHE"]:
+        timeout = 0
+    clave = f"{version_fragmentos()}:{periodo.moneda}:{periodo.desde}:{periodo.hasta}"
+    return {
+        "timeout": timeout,
+        "alias": settings.ESTADISTICAS_CONFIG["CACHE_ALIAS"],
+        "clave": clave,
+        "versiones": versiones_semanas(semanas) if timeout else {},
+    }
+
+
+def tabla_mensual(request):
+    """
+    Muestra los ingresos en formato tabular por mes.
+
+    Estructura:
+    - Filas: Meses
+    - Columnas: Días de la semana (``?columnas=dias``, por defecto) o
+      semanas del mes (``?columnas=semanas``)
+    - Última columna: Total mensual
+    - Última fila: Total por columna
+
+    Acepta la misma ventana de fechas y moneda que la tabla semanal.
+    """
+    try:
+        periodo = periodo_desde_parametros(request.GET)
+    except ValueError as error:
+        messages.warning(request, f"{error}. Se muestra todo el historial.")
+        periodo = Periodo()
+
+    columnas = request.GET.get("columnas") or "dias"
+    if columnas not in COLUMNAS_MENSUALES:
+        messages.warning(
+            request, f"Columnas desconocidas: {columnas}. Se muestran los días."
+        )
+        columnas = "dias"
+
+    datos_tabla = ProcesadorTablaSemanal.crear_tabla_mensual(
+        columnas=columnas, moneda=periodo.moneda, **periodo.filtros
+    )
+
+    contexto = {
+        "datos_tabla": datos_tabla,
+        "columnas": columnas,
+        "periodo": periodo,
+    }
+
+    return render(request, "finanzas_app/tabla_mensual.html", contexto)
+
+
 def exportar_tabla_excel(request):
     """
     Exporta la tabla semanal a formato Excel.
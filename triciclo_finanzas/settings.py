@@ -153,6 +153,131 @@ DEUDA_CONFIG = {
     "SEMANA_INICIO": 6,
     "MONEDA_ORIGEN": "CUP",
     "MONEDA_DESTINO": "USD",
-    "TASA_CAMBIO_CUP_A_USD": 445,
     "ULTIMA_ACTUALIZACION": "2025-12-08",
 }
+
+
+# Monedas y tasas de cambio (serie histórica en el modelo ``TasaCambio``,
+# se carga con ``manage.py cargar_tasas``)
+MONEDAS_CONFIG = {
+    # Moneda en la que se registran los montos
+    "ORIGEN": "CUP",
+    # Monedas que se pueden pedir con ?moneda=...
+    "DISPONIBLES": ("CUP", "USD"),
+    # Tasa usada si todavía no hay tasas cargadas de una moneda
+    "TASAS_RESPALDO": {"USD": 445},
+}
+
+
+# Cachés. "estadisticas" se elige con la variable de entorno
+# ESTADISTICAS_CACHE: "archivo" (por defecto; compartida entre procesos,
+# también con los comandos de gestión), "locmem" (un solo proceso) o
+# "redis" (un servidor local compatible con Redis en REDIS_URL; requiere el
+# paquete redis)
+CACHES_ESTADISTICAS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "estadisticas",
+    },
+    "archivo": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, "cache", "estadisticas"),
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/1"),
+    },
+}
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "estadisticas": CACHES_ESTADISTICAS[os.environ.get("ESTADISTICAS_CACHE", "archivo")],
+}
+
+
+# Cálculo de las estadísticas del dashboard y la tabla
+ESTADISTICAS_CONFIG = {
+    # "resumenes" lee los totales materializados (se mantienen por delta);
+    # "sql" agrupa en la base de datos (una fila por semana/mes/día);
+    # "numpy" carga fecha y monto en arreglos y agrupa vectorizado;
+    # "python" lee la tabla una vez y acumula en memoria
+    "BACKEND": "resumenes",
+    # Resultados en la caché de Django, versionados por los datos
+    "CACHE": True,
+    "CACHE_ALIAS": "estadisticas",
+    # Segundos de vida de cada resultado (None = hasta que cambien los datos)
+    "CACHE_TIMEOUT": None,
+    # Segundos máximos que se espera a quien está recalculando
+    "CACHE_BLOQUEO": 30,
+    # Servir el resultado anterior mientras otra petición recalcula
+    "SERVIR_OBSOLETO": True,
+    # Días de calendario de las medias y desviaciones móviles
+    "VENTANAS_MOVILES": (7, 28, 90),
+    # Percentiles por día de la semana (aproximados, ver services/distribucion.py)
+    "PERCENTILES": (10, 50, 90),
+}
+
+
+# Estimación de la recaudación (services/estimacion.py)
+ESTIMACION_CONFIG = {
+    # Semanas y meses proyectados desde el último registro
+    "SEMANAS": 4,
+    "MESES": 3,
+    # Nivel de confianza de los intervalos
+    "CONFIANZA": 0.95,
+}
+
+
+# Tabla semanal paginada por semanas (?semana=N&por_pagina=M)
+TABLA_CONFIG = {
+    # Semanas por página si no se pide otra cantidad
+    "SEMANAS_POR_PAGINA": 10,
+    # Cantidades que se pueden elegir
+    "TAMANOS_PAGINA": (10, 26, 52),
+    # Segundos de vida de cada fila renderizada (en la caché de estadísticas,
+    # versionada por semana; 0 = sin caché de filas)
+    "FRAGMENTOS_TIMEOUT": 7 * 24 * 60 * 60,
+}
+
+
+# Configuración de la caché de gráficos
+GRAFICOS_CONFIG = {
+    # "servidor" renderiza imágenes; "cliente" envía JSON y dibuja con Chart.js
+    # (se puede forzar por petición con ?modo=cliente / ?modo=servidor)
+    "MODO": "servidor",
+    # "svg" dibuja los gráficos simples sin Matplotlib; "png" usa siempre Matplotlib
+    "FORMATO": "png",
+    "CACHE_DIRECTORIO": os.path.join(MEDIA_ROOT, "graficos"),
+    "CACHE_MAX_ENTRADAS_MEMORIA": 64,
+    "CACHE_MAX_BYTES_MEMORIA": 32 * 1024 * 1024,
+    "CACHE_MAX_BYTES_DISCO": 256 * 1024 * 1024,
+    # Procesos para renderizar gráficos en paralelo (0 o 1 = en serie)
+    "PROCESOS_RENDER": min(4, os.cpu_count() or 1),
+    "TIMEOUT_RENDER": 60,
+    # Volver a renderizar en segundo plano cuando cambian las recaudaciones
+    "PRERENDER": True,
+    # Segundos sin cambios antes de renderizar (agrupa ráfagas de cambios)
+    "PRERENDER_ESPERA": 2.0,
+    # Variantes de los gráficos PNG (el original mide 1680 px de ancho)
+    "VARIANTES": {
+        "ANCHOS": [480, 960],
+        "COLORES_PNG": 128,
+    },
+    # Gráficos semanal y mensual: "reciente" (últimos periodos) o "completo"
+    # (todo el historial reducido; se puede forzar con ?historial=completo)
+    "HISTORIAL": {
+        "MODO": "reciente",
+        "MAX_PUNTOS": {"semanal": 52, "mensual": 36},
+        # Los periodos más recientes se muestran siempre, sin reducir
+        "RECIENTES_EXACTOS": {"semanal": 12, "mensual": 6},
+        "METODO": "lttb",  # "lttb" o "minmax"
+    },
+}
+
+
+# Presupuesto de importación al cargar las URLs (manage.py presupuesto_importacion)
+PRESUPUESTO_IMPORTACION = {
+    "MAX_MS": 300,
+    # No deben importarse hasta que haga falta dibujar o exportar
+    "MODULOS_PROHIBIDOS": ["matplotlib", "numpy", "pandas"],
+}